@@ -0,0 +1,192 @@
+"""
+Local stand-in for Google Flights used by the benchmark harness.
+
+Serves a results page whose markup matches the scraper's selectors, and the
+GetShoppingResults RPC that the page fetches, so every extraction mode can
+be exercised without Google or the Oxylabs proxy. Latency and failures can
+be injected per request.
+"""
+
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional, Tuple
+
+from src.scraper.payload import RESULTS_RPC_PATH
+
+# (airline, departure [h, m], arrival [h, m], arrival day offset, minutes, stops, base price)
+ITINERARIES = [
+    ("ANA", [10, 30], [15, 45], 1, 675, 0, 812),
+    ("Japan Airlines", [11, 50], [16, 20], 1, 630, 0, 845),
+    ("United", [8, 5], [21, 0], 1, 1015, 1, 640),
+    ("Delta", [13, 15], [17, 55], 1, 700, 0, 901),
+    ("Korean Air", [23, 40], [9, 10], 2, 1050, 1, 598),
+    ("Singapore Airlines", [9, 0], [14, 30], 1, 690, 0, 990),
+    ("Air Canada", [6, 45], [19, 5], 1, 1100, 1, 705),
+    ("Zipair", [16, 0], [20, 10], 1, 610, 0, 512),
+    ("Asiana", [0, 30], [11, 45], 2, 1155, 1, 623),
+    ("EVA Air", [18, 20], [5, 35], 2, 1275, 1, 677),
+]
+
+# Relative price level per browser locale, so countries compete on price
+LOCALE_PRICE_FACTORS = {
+    "en-IN": 0.82,
+    "es-MX": 0.91,
+    "pt-BR": 0.88,
+    "th-TH": 0.95,
+    "tr-TR": 0.86,
+    "en-US": 1.0,
+}
+
+
+def price_factor(accept_language: str) -> float:
+    locale = (accept_language or "en-US").split(",")[0].strip()
+    return LOCALE_PRICE_FACTORS.get(locale, 1.0)
+
+
+def _clock(clock: List[int]) -> str:
+    hour, minute = clock
+    return f"{hour % 12 or 12}:{minute:02d} {'AM' if hour < 12 else 'PM'}"
+
+
+def render_results_page(factor: float) -> str:
+    """Render a results page matching the scraper's DOM selectors."""
+    rows = []
+    for airline, dep, arr, offset, minutes, stops, price in ITINERARIES:
+        stops_text = "Nonstop" if stops == 0 else f"{stops} stop"
+        rows.append(
+            f'<li class="pIav2d" data-ved="r">'
+            f'<div class="sSHqwe">{airline}</div>'
+            f'<span class="mv1WYe">{_clock(dep)}</span>'
+            f'<span class="mv1WYe">{_clock(arr)}+{offset}</span>'
+            f'<div class="gvkrdb">{minutes // 60} hr {minutes % 60} min</div>'
+            f'<div class="EfT7Ae">{stops_text}</div>'
+            f'<div class="YMlIz">${round(price * factor):,}</div>'
+            f'</li>'
+        )
+    return (
+        "<!doctype html><html><head><title>Google Flights</title></head><body>"
+        '<div data-ved="root"><ul>' + "".join(rows) + "</ul></div>"
+        "<script>fetch('/_/FlightsFrontendUi/data/travel.frontend.flights."
+        f"{RESULTS_RPC_PATH}?f.sid=1', {{method: 'POST'}});</script>"
+        "</body></html>"
+    )
+
+
+def render_results_payload(factor: float) -> str:
+    """Render a GetShoppingResults RPC body for the same itineraries."""
+    items = []
+    for airline, dep, arr, offset, minutes, stops, price in ITINERARIES:
+        itinerary = [
+            "XX", [airline], [[]] * (stops + 1), "LAX", [2025, 3, 15], dep,
+            "NRT", [2025, 3, 15 + offset], arr, minutes,
+        ]
+        items.append([itinerary, [[None, round(price * factor)]]])
+    payload = [None, None, [items[:3]], [items[3:]]]
+    chunk = json.dumps([["wrb.fr", None, json.dumps(payload)]])
+    return f")]}}'\n\n{len(chunk)}\n{chunk}\n"
+
+
+class FakeGoogleFlightsServer:
+    """
+    Threaded HTTP server impersonating Google Flights.
+
+    Args:
+        latency_ms: Delay added to every response
+        jitter_ms: Random extra delay of up to this many milliseconds
+        failure_rate: Fraction of page loads answered with HTTP 503
+        page_path: Serve this recorded HTML page instead of the generated one
+    """
+
+    def __init__(
+        self,
+        latency_ms: int = 0,
+        jitter_ms: int = 0,
+        failure_rate: float = 0.0,
+        page_path: Optional[str] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.failure_rate = failure_rate
+        self.recorded_page = open(page_path).read() if page_path else None
+        self.requests_served = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        return self._server.server_address[:2]
+
+    @property
+    def flights_url(self) -> str:
+        host, port = self.address
+        return f"http://{host}:{port}/travel/flights"
+
+    def start(self) -> "FakeGoogleFlightsServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeGoogleFlightsServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _delay(self) -> None:
+        delay = self.latency_ms + random.uniform(0, self.jitter_ms)
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status: int, body: str, content_type: str) -> None:
+                data = body.encode()
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _route(self) -> None:
+                with server._lock:
+                    server.requests_served += 1
+                server._delay()
+                factor = price_factor(self.headers.get("Accept-Language", ""))
+
+                if RESULTS_RPC_PATH in self.path:
+                    self._send(200, render_results_payload(factor), "application/json")
+                elif self.path.startswith("/travel/flights"):
+                    if random.random() < server.failure_rate:
+                        self._send(503, "", "text/html")
+                        return
+                    page = server.recorded_page or render_results_page(factor)
+                    self._send(200, page, "text/html; charset=utf-8")
+                else:
+                    self._send(404, "", "text/plain")
+
+            def do_GET(self):
+                self._route()
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                if length:
+                    self.rfile.read(length)
+                self._route()
+
+        return Handler
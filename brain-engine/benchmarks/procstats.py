@@ -0,0 +1,106 @@
+"""Memory and CPU sampling for this process and its descendants (Linux /proc)."""
+
+import asyncio
+import os
+from typing import Dict, List, Optional
+
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+
+def _read_stat(pid: int) -> Optional[List[str]]:
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            raw = f.read()
+    except OSError:
+        return None
+    # The command name is parenthesised and may contain spaces
+    return raw[raw.rindex(")") + 2:].split()
+
+
+def descendants(root: int) -> List[int]:
+    """PIDs of every live descendant of ``root``."""
+    children: Dict[int, List[int]] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        fields = _read_stat(int(entry))
+        if fields:
+            children.setdefault(int(fields[1]), []).append(int(entry))
+    found, stack = [], [root]
+    while stack:
+        for child in children.get(stack.pop(), []):
+            found.append(child)
+            stack.append(child)
+    return found
+
+
+def rss_bytes(pid: int) -> int:
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return 0
+
+
+def cpu_seconds(pid: int) -> float:
+    fields = _read_stat(pid)
+    if not fields:
+        return 0.0
+    # utime and stime are fields 14 and 15 of /proc/<pid>/stat
+    return (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+
+
+class ProcessSampler:
+    """
+    Periodically samples RSS of this process's descendants (the Playwright
+    driver and Chromium) and CPU time of the whole tree.
+
+    CPU time of processes that exit between samples is not counted, which is
+    acceptable because pooled browsers live for the whole run.
+    """
+
+    def __init__(self, interval: float = 0.5):
+        self.interval = interval
+        self.supported = os.path.isdir("/proc")
+        self.peak_browser_rss = 0
+        self._rss_samples: List[int] = []
+        self._cpu: Dict[int, float] = {}
+        self._cpu_start = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    def _sample(self) -> None:
+        pids = descendants(os.getpid())
+        rss = sum(rss_bytes(pid) for pid in pids)
+        self._rss_samples.append(rss)
+        self.peak_browser_rss = max(self.peak_browser_rss, rss)
+        for pid in [os.getpid(), *pids]:
+            self._cpu[pid] = max(self._cpu.get(pid, 0.0), cpu_seconds(pid))
+
+    async def _run(self) -> None:
+        while True:
+            self._sample()
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if not self.supported:
+            return
+        self._sample()
+        self._cpu_start = sum(self._cpu.values())
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> Dict[str, float]:
+        if self._task is None:
+            return {}
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._sample()
+        samples = self._rss_samples or [0]
+        return {
+            "browser_rss_peak_mb": round(self.peak_browser_rss / 2**20, 1),
+            "browser_rss_mean_mb": round(sum(samples) / len(samples) / 2**20, 1),
+            "cpu_seconds": round(sum(self._cpu.values()) - self._cpu_start, 2),
+        }
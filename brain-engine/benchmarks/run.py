@@ -0,0 +1,189 @@
+"""
+Offline scraper benchmark.
+
+Runs searches against a local fake Google Flights server at a controlled
+concurrency and reports latency percentiles, throughput, browser memory and
+CPU time. Every performance change should be judged against this.
+
+Usage:
+    python -m benchmarks.run --target scraper --searches 20 --concurrency 4
+    python -m benchmarks.run --target api --latency-ms 300 --failure-rate 0.1
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from typing import Any, Dict, List
+
+from benchmarks.fake_server import FakeGoogleFlightsServer
+from benchmarks.procstats import ProcessSampler
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--target", choices=["scraper", "api"], default="scraper",
+        help="Drive search_flights_multi_country directly or POST /api/search",
+    )
+    parser.add_argument("--searches", type=int, default=20, help="Total searches to run")
+    parser.add_argument("--concurrency", type=int, default=4, help="Searches in flight at once")
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed searches run first")
+    parser.add_argument("--latency-ms", type=int, default=0, help="Injected server latency")
+    parser.add_argument("--jitter-ms", type=int, default=0, help="Random extra server latency")
+    parser.add_argument(
+        "--failure-rate", type=float, default=0.0,
+        help="Fraction of page loads answered with HTTP 503",
+    )
+    parser.add_argument("--page", help="Serve this recorded results page instead of the generated one")
+    parser.add_argument(
+        "--repeat-route", action="store_true",
+        help="Search the same route every time (exercises caching and coalescing)",
+    )
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    return parser.parse_args(argv)
+
+
+def configure_environment(server: FakeGoogleFlightsServer, args: argparse.Namespace) -> None:
+    """Point settings at the fake server. Must run before ``src`` is imported."""
+    os.environ["GOOGLE_FLIGHTS_URL"] = server.flights_url
+    os.environ["PROXY_ENABLED"] = "false"
+    os.environ.setdefault("API_KEY", "benchmark-key")
+    os.environ.setdefault("OXYLABS_USERNAME", "benchmark")
+    os.environ.setdefault("OXYLABS_PASSWORD", "benchmark")
+    # Keep results out of Redis and, unless asked for, out of the cache
+    os.environ["REDIS_URL"] = ""
+    # Fake-server prices must not reach the real price history (and through
+    # it /api/history and country selection), nor its consent state
+    data_dir = tempfile.mkdtemp(prefix="brain-engine-benchmark-")
+    os.environ["HISTORY_DB_PATH"] = os.path.join(data_dir, "price_history.db")
+    os.environ["CONSENT_STATE_DIR"] = os.path.join(data_dir, "consent")
+    if not args.repeat_route:
+        os.environ.setdefault("CACHE_TTL", "0")
+
+
+def build_request_body(index: int, repeat_route: bool) -> Dict[str, Any]:
+    offset = 0 if repeat_route else index
+    departure = date(2030, 1, 1) + timedelta(days=offset)
+    return {
+        "origin": "LAX",
+        "destination": "NRT",
+        "departureDate": departure.isoformat(),
+    }
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+async def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    from src.models.flight import FlightSearchRequest
+    from src.scraper.browser import browser_pool
+    from src.scraper.flights import search_flights_multi_country
+
+    client = None
+    if args.target == "api":
+        import httpx
+        from src.main import app
+
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url="http://benchmark",
+            headers={"Authorization": f"Bearer {os.environ['API_KEY']}"},
+            timeout=None,
+        )
+
+    async def one_search(index: int) -> Dict[str, Any]:
+        body = build_request_body(index, args.repeat_route)
+        if client is not None:
+            response = await client.post("/api/search", json=body)
+            response.raise_for_status()
+            return response.json()
+        return await search_flights_multi_country(FlightSearchRequest(**body))
+
+    await browser_pool.start()
+    try:
+        for i in range(args.warmup):
+            await one_search(-1 - i)
+
+        semaphore = asyncio.Semaphore(args.concurrency)
+        latencies: List[float] = []
+        failures = 0
+        empty = 0
+
+        async def timed(index: int) -> None:
+            nonlocal failures, empty
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    result = await one_search(index)
+                except Exception as e:
+                    failures += 1
+                    print(f"Search {index} failed: {e}", file=sys.stderr)
+                    return
+                latencies.append(time.perf_counter() - started)
+                if not result.get("flights"):
+                    empty += 1
+
+        sampler = ProcessSampler()
+        sampler.start()
+        wall_start = time.perf_counter()
+        await asyncio.gather(*(timed(i) for i in range(args.searches)))
+        wall = time.perf_counter() - wall_start
+        resources = await sampler.stop()
+    finally:
+        if client is not None:
+            await client.aclose()
+        await browser_pool.stop()
+
+    return {
+        "target": args.target,
+        "searches": args.searches,
+        "concurrency": args.concurrency,
+        "failures": failures,
+        "empty_results": empty,
+        "latency_p50_s": round(percentile(latencies, 50), 3),
+        "latency_p95_s": round(percentile(latencies, 95), 3),
+        "latency_p99_s": round(percentile(latencies, 99), 3),
+        "searches_per_second": round(len(latencies) / wall, 3) if wall else 0.0,
+        "wall_seconds": round(wall, 2),
+        **resources,
+    }
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    width = max(len(key) for key in report)
+    for key, value in report.items():
+        print(f"{key.ljust(width)}  {value}")
+
+
+def main(argv: List[str] = None) -> None:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    with FakeGoogleFlightsServer(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        failure_rate=args.failure_rate,
+        page_path=args.page,
+    ) as server:
+        configure_environment(server, args)
+        report = asyncio.run(run_benchmark(args))
+        report["server_requests"] = server.requests_served
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
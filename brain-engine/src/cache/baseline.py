@@ -0,0 +1,137 @@
+"""Separately cached US baseline prices."""
+
+import asyncio
+import contextvars
+import logging
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from src.cache.search_cache import BASELINE_KEY_PREFIX, SearchCache, build_cache_key
+from src.config import settings
+from src.metrics import BASELINE_CACHE_REQUESTS
+from src.models.flight import FlightSearchRequest
+from src.scheduler import PageScheduler, search_scheduler
+
+logger = logging.getLogger(__name__)
+
+BASELINE_COUNTRY = "us"
+
+# Scrapes the baseline flights for the request it was created for
+BaselineScraper = Callable[[], Awaitable[List[Dict[str, Any]]]]
+
+
+class BaselineCache:
+    """
+    US baseline flights per route and date, cached apart from full results.
+
+    The baseline only feeds ``original_price`` and savings, and moves far
+    more slowly than the arbitrage prices, so it is kept for ``ttl``
+    seconds. Once an entry is older than ``refresh_after`` it is still
+    served, and a single background scrape replaces it. Like prewarming,
+    that scrape only runs on an idle page slot from ``scheduler`` and is
+    skipped otherwise, so it never competes with live searches.
+    """
+
+    def __init__(
+        self,
+        ttl: Optional[int] = None,
+        refresh_after: Optional[int] = None,
+        max_entries: Optional[int] = None,
+        redis_url: Optional[str] = None,
+        scheduler: Optional[PageScheduler] = None,
+    ):
+        self.cache = SearchCache(
+            ttl=ttl if ttl is not None else settings.baseline_cache_ttl,
+            max_entries=max_entries,
+            redis_url=redis_url,
+            stale_ttl=0,
+        )
+        self.refresh_after = (
+            refresh_after if refresh_after is not None else settings.baseline_refresh_after
+        )
+        self.scheduler = scheduler or search_scheduler
+        self._refreshing: Dict[str, asyncio.Task] = {}
+
+    @staticmethod
+    def key(request: FlightSearchRequest) -> str:
+        return build_cache_key(request, [BASELINE_COUNTRY], prefix=BASELINE_KEY_PREFIX)
+
+    async def get(
+        self,
+        request: FlightSearchRequest,
+        refresh: Optional[BaselineScraper] = None,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Look up the baseline flights for a search.
+
+        Args:
+            request: Flight search parameters
+            refresh: Scrapes a new baseline; run in the background when the
+                cached one is past ``refresh_after``
+
+        Returns:
+            Cached baseline flights, or None on a miss
+        """
+        key = self.key(request)
+        entry = await self.cache.get(key)
+        if entry is None:
+            BASELINE_CACHE_REQUESTS.labels(result="miss").inc()
+            return None
+
+        age = (datetime.now(timezone.utc) - entry.stored_at).total_seconds()
+        if age >= self.refresh_after and refresh is not None:
+            BASELINE_CACHE_REQUESTS.labels(result="stale").inc()
+            self._schedule_refresh(key, request, refresh)
+        else:
+            BASELINE_CACHE_REQUESTS.labels(result="hit").inc()
+        return entry.results["flights"]
+
+    async def set(self, request: FlightSearchRequest, flights: List[Dict[str, Any]]) -> None:
+        """Store freshly scraped baseline flights (empty results are not cached)."""
+        await self.cache.set(self.key(request), {"flights": flights})
+
+    def _schedule_refresh(
+        self,
+        key: str,
+        request: FlightSearchRequest,
+        refresh: BaselineScraper,
+    ) -> None:
+        if key in self._refreshing:
+            return
+        ticket = self.scheduler.try_acquire(1, reserve=settings.prewarm_reserved_pages)
+        if ticket is None:
+            # Busy, paused or draining: the next stale hit tries again
+            logger.debug(f"No idle page slot, skipping baseline refresh for {key}")
+            return
+
+        async def run() -> None:
+            try:
+                flights = await refresh()
+                if flights:
+                    await self.set(request, flights)
+                    logger.info(
+                        f"Refreshed baseline for {request.origin} -> {request.destination} "
+                        f"on {request.departure_date}"
+                    )
+            except Exception as e:
+                logger.warning(f"Baseline refresh failed: {e}")
+            finally:
+                self._refreshing.pop(key, None)
+
+        # A fresh context: the refresh outlives the search that triggered it
+        # and must not report into that search's settled outcomes
+        task = asyncio.create_task(run(), context=contextvars.Context())
+        # Also returns the slot if the task is cancelled before it starts
+        task.add_done_callback(lambda _: self.scheduler.release(ticket))
+        self._refreshing[key] = task
+
+    async def close(self) -> None:
+        tasks = list(self._refreshing.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._refreshing.clear()
+        await self.cache.close()
+
+
+baseline_cache = BaselineCache(redis_url=settings.redis_url)
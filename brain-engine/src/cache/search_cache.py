@@ -0,0 +1,253 @@
+"""Two-tier cache for aggregated flight search results."""
+
+import copy
+import hashlib
+import json
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Optional
+
+from src.config import settings
+from src.models.flight import FlightSearchRequest
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY_PREFIX = "brain-engine:search:v1:"
+BASELINE_KEY_PREFIX = "brain-engine:baseline:v1:"
+
+
+@dataclass
+class CacheEntry:
+    """
+    Cached search results with their storage and expiry times.
+
+    Entries are fresh until ``expires_at``. After that they may still be
+    served as stale, while they are refreshed, until ``stale_until``.
+    """
+
+    results: Dict[str, Any]
+    stored_at: datetime
+    expires_at: datetime
+    stale_until: Optional[datetime] = None
+
+    def is_stale(self, now: Optional[datetime] = None) -> bool:
+        return (now or datetime.now(timezone.utc)) >= self.expires_at
+
+    def is_expired(self, now: Optional[datetime] = None) -> bool:
+        return (now or datetime.now(timezone.utc)) >= (self.stale_until or self.expires_at)
+
+    def age_seconds(self, now: Optional[datetime] = None) -> float:
+        return ((now or datetime.now(timezone.utc)) - self.stored_at).total_seconds()
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "results": self.results,
+            "stored_at": self.stored_at.isoformat(),
+            "expires_at": self.expires_at.isoformat(),
+            "stale_until": self.stale_until.isoformat() if self.stale_until else None,
+        })
+
+    @classmethod
+    def from_json(cls, raw: str) -> "CacheEntry":
+        data = json.loads(raw)
+        stale_until = data.get("stale_until")
+        return cls(
+            results=data["results"],
+            stored_at=datetime.fromisoformat(data["stored_at"]),
+            expires_at=datetime.fromisoformat(data["expires_at"]),
+            stale_until=datetime.fromisoformat(stale_until) if stale_until else None,
+        )
+
+
+def build_cache_key(
+    request: FlightSearchRequest,
+    countries: Iterable[str],
+    prefix: str = CACHE_KEY_PREFIX,
+) -> str:
+    """
+    Build a cache key from the normalized request and searched countries.
+
+    Args:
+        request: Flight search parameters
+        countries: Country codes the search covers
+        prefix: Key namespace
+
+    Returns:
+        Cache key string
+    """
+    normalized = {
+        "origin": request.origin.upper(),
+        "destination": request.destination.upper(),
+        "departure_date": request.departure_date,
+        "return_date": request.return_date,
+        "passengers": request.passengers,
+        "cabin_class": request.cabin_class.value,
+        "countries": sorted({c.lower() for c in countries}),
+    }
+    digest = hashlib.sha256(
+        json.dumps(normalized, sort_keys=True).encode()
+    ).hexdigest()[:32]
+    return f"{prefix}{digest}"
+
+
+class LRUCache:
+    """Bounded in-process cache with per-entry expiry."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.is_expired():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class RedisCache:
+    """Optional shared cache tier backed by Redis."""
+
+    def __init__(self, url: str):
+        self.url = url
+        self._client = None
+
+    def _get_client(self):
+        if self._client is None:
+            import redis.asyncio as redis
+
+            self._client = redis.from_url(self.url)
+        return self._client
+
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        try:
+            raw = await self._get_client().get(key)
+        except Exception as e:
+            logger.warning(f"Redis cache read failed: {e}")
+            return None
+        if raw is None:
+            return None
+        try:
+            entry = CacheEntry.from_json(raw)
+        except (ValueError, KeyError) as e:
+            logger.warning(f"Discarding malformed cache entry {key}: {e}")
+            return None
+        return None if entry.is_expired() else entry
+
+    async def set(self, key: str, entry: CacheEntry, ttl: int) -> None:
+        try:
+            await self._get_client().set(key, entry.to_json(), ex=ttl)
+        except Exception as e:
+            logger.warning(f"Redis cache write failed: {e}")
+
+    async def close(self) -> None:
+        if self._client is not None:
+            try:
+                await self._client.aclose()
+            except Exception as e:
+                logger.debug(f"Error closing Redis client: {e}")
+            self._client = None
+
+
+class SearchCache:
+    """
+    In-process LRU in front of an optional Redis tier.
+
+    Reads check the local tier first and backfill it from Redis. Writes go
+    to both tiers with the same expiry. Entries are fresh for ``ttl``
+    seconds and then kept for another ``stale_ttl`` seconds, during which
+    ``get`` still returns them (``is_stale()`` is true).
+    """
+
+    def __init__(
+        self,
+        ttl: Optional[int] = None,
+        max_entries: Optional[int] = None,
+        redis_url: Optional[str] = None,
+        stale_ttl: Optional[int] = None,
+    ):
+        self.ttl = ttl if ttl is not None else settings.cache_ttl
+        self.stale_ttl = stale_ttl if stale_ttl is not None else settings.cache_stale_ttl
+        self.local = LRUCache(max_entries or settings.cache_max_entries)
+        self.remote = RedisCache(redis_url) if redis_url else None
+
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        """
+        Look up cached results.
+
+        Args:
+            key: Cache key from ``build_cache_key``
+
+        Returns:
+            A copy of the cached entry, or None on a miss
+        """
+        entry = self.local.get(key)
+        if entry is None and self.remote is not None:
+            entry = await self.remote.get(key)
+            if entry is not None:
+                self.local.set(key, entry)
+        if entry is None:
+            return None
+        return CacheEntry(
+            results=copy.deepcopy(entry.results),
+            stored_at=entry.stored_at,
+            expires_at=entry.expires_at,
+            stale_until=entry.stale_until,
+        )
+
+    async def set(self, key: str, results: Dict[str, Any]) -> Optional[datetime]:
+        """
+        Store search results in both tiers.
+
+        Searches that found no flights, or that lost countries to the
+        search deadline or to an open circuit breaker, are not cached.
+
+        Args:
+            key: Cache key from ``build_cache_key``
+            results: Aggregated results from ``search_flights_multi_country``
+
+        Returns:
+            Time the stored entry goes stale, or None if nothing was cached
+        """
+        if self.ttl <= 0 or not results.get("flights"):
+            return None
+        if results.get("countries_timed_out") or results.get("countries_skipped"):
+            return None
+        now = datetime.now(timezone.utc)
+        entry = CacheEntry(
+            results=copy.deepcopy(results),
+            stored_at=now,
+            expires_at=now + timedelta(seconds=self.ttl),
+            stale_until=now + timedelta(seconds=self.ttl + self.stale_ttl),
+        )
+        self.local.set(key, entry)
+        if self.remote is not None:
+            await self.remote.set(key, entry, self.ttl + self.stale_ttl)
+        return entry.expires_at
+
+    async def close(self) -> None:
+        if self.remote is not None:
+            await self.remote.close()
+
+
+search_cache = SearchCache(redis_url=settings.redis_url)
@@ -0,0 +1,93 @@
+"""Coalescing of identical concurrent calls into a single execution."""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Identical requests a moment apart compute deadlines that differ by that
+# moment; a call ending at most this much earlier still counts as covering.
+DEADLINE_SLACK_SECONDS = 1.0
+
+
+class _Call:
+    """An in-flight execution and the number of callers awaiting it."""
+
+    def __init__(self, task: "asyncio.Task[Any]", deadline: Optional[float] = None):
+        self.task = task
+        self.deadline = deadline
+        self.waiters = 0
+
+    def covers(self, deadline: Optional[float]) -> bool:
+        """Whether this call may run at least as long as a caller allows."""
+        if self.deadline is None:
+            return True
+        return deadline is not None and self.deadline >= deadline - DEADLINE_SLACK_SECONDS
+
+
+class SingleFlight:
+    """
+    Registry of in-flight calls keyed by request.
+
+    The first caller for a key starts the work; callers arriving while it
+    runs await the same task, unless that task gives up earlier than
+    they would (a deadline shorter by more than ``DEADLINE_SLACK_SECONDS``):
+    they start a fresh execution, which later callers join instead. A caller that is cancelled (e.g. the client
+    disconnected) only detaches itself; the shared work is cancelled once
+    no callers are left waiting on it.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, _Call] = {}
+        self.coalesced_total = 0
+
+    @property
+    def in_flight(self) -> int:
+        """Number of distinct calls currently executing."""
+        return len(self._calls)
+
+    async def do(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[T]],
+        deadline: Optional[float] = None,
+    ) -> T:
+        """
+        Run ``fn`` once per key, sharing the result with concurrent callers.
+
+        Args:
+            key: Identity of the work, e.g. a normalized search cache key
+            fn: Zero-argument coroutine function performing the work
+            deadline: Event loop time by which ``fn`` gives up (None: no
+                limit); only calls running at least this long, give or
+                take ``DEADLINE_SLACK_SECONDS``, are joined
+
+        Returns:
+            The result of the shared execution
+        """
+        call = self._calls.get(key)
+        if call is None or not call.covers(deadline):
+            call = _Call(asyncio.ensure_future(fn()), deadline)
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _: self._forget(key, call))
+        else:
+            self.coalesced_total += 1
+            logger.debug(f"Coalesced request onto in-flight call {key}")
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                # Every caller gave up; stop the work and let new callers
+                # start a fresh execution instead of joining a dying one.
+                self._forget(key, call)
+                call.task.cancel()
+
+    def _forget(self, key: str, call: _Call) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
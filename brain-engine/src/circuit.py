@@ -0,0 +1,259 @@
+"""Per-country circuit breakers for scrape failures."""
+
+import logging
+import statistics
+import time
+from collections import deque
+from contextvars import ContextVar
+from enum import Enum
+from typing import Callable, Deque, Dict, List, Optional, Set, Tuple
+
+from src.config import settings
+from src.metrics import COUNTRY_CIRCUIT_SKIPS, COUNTRY_CIRCUIT_STATE
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitState(str, Enum):
+    """Whether a country is being searched."""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+# Gauge values for COUNTRY_CIRCUIT_STATE
+STATE_VALUES = {CircuitState.CLOSED: 0, CircuitState.HALF_OPEN: 1, CircuitState.OPEN: 2}
+
+
+class CircuitBreaker:
+    """
+    Tracks one country's recent searches and stops sending it traffic when
+    too many fail.
+
+    A search fails when it errors, times out, is cancelled at the deadline,
+    finds nothing while other countries found flights for the same search
+    (see ``SearchOutcomes``), or takes longer than ``slow_call_seconds``. Once at least
+    ``min_calls`` searches within the last ``window`` seconds have a failure
+    rate of ``failure_threshold`` or more, the circuit opens and the country
+    is skipped for ``open_seconds``. After that a single probe search is let
+    through (half-open): success closes the circuit, failure reopens it.
+    """
+
+    def __init__(
+        self,
+        country_code: str,
+        window: Optional[float] = None,
+        min_calls: Optional[int] = None,
+        failure_threshold: Optional[float] = None,
+        open_seconds: Optional[float] = None,
+        slow_call_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.country_code = country_code
+        self.window = window if window is not None else settings.circuit_window_seconds
+        self.min_calls = min_calls if min_calls is not None else settings.circuit_min_calls
+        self.failure_threshold = (
+            failure_threshold if failure_threshold is not None
+            else settings.circuit_failure_threshold
+        )
+        self.open_seconds = (
+            open_seconds if open_seconds is not None else settings.circuit_open_seconds
+        )
+        self.slow_call_seconds = (
+            slow_call_seconds if slow_call_seconds is not None
+            else settings.circuit_slow_call_seconds
+        )
+        self.clock = clock
+        self.state = CircuitState.CLOSED
+        self.opened_at: Optional[float] = None
+        self._probing = False
+        # (finished at, succeeded, seconds)
+        self._calls: Deque[Tuple[float, bool, float]] = deque()
+
+    def _set_state(self, state: CircuitState) -> None:
+        if state != self.state:
+            logger.warning(f"Circuit for {self.country_code}: {self.state.value} -> {state.value}")
+        self.state = state
+        COUNTRY_CIRCUIT_STATE.labels(country=self.country_code).set(STATE_VALUES[state])
+
+    def _trim(self) -> None:
+        cutoff = self.clock() - self.window
+        while self._calls and self._calls[0][0] < cutoff:
+            self._calls.popleft()
+
+    def allow(self) -> bool:
+        """
+        Whether a search may run now.
+
+        A True answer in the half-open state claims the single probe, so
+        every allowed search must be followed by ``record``.
+        """
+        if self.state == CircuitState.OPEN:
+            if self.clock() - self.opened_at < self.open_seconds:
+                return False
+            self._set_state(CircuitState.HALF_OPEN)
+        if self.state == CircuitState.HALF_OPEN:
+            if self._probing:
+                return False
+            self._probing = True
+        return True
+
+    def record(self, succeeded: bool, seconds: float) -> None:
+        """Record the outcome of an allowed search."""
+        if self.slow_call_seconds and seconds > self.slow_call_seconds:
+            succeeded = False
+        now = self.clock()
+
+        if self.state == CircuitState.HALF_OPEN:
+            self._probing = False
+            if succeeded:
+                self._calls.clear()
+                self._calls.append((now, True, seconds))
+                self._set_state(CircuitState.CLOSED)
+            else:
+                self._open(now)
+            return
+        if self.state == CircuitState.OPEN:
+            return
+
+        self._calls.append((now, succeeded, seconds))
+        self._trim()
+        if len(self._calls) >= self.min_calls and self.failure_rate() >= self.failure_threshold:
+            self._open(now)
+
+    def _open(self, now: float) -> None:
+        self.opened_at = now
+        self._set_state(CircuitState.OPEN)
+
+    def failure_rate(self) -> float:
+        """Share of searches in the window that failed."""
+        self._trim()
+        if not self._calls:
+            return 0.0
+        return sum(1 for _, ok, _ in self._calls if not ok) / len(self._calls)
+
+    def snapshot(self) -> Dict[str, object]:
+        """Current state and rolling stats, for /health."""
+        self._trim()
+        seconds = [s for _, _, s in self._calls]
+        retry_in = None
+        if self.state == CircuitState.OPEN:
+            retry_in = max(0.0, self.opened_at + self.open_seconds - self.clock())
+        return {
+            "state": self.state,
+            "calls": len(self._calls),
+            "failure_rate": round(self.failure_rate(), 3),
+            "median_seconds": round(statistics.median(seconds), 2) if seconds else None,
+            "retry_in_seconds": round(retry_in, 1) if retry_in is not None else None,
+        }
+
+
+class SearchOutcomes:
+    """
+    Circuit bookkeeping for one multi-country search.
+
+    A country that finds no flights only counts as failing when another
+    country found flights for the same search: a route with nothing on that
+    date is empty from everywhere and says nothing about the country. Zero
+    results are therefore held back until ``settle`` runs, once every
+    country of the search has finished; a result arriving after that (e.g.
+    from a task that outlived the search) is judged and recorded at once.
+    Countries skipped because their circuit is open are collected in
+    ``skipped``.
+    """
+
+    def __init__(self, registry: "CircuitBreakerRegistry"):
+        self.registry = registry
+        self.skipped: List[str] = []
+        # Labels (searches within a batch) some country found flights for
+        self._found: Set[str] = set()
+        # (country code, label, seconds)
+        self._empty: List[Tuple[str, str, float]] = []
+        self._settled = False
+
+    def found(self, label: str) -> None:
+        self._found.add(label)
+
+    def defer_empty(self, country_code: str, label: str, seconds: float) -> None:
+        if self._settled:
+            self.registry.record(country_code, label not in self._found, seconds)
+        else:
+            self._empty.append((country_code, label, seconds))
+
+    def settle(self) -> None:
+        """Record the held back zero results now that the search is over."""
+        self._settled = True
+        empty, self._empty = self._empty, []
+        for country_code, label, seconds in empty:
+            self.registry.record(country_code, label not in self._found, seconds)
+
+
+# Outcomes of the multi-country search the current task belongs to
+SEARCH_OUTCOMES: ContextVar[Optional[SearchOutcomes]] = ContextVar(
+    "search_outcomes", default=None
+)
+
+
+class CircuitBreakerRegistry:
+    """One lazily created circuit breaker per country."""
+
+    def __init__(self, enabled: Optional[bool] = None):
+        self.enabled = enabled if enabled is not None else settings.circuit_breaker_enabled
+        self.breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, country_code: str) -> CircuitBreaker:
+        if country_code not in self.breakers:
+            self.breakers[country_code] = CircuitBreaker(country_code)
+        return self.breakers[country_code]
+
+    def allow(self, country_code: str) -> bool:
+        """Whether a search from this country may run; counts and reports skips."""
+        if not self.enabled or self.get(country_code).allow():
+            return True
+        COUNTRY_CIRCUIT_SKIPS.labels(country=country_code).inc()
+        outcomes = SEARCH_OUTCOMES.get()
+        if outcomes is not None and country_code not in outcomes.skipped:
+            outcomes.skipped.append(country_code)
+        return False
+
+    def record(self, country_code: str, succeeded: bool, seconds: float) -> None:
+        if self.enabled:
+            self.get(country_code).record(succeeded, seconds)
+
+    def record_results(
+        self,
+        country_code: str,
+        found: bool,
+        seconds: float,
+        label: str = "search",
+    ) -> None:
+        """
+        Record a search that loaded and was read without errors.
+
+        Finding flights is a success. Finding none is judged against the
+        other countries of the same search once it settles; outside a
+        multi-country search there is nothing to compare with, so it counts
+        as a success.
+
+        Args:
+            country_code: Country searched from
+            found: Whether any flights were found
+            seconds: How long the search took
+            label: Search within a batch the result belongs to
+        """
+        outcomes = SEARCH_OUTCOMES.get()
+        if found and outcomes is not None:
+            outcomes.found(label)
+        if found or outcomes is None:
+            self.record(country_code, True, seconds)
+        else:
+            outcomes.defer_empty(country_code, label, seconds)
+
+    def snapshot(self) -> Dict[str, Dict[str, object]]:
+        return {code: breaker.snapshot() for code, breaker in sorted(self.breakers.items())}
+
+    def reset(self) -> None:
+        self.breakers.clear()
+
+
+circuit_breakers = CircuitBreakerRegistry()
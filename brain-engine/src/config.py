@@ -1,7 +1,7 @@
 """Configuration management for Brain Engine."""
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 
 class Settings(BaseSettings):
@@ -14,24 +14,129 @@ class Settings(BaseSettings):
     api_host: str = "0.0.0.0"
     api_port: int = 8000
     debug: bool = False
+    # Graceful shutdown: on SIGTERM, reject new searches and report draining
+    # on /health for at least DRAIN_NOTICE_SECONDS, and wait up to
+    # DRAIN_TIMEOUT seconds for in-flight searches before exiting
+    drain_timeout: float = 60.0
+    drain_notice_seconds: float = 5.0
     
     # Oxylabs Proxy Configuration
     oxylabs_username: str
     oxylabs_password: str
     oxylabs_endpoint: str = "pr.oxylabs.io:7777"
+    proxy_enabled: bool = True  # disable to browse directly (local benchmarks)
     
     # Search Configuration
+    google_flights_url: str = "https://www.google.com/travel/flights"
     search_countries: List[str] = ["in", "mx", "br", "th", "tr"]
     max_results_per_country: int = 10
     request_timeout: int = 30000  # milliseconds
+    search_deadline_ms: int = 45000  # overall budget per search
+    # "network" (parse results RPC, DOM fallback), "evaluate" (one DOM
+    # round-trip) or "element" (per-field element handles)
+    extraction_mode: Literal["network", "evaluate", "element"] = "evaluate"
+    batch_searches_per_context: int = 3  # routes one context runs back to back
+    
+    # Country Circuit Breakers
+    # A country whose recent searches mostly fail (error, timeout, no
+    # results or slower than CIRCUIT_SLOW_CALL_SECONDS) is skipped for
+    # CIRCUIT_OPEN_SECONDS, then probed with a single search
+    circuit_breaker_enabled: bool = True
+    circuit_window_seconds: int = 300
+    circuit_min_calls: int = 5
+    circuit_failure_threshold: float = 0.5
+    circuit_open_seconds: int = 120
+    circuit_slow_call_seconds: float = 30.0  # 0 disables
+    
+    # Deployment
+    # "standalone" scrapes in the API process; "api" queues each country
+    # scrape for scraper workers (python -m src.worker) via REDIS_URL
+    deployment_mode: Literal["standalone", "api"] = "standalone"
+    worker_concurrency: Optional[int] = None  # default: pool capacity
+    # How often workers report memory pressure to the API (seconds)
+    worker_status_interval: float = 15.0
+    # Scraper subprocesses on this node, each with its own browser pool and
+    # a share of the countries; 0 scrapes in the API process
+    scraper_processes: int = 0
+    
+    # Admission Control
+    max_concurrent_pages: Optional[int] = None  # default: pool capacity
+    max_queued_searches: int = 20
+    
+    # Cache Prewarming
+    prewarm_enabled: bool = False
+    prewarm_interval: int = 600  # seconds between prewarm cycles
+    prewarm_top_n: int = 20  # most-requested searches to keep warm
+    prewarm_routes: List[str] = []  # always-warm routes, e.g. ["LAX-NRT"]
+    prewarm_date_offsets: List[int] = [7, 14, 30]  # days ahead for prewarm_routes
+    prewarm_hours: List[int] = []  # UTC hours to prewarm in (empty: any hour)
+    prewarm_concurrency: int = 1
+    prewarm_min_gap: float = 5.0  # seconds between prewarm scrapes
+    prewarm_reserved_pages: int = 6  # page slots always left for live searches
+    
+    # Search Jobs
+    job_workers: int = 4
+    job_max_pending: int = 100
+    job_ttl: int = 3600  # seconds results are kept after the last update
     
     # Caching (Optional)
     redis_url: Optional[str] = None
-    cache_ttl: int = 900  # 15 minutes
+    cache_ttl: int = 900  # 15 minutes fresh
+    cache_stale_ttl: int = 2700  # then served stale while refreshing; scraped synchronously after
+    cache_max_entries: int = 1000  # in-process LRU bound
+    baseline_cache_ttl: int = 21600  # US baseline prices, 6 hours (0 disables)
+    baseline_refresh_after: int = 3600  # age at which a baseline is re-scraped in the background
+    
+    # Price History
+    history_enabled: bool = True
+    history_db_path: str = "data/price_history.db"  # SQLite file
+    history_retention_days: int = 180  # 0 keeps everything
+    
+    # Adaptive Country Selection
+    # When enabled, searches only scrape the countries that have saved the
+    # most on a route recently (plus the US baseline and an occasional
+    # exploratory pick); routes without enough history search everywhere
+    adaptive_countries_enabled: bool = False
+    adaptive_top_k: int = 3
+    adaptive_exploration_rate: float = 0.1
+    adaptive_min_samples: int = 3  # searches before a country can be skipped
+    adaptive_window_days: int = 30
+    adaptive_stats_ttl: int = 60  # seconds a route's country stats are reused
     
     # Browser Configuration
     headless: bool = True
     browser_timeout: int = 30000
+    
+    # Page Loading
+    # "selector" waits for result rows after DOMContentLoaded,
+    # "networkidle" waits for the network to go quiet
+    page_readiness: Literal["selector", "networkidle"] = "selector"
+    blocked_resource_types: List[str] = ["image", "font", "media"]
+    blocked_hosts: List[str] = [
+        "google-analytics.com",
+        "googletagmanager.com",
+        "doubleclick.net",
+        "googlesyndication.com",
+        "googleadservices.com",
+    ]
+    
+    # Consent State
+    # Cookies/localStorage saved after accepting a country's consent wall
+    # and loaded into its new contexts; "" keeps them in memory only
+    consent_state_enabled: bool = True
+    consent_state_dir: str = "data/consent"
+    consent_state_ttl: int = 604800  # seconds
+    
+    # Browser Pool Configuration
+    browser_pool_size: int = 2  # long-lived Chromium processes
+    browser_max_contexts: int = 6  # concurrent contexts per browser
+    browser_max_uses: int = 100  # contexts served before a browser is recycled
+    browser_max_age: int = 3600  # seconds before a browser is recycled; 0 disables
+    browser_max_rss_mb: int = 1536  # per-browser memory before it is recycled; 0 disables
+    # All Chromium processes together (split between scraper subprocesses);
+    # over it new searches wait. 0 disables
+    browser_total_rss_mb: int = 0
+    browser_memory_check_interval: float = 15.0  # seconds; 0 disables the checks
 
 
 settings = Settings()
@@ -0,0 +1,320 @@
+"""Local price history of every scraped flight, stored in SQLite."""
+
+import asyncio
+import logging
+import os
+import sqlite3
+import statistics
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from src.config import settings
+from src.models.flight import FlightSearchRequest
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS price_observations (
+    id INTEGER PRIMARY KEY,
+    origin TEXT NOT NULL,
+    destination TEXT NOT NULL,
+    departure_date TEXT NOT NULL,
+    return_date TEXT,
+    cabin_class TEXT NOT NULL,
+    passengers INTEGER NOT NULL,
+    country TEXT NOT NULL,
+    airline TEXT NOT NULL,
+    price REAL NOT NULL,
+    currency TEXT NOT NULL,
+    stops INTEGER,
+    departure_time TEXT,
+    arrival_time TEXT,
+    duration TEXT,
+    scraped_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_observations_route_time
+    ON price_observations (origin, destination, scraped_at);
+CREATE INDEX IF NOT EXISTS idx_observations_route_date
+    ON price_observations (origin, destination, departure_date, scraped_at);
+CREATE INDEX IF NOT EXISTS idx_observations_route_country
+    ON price_observations (origin, destination, country, scraped_at);
+CREATE INDEX IF NOT EXISTS idx_observations_airline
+    ON price_observations (airline, scraped_at);
+CREATE INDEX IF NOT EXISTS idx_observations_scraped_at
+    ON price_observations (scraped_at);
+
+CREATE TABLE IF NOT EXISTS country_searches (
+    id INTEGER PRIMARY KEY,
+    origin TEXT NOT NULL,
+    destination TEXT NOT NULL,
+    departure_date TEXT NOT NULL,
+    return_date TEXT,
+    cabin_class TEXT NOT NULL,
+    country TEXT NOT NULL,
+    flights_found INTEGER NOT NULL,
+    min_price REAL,
+    search_seconds REAL,
+    scraped_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_searches_route_time
+    ON country_searches (origin, destination, scraped_at);
+CREATE INDEX IF NOT EXISTS idx_searches_scraped_at
+    ON country_searches (scraped_at);
+"""
+
+
+class PriceHistory:
+    """
+    Append-only store of scraped flight prices.
+
+    Rows are keyed by route, travel dates, country searched from, airline
+    and scrape time. Database work runs in a worker thread so the event
+    loop is never blocked; write failures are logged and dropped.
+    """
+
+    def __init__(self, path: Optional[str] = None, enabled: Optional[bool] = None):
+        self.path = path or settings.history_db_path
+        self.enabled = enabled if enabled is not None else settings.history_enabled
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def _execute_many(self, sql: str, rows: List[tuple]) -> None:
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.executemany(sql, rows)
+
+    def _query(self, sql: str, params: tuple) -> List[tuple]:
+        with self._lock:
+            return self._connect().execute(sql, params).fetchall()
+
+    async def record(
+        self,
+        request: FlightSearchRequest,
+        country_code: str,
+        flights: List[Dict[str, Any]],
+        scraped_at: Optional[datetime] = None,
+        search_seconds: Optional[float] = None,
+    ) -> None:
+        """
+        Store the outcome of one country's search and the flights it found.
+
+        Args:
+            request: Search the flights were scraped for
+            country_code: Country searched from
+            flights: Flight dictionaries as built by the scraper (empty
+                when the search failed or found nothing)
+            scraped_at: Scrape time (default: now)
+            search_seconds: How long the country search took
+        """
+        if not self.enabled:
+            return
+        scraped_at = (scraped_at or datetime.now(timezone.utc)).isoformat()
+        search_row = (
+            request.origin.upper(),
+            request.destination.upper(),
+            request.departure_date,
+            request.return_date,
+            request.cabin_class.value,
+            country_code,
+            len(flights),
+            min((f["price"] for f in flights), default=None),
+            search_seconds,
+            scraped_at,
+        )
+        rows = [
+            (
+                request.origin.upper(),
+                request.destination.upper(),
+                request.departure_date,
+                request.return_date,
+                request.cabin_class.value,
+                request.passengers,
+                country_code,
+                flight["airline"],
+                flight["price"],
+                flight.get("currency", "USD"),
+                flight.get("stops"),
+                flight.get("departure_time"),
+                flight.get("arrival_time"),
+                flight.get("duration"),
+                scraped_at,
+            )
+            for flight in flights
+        ]
+        try:
+            await asyncio.to_thread(self._insert, search_row, rows)
+        except Exception as e:
+            logger.warning(f"Failed to record price history: {e}")
+
+    def _insert(self, search_row: tuple, rows: List[tuple]) -> None:
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT INTO country_searches (origin, destination, departure_date, "
+                    "return_date, cabin_class, country, flights_found, min_price, "
+                    "search_seconds, scraped_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    search_row,
+                )
+                conn.executemany(
+                    "INSERT INTO price_observations (origin, destination, departure_date, "
+                    "return_date, cabin_class, passengers, country, airline, price, currency, "
+                    "stops, departure_time, arrival_time, duration, scraped_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+
+    async def country_stats(
+        self,
+        origin: str,
+        destination: str,
+        since: Optional[datetime] = None,
+        baseline_country: str = "us",
+    ) -> Dict[str, Dict[str, float]]:
+        """
+        Per-country search outcomes for a route.
+
+        Savings compare a country's cheapest price with the baseline
+        country's cheapest for the same travel dates and cabin on the same
+        scrape day.
+
+        Args:
+            origin: Origin airport IATA code
+            destination: Destination airport IATA code
+            since: Only searches at or after this time (default: all)
+            baseline_country: Country savings are measured against
+
+        Returns:
+            Country code -> searches, success_rate, mean_seconds,
+            mean_savings_percent (None without comparable baseline data)
+            and savings_samples
+        """
+        sql = (
+            "SELECT country, departure_date, return_date, cabin_class, "
+            "substr(scraped_at, 1, 10), flights_found, min_price, search_seconds "
+            "FROM country_searches WHERE origin = ? AND destination = ?"
+        )
+        params: List[Any] = [origin.upper(), destination.upper()]
+        if since:
+            sql += " AND scraped_at >= ?"
+            params.append(since.astimezone(timezone.utc).isoformat())
+        rows = await asyncio.to_thread(self._query, sql, tuple(params))
+
+        baseline: Dict[tuple, float] = {}
+        for country, dep, ret, cabin, day, found, price, _ in rows:
+            if country == baseline_country and price is not None:
+                group = (dep, ret, cabin, day)
+                baseline[group] = min(price, baseline.get(group, price))
+
+        totals: Dict[str, Dict[str, Any]] = {}
+        for country, dep, ret, cabin, day, found, price, seconds in rows:
+            entry = totals.setdefault(
+                country, {"searches": 0, "successes": 0, "seconds": [], "savings": []}
+            )
+            entry["searches"] += 1
+            entry["successes"] += 1 if found else 0
+            if seconds is not None:
+                entry["seconds"].append(seconds)
+            base = baseline.get((dep, ret, cabin, day))
+            if price is not None and base:
+                entry["savings"].append((base - price) / base * 100)
+
+        return {
+            country: {
+                "searches": entry["searches"],
+                "success_rate": entry["successes"] / entry["searches"],
+                "mean_seconds": (
+                    statistics.fmean(entry["seconds"]) if entry["seconds"] else None
+                ),
+                "mean_savings_percent": (
+                    statistics.fmean(entry["savings"]) if entry["savings"] else None
+                ),
+                "savings_samples": len(entry["savings"]),
+            }
+            for country, entry in totals.items()
+        }
+
+    async def price_summary(
+        self,
+        origin: str,
+        destination: str,
+        departure_date: Optional[str] = None,
+        since: Optional[datetime] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Min and median price per country per scrape day for a route.
+
+        Args:
+            origin: Origin airport IATA code
+            destination: Destination airport IATA code
+            departure_date: Only this departure date (default: all)
+            since: Only scrapes at or after this time (default: all)
+
+        Returns:
+            Dicts with country, day, min_price, median_price and
+            observations, ordered by day then country
+        """
+        sql = (
+            "SELECT country, substr(scraped_at, 1, 10) AS day, price "
+            "FROM price_observations WHERE origin = ? AND destination = ?"
+        )
+        params: List[Any] = [origin.upper(), destination.upper()]
+        if departure_date:
+            sql += " AND departure_date = ?"
+            params.append(departure_date)
+        if since:
+            sql += " AND scraped_at >= ?"
+            params.append(since.astimezone(timezone.utc).isoformat())
+        sql += " ORDER BY day, country"
+
+        rows = await asyncio.to_thread(self._query, sql, tuple(params))
+        grouped: Dict[tuple, List[float]] = {}
+        for country, day, price in rows:
+            grouped.setdefault((day, country), []).append(price)
+        return [
+            {
+                "country": country,
+                "day": day,
+                "min_price": min(prices),
+                "median_price": statistics.median(prices),
+                "observations": len(prices),
+            }
+            for (day, country), prices in grouped.items()
+        ]
+
+    async def prune(self, retention_days: Optional[int] = None) -> None:
+        """Delete observations older than the retention window."""
+        days = retention_days if retention_days is not None else settings.history_retention_days
+        if not self.enabled or days <= 0:
+            return
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
+        try:
+            for table in ("price_observations", "country_searches"):
+                await asyncio.to_thread(
+                    self._execute_many,
+                    f"DELETE FROM {table} WHERE scraped_at < ?",
+                    [(cutoff,)],
+                )
+        except Exception as e:
+            logger.warning(f"Failed to prune price history: {e}")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+price_history = PriceHistory()
@@ -0,0 +1,318 @@
+"""Asynchronous search jobs with pollable status and retained results."""
+
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from src.config import settings
+from src.models.flight import (
+    CountrySearchResult,
+    FlightSearchRequest,
+    FlightSearchResponse,
+    SearchJob,
+    SearchJobStatus,
+)
+from src.scheduler import AdmissionRejected
+
+logger = logging.getLogger(__name__)
+
+JOB_KEY_PREFIX = "brain-engine:job:"
+
+# Called with each country's results as it finishes
+ProgressCallback = Callable[[CountrySearchResult], Awaitable[None]]
+# Runs a search, reporting per-country progress, and returns the response
+SearchExecutor = Callable[[FlightSearchRequest, ProgressCallback], Awaitable[FlightSearchResponse]]
+
+
+class JobQueueFull(Exception):
+    """Raised when no more jobs can be accepted."""
+
+
+class JobRunnerDraining(Exception):
+    """Raised when jobs are submitted while the runner is shutting down."""
+
+
+class InMemoryJobStore:
+    """Job state held in this process; expired jobs are purged lazily."""
+
+    def __init__(self):
+        self._jobs: Dict[str, SearchJob] = {}
+
+    def _purge(self) -> None:
+        now = datetime.now(timezone.utc)
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.expires_at is not None and job.expires_at <= now
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    async def save(self, job: SearchJob) -> None:
+        self._purge()
+        self._jobs[job.job_id] = job.model_copy(deep=True)
+
+    async def get(self, job_id: str) -> Optional[SearchJob]:
+        self._purge()
+        job = self._jobs.get(job_id)
+        return job.model_copy(deep=True) if job is not None else None
+
+    async def close(self) -> None:
+        pass
+
+
+class RedisJobStore:
+    """
+    Job state shared between API replicas through Redis.
+
+    Jobs are also kept in this replica's memory, so while Redis is
+    unreachable the jobs started here can still be saved and polled.
+    """
+
+    def __init__(self, url: str):
+        self.url = url
+        self._client = None
+        self._local = InMemoryJobStore()
+
+    def _get_client(self):
+        if self._client is None:
+            import redis.asyncio as redis
+
+            self._client = redis.from_url(self.url)
+        return self._client
+
+    async def save(self, job: SearchJob) -> None:
+        await self._local.save(job)
+        ttl = job.expires_at - datetime.now(timezone.utc) if job.expires_at else None
+        try:
+            await self._get_client().set(
+                f"{JOB_KEY_PREFIX}{job.job_id}",
+                job.model_dump_json(),
+                ex=max(int(ttl.total_seconds()), 1) if ttl else None,
+            )
+        except Exception as e:
+            logger.warning(f"Redis job write failed: {e}")
+
+    async def get(self, job_id: str) -> Optional[SearchJob]:
+        try:
+            raw = await self._get_client().get(f"{JOB_KEY_PREFIX}{job_id}")
+        except Exception as e:
+            logger.warning(f"Redis job read failed: {e}")
+            return await self._local.get(job_id)
+        if raw is None:
+            return await self._local.get(job_id)
+        return SearchJob.model_validate_json(raw)
+
+    async def close(self) -> None:
+        if self._client is not None:
+            try:
+                await self._client.aclose()
+            except Exception as e:
+                logger.debug(f"Error closing Redis client: {e}")
+            self._client = None
+
+
+class SearchJobRunner:
+    """
+    Accepts search jobs and runs them on a fixed pool of background workers.
+
+    Jobs are retained for ``ttl`` seconds after their last update. Workers
+    start lazily on first submission if ``start`` was not called. A job
+    turned away by admission control goes back to queued and is retried
+    after the suggested delay, until ``ttl`` seconds after it was created.
+    On
+    shutdown, ``drain`` stops accepting jobs, fails the queued ones and
+    waits for the running ones; ``stop`` fails whatever is still running.
+    """
+
+    def __init__(
+        self,
+        execute: SearchExecutor,
+        store=None,
+        workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        ttl: Optional[int] = None,
+    ):
+        self.execute = execute
+        self.store = store or InMemoryJobStore()
+        self.workers = workers or settings.job_workers
+        self.max_pending = max_pending or settings.job_max_pending
+        self.ttl = ttl or settings.job_ttl
+        self._queue: Optional["asyncio.Queue[Tuple[str, FlightSearchRequest]]"] = None
+        self._tasks: List[asyncio.Task] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Jobs currently being executed, by ID
+        self._running: Dict[str, SearchJob] = {}
+        self._draining = False
+
+    def start(self) -> None:
+        """Start the worker pool on the running event loop."""
+        loop = asyncio.get_running_loop()
+        self._draining = False
+        if self._tasks and self._loop is loop:
+            return
+        self._loop = loop
+        self._queue = asyncio.Queue(maxsize=self.max_pending)
+        self._tasks = [
+            asyncio.create_task(self._worker(i)) for i in range(self.workers)
+        ]
+        logger.info(f"Search job runner started with {self.workers} workers")
+
+    async def stop(self) -> None:
+        """Cancel workers, marking interrupted jobs failed; queued jobs are left as they are."""
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        running, self._running = self._running, {}
+        for job in running.values():
+            await self._fail(job, "Search interrupted by shutdown")
+        self._queue = None
+        self._loop = None
+        await self.store.close()
+
+    async def drain(self, timeout: float) -> bool:
+        """
+        Stop accepting jobs and let the running ones finish.
+
+        Queued jobs would only be turned away by admission control, which
+        is draining too, so they are failed now with an error asking the
+        caller to resubmit, instead of waiting for their TTL.
+
+        Args:
+            timeout: Longest to wait for running jobs, in seconds
+
+        Returns:
+            True if every running job finished in time
+        """
+        self._draining = True
+        if self._queue is None:
+            return True
+        queued = []
+        while not self._queue.empty():
+            queued.append(self._queue.get_nowait())
+            self._queue.task_done()
+        for job_id, request in queued:
+            job = await self.store.get(job_id) or SearchJob(job_id=job_id, request=request)
+            await self._fail(job, "Search not started before shutdown, resubmit it")
+        if queued:
+            logger.info(f"Failed {len(queued)} queued search jobs for shutdown")
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"{len(self._running)} search jobs still running after {timeout:.0f}s")
+            return False
+        return True
+
+    async def _fail(self, job: SearchJob, error: str) -> None:
+        job.status = SearchJobStatus.FAILED
+        job.error = error
+        await self.store.save(self._touch(job))
+
+    def _touch(self, job: SearchJob) -> SearchJob:
+        job.updated_at = datetime.now(timezone.utc)
+        job.expires_at = job.updated_at + timedelta(seconds=self.ttl)
+        return job
+
+    async def submit(self, request: FlightSearchRequest) -> SearchJob:
+        """
+        Queue a search and return its job record immediately.
+
+        Args:
+            request: Flight search parameters
+
+        Returns:
+            The queued job
+
+        Raises:
+            JobQueueFull: If ``max_pending`` jobs are already waiting
+            JobRunnerDraining: If the runner is shutting down
+        """
+        if self._draining:
+            raise JobRunnerDraining("shutting down")
+        self.start()
+        if self._queue.full():
+            raise JobQueueFull(f"{self.max_pending} jobs already pending")
+        job = self._touch(SearchJob(job_id=uuid.uuid4().hex, request=request))
+        await self.store.save(job)
+        self._queue.put_nowait((job.job_id, request))
+        return job
+
+    async def get(self, job_id: str) -> Optional[SearchJob]:
+        """Look up a job by ID."""
+        return await self.store.get(job_id)
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            job_id, request = await self._queue.get()
+            try:
+                await self._run(job_id, request)
+            except Exception as e:
+                logger.error(f"Search job {job_id} crashed in worker {index}: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job_id: str, request: FlightSearchRequest) -> None:
+        job = await self.store.get(job_id)
+        if job is None:
+            job = SearchJob(job_id=job_id, request=request)
+        job.status = SearchJobStatus.RUNNING
+        self._running[job_id] = job
+        await self.store.save(self._touch(job))
+
+        async def on_country(result: CountrySearchResult) -> None:
+            job.partial_results.append(result)
+            await self.store.save(self._touch(job))
+
+        while True:
+            try:
+                job.result = await self.execute(request, on_country)
+                job.status = SearchJobStatus.COMPLETED
+            except AdmissionRejected as e:
+                if await self._wait_to_retry(job, e):
+                    job.status = SearchJobStatus.RUNNING
+                    await self.store.save(self._touch(job))
+                    continue
+            except Exception as e:
+                logger.error(f"Search job {job_id} failed: {e}")
+                job.status = SearchJobStatus.FAILED
+                job.error = f"Search failed: {str(e)}"
+            break
+        self._running.pop(job_id, None)
+        await self.store.save(self._touch(job))
+
+    async def _wait_to_retry(self, job: SearchJob, rejected: AdmissionRejected) -> bool:
+        """
+        Put a job turned away by admission control back to queued and wait
+        the suggested delay.
+
+        Returns:
+            True if the job should be retried, False if it was marked failed
+            because the runner is draining or the job would expire first
+        """
+        retry_at = datetime.now(timezone.utc) + timedelta(seconds=rejected.retry_after)
+        if not self._draining and retry_at <= job.created_at + timedelta(seconds=self.ttl):
+            logger.info(
+                f"Search job {job.job_id} not admitted ({rejected.reason}), "
+                f"retrying in {rejected.retry_after}s"
+            )
+            job.status = SearchJobStatus.QUEUED
+            await self.store.save(self._touch(job))
+            await asyncio.sleep(rejected.retry_after)
+            if not self._draining:
+                return True
+        job.status = SearchJobStatus.FAILED
+        if self._draining:
+            job.error = "Search not started before shutdown, resubmit it"
+        else:
+            logger.warning(f"Search job {job.job_id} never admitted ({rejected.reason})")
+            job.error = f"Search not admitted before the job expired: {rejected.reason}"
+        return False
+
+
+def create_job_store():
+    """Redis-backed store when REDIS_URL is set, in-memory otherwise."""
+    if settings.redis_url:
+        return RedisJobStore(settings.redis_url)
+    return InMemoryJobStore()
@@ -5,21 +5,73 @@ This service scrapes flight prices from multiple geographic locations
 to find the best deals through price arbitrage.
 """
 
-from fastapi import FastAPI, HTTPException, Depends, Header, status
+from fastapi import FastAPI, HTTPException, Depends, Header, Query, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from datetime import datetime
-from typing import Optional
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+import asyncio
+import json
 import logging
+import math
 
 from src.config import settings
+from src.history import price_history
+from src.jobs import (
+    JobQueueFull,
+    JobRunnerDraining,
+    ProgressCallback,
+    SearchJobRunner,
+    create_job_store,
+)
+from src.prewarm import Prewarmer, RouteTracker
+from src.cache.baseline import baseline_cache
+from src.cache.search_cache import CacheEntry, build_cache_key, search_cache
+from src.cache.singleflight import SingleFlight
+from src.metrics import (
+    CACHE_REQUESTS,
+    CONTENT_TYPE_LATEST,
+    SEARCH_SECONDS,
+    SEARCHES_IN_FLIGHT,
+    register_callback_metric,
+    render_metrics,
+)
 from src.models.flight import (
+    BatchSearchRequest,
+    BatchSearchResponse,
     FlightSearchRequest,
     FlightSearchResponse,
     HealthResponse,
+    PriceHistoryPoint,
+    PriceHistoryResponse,
     Flight,
+    CountrySearchResult,
+    DatePriceSummary,
+    DateRangeSearchRequest,
+    DateRangeSearchResponse,
+    SearchJob,
+)
+from src.circuit import SearchOutcomes, circuit_breakers
+from src.scheduler import AdmissionRejected, Ticket, search_scheduler
+from src.scraper.browser import browser_pool
+from src.scraper.flights import (
+    CountryResultCallback,
+    aggregate_results,
+    expand_date_range,
+    get_search_countries,
+    get_search_deadline,
+    get_sequential_deadline,
+    iter_country_results,
+    search_many_multi_country,
+    search_flights_multi_country,
+    select_search_countries,
+    with_deadline,
 )
-from src.scraper.flights import search_flights_multi_country
+from src.scraper.proxy import get_country_info
+from src.shutdown import graceful_shutdown
+from src.worker import ScrapeWorker
+from src.workqueue import scrape_client, scrapes_remotely, work_queue
 
 # Configure logging
 logging.basicConfig(
@@ -28,6 +80,70 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Background re-scrapes of stale cached searches
+background_refreshes: Set[asyncio.Task] = set()
+
+# Identical concurrent searches share a single scrape
+search_flights_inflight = SingleFlight()
+register_callback_metric(
+    "brain_engine_coalesced_searches",
+    "Searches served by joining an identical in-flight scrape",
+    lambda: search_flights_inflight.coalesced_total,
+    kind="counter",
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start shared resources on startup and release them on shutdown."""
+    # Browsers live on scraper workers or subprocesses, unless the queue is
+    # in-process and this process has to run them itself
+    local_worker = None
+    graceful_shutdown.reset()
+    graceful_shutdown.install()
+    if not scrapes_remotely() or work_queue.in_process:
+        await browser_pool.start()
+        # Hold back new searches while Chromium is over its memory cap
+        browser_pool.pressure_callbacks.append(search_scheduler.set_paused)
+    if scrapes_remotely() and work_queue.in_process:
+        logger.warning("DEPLOYMENT_MODE=api without REDIS_URL: scraping in-process")
+        local_worker = ScrapeWorker(work_queue)
+        local_worker.start()
+    elif scrapes_remotely():
+        # Same, for Chromium on scraper workers or subprocesses
+        work_queue.pressure_callbacks.append(search_scheduler.set_paused)
+    await work_queue.start()
+    await price_history.prune()
+    search_jobs.start()
+    # Queued and running jobs are part of what a shutdown drains
+    graceful_shutdown.drainers.append(search_jobs.drain)
+    if settings.prewarm_enabled:
+        prewarmer.start()
+    try:
+        yield
+    finally:
+        # Let admitted searches finish before tearing down what they use
+        await graceful_shutdown.drain()
+        graceful_shutdown.uninstall()
+        graceful_shutdown.drainers.remove(search_jobs.drain)
+        await prewarmer.stop()
+        await search_jobs.stop()
+        for task in list(background_refreshes):
+            task.cancel()
+        await asyncio.gather(*background_refreshes, return_exceptions=True)
+        await baseline_cache.close()
+        await scrape_client.stop()
+        if local_worker is not None:
+            await local_worker.stop()
+        await work_queue.close()
+        await browser_pool.stop()
+        for callbacks in (browser_pool.pressure_callbacks, work_queue.pressure_callbacks):
+            if search_scheduler.set_paused in callbacks:
+                callbacks.remove(search_scheduler.set_paused)
+        await search_cache.close()
+        price_history.close()
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Ryoko Brain Engine",
@@ -35,6 +151,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs" if settings.debug else None,
     redoc_url="/redoc" if settings.debug else None,
+    lifespan=lifespan,
 )
 
 # Configure CORS
@@ -96,9 +213,80 @@ async def root():
 
 
 @app.get("/health", response_model=HealthResponse)
-async def health_check():
-    """Health check endpoint for monitoring."""
-    return HealthResponse()
+async def health_check(response: Response):
+    """
+    Health check endpoint for monitoring.
+    
+    Returns 503 with status "draining" once the instance is shutting down,
+    so load balancers stop routing new searches to it.
+    """
+    if graceful_shutdown.draining:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return HealthResponse(
+        status="draining" if graceful_shutdown.draining else "healthy",
+        in_flight_searches=search_flights_inflight.in_flight,
+        coalesced_searches=search_flights_inflight.coalesced_total,
+        countries=circuit_breakers.snapshot(),
+    )
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics endpoint."""
+    return Response(render_metrics(), media_type=CONTENT_TYPE_LATEST)
+
+
+def build_search_response(
+    results: Dict[str, Any],
+    cached: bool = False,
+    cache_expires_at: Optional[datetime] = None,
+) -> FlightSearchResponse:
+    """
+    Convert aggregated scraper results into the API response model.
+    
+    Args:
+        results: Aggregated results from the scraper
+        cached: Whether the results were served from cache
+        cache_expires_at: When the cached copy of these results expires
+        
+    Returns:
+        FlightSearchResponse
+    """
+    return FlightSearchResponse(
+        success=True,
+        flights=[Flight(**f) for f in results["flights"]],
+        total_results=results["total_results"],
+        countries_searched=results["countries_searched"],
+        best_price=results["best_price"],
+        baseline_price=results["baseline_price"],
+        best_savings_percent=results["best_savings_percent"],
+        search_time_seconds=results["search_time_seconds"],
+        countries_timed_out=results.get("countries_timed_out", []),
+        countries_skipped=results.get("countries_skipped", []),
+        cached=cached,
+        cache_expires_at=cache_expires_at,
+    )
+
+
+def build_cached_response(cache_entry: CacheEntry) -> FlightSearchResponse:
+    """Build the API response for results served from cache."""
+    response = build_search_response(
+        cache_entry.results,
+        cached=True,
+        cache_expires_at=cache_entry.expires_at,
+    )
+    response.stale = cache_entry.is_stale()
+    response.cache_age_seconds = round(cache_entry.age_seconds(), 1)
+    return response
+
+
+def admission_error(e: AdmissionRejected) -> HTTPException:
+    """Translate an admission rejection into a retryable HTTP error."""
+    return HTTPException(
+        status_code=e.status_code,
+        detail=f"Search capacity exhausted ({e.reason}), retry later",
+        headers={"Retry-After": str(e.retry_after)},
+    )
 
 
 @app.post("/api/search", response_model=FlightSearchResponse)
@@ -118,6 +306,9 @@ async def search_flights(
         
     Returns:
         FlightSearchResponse with aggregated results
+        
+    Raises:
+        HTTPException: 429 or 503 with Retry-After when overloaded
     """
     logger.info(
         f"Flight search: {request.origin} -> {request.destination} "
@@ -125,39 +316,730 @@ async def search_flights(
     )
     
     try:
-        # Execute multi-country search
-        results = await search_flights_multi_country(request)
+        with SEARCH_SECONDS.labels(endpoint="search").time(), \
+                SEARCHES_IN_FLIGHT.track_inprogress():
+            return await _search_flights(request)
+    except AdmissionRejected as e:
+        raise admission_error(e)
+    except Exception as e:
+        logger.error(f"Search failed: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Search failed: {str(e)}"
+        )
+
+
+def build_country_result(
+    country_code: str,
+    flights: List[Dict[str, Any]]
+) -> CountrySearchResult:
+    """Wrap one country's flights for streaming or job progress."""
+    return CountrySearchResult(
+        country_code=country_code,
+        country=get_country_info(country_code)["name"],
+        is_baseline=country_code == "us",
+        flights=[Flight(**f) for f in flights],
+    )
+
+
+def cache_lookup_result(cache_entry: Optional[CacheEntry]) -> str:
+    """Label a cache lookup as a hit, a stale hit or a miss."""
+    if cache_entry is None:
+        return "miss"
+    return "stale" if cache_entry.is_stale() else "hit"
+
+
+async def scrape_and_cache(
+    request: FlightSearchRequest,
+    country_codes: List[str],
+    cache_key: str,
+    on_country: Optional[CountryResultCallback] = None,
+) -> Tuple[Dict[str, Any], Optional[datetime]]:
+    """
+    Scrape a search under admission control and cache the results.
+    
+    Returns:
+        Tuple of (aggregated results, time the cached copy goes stale)
+    """
+    deadline = get_search_deadline(request)
+    async with search_scheduler.admit(len(country_codes), deadline) as ticket:
+        # Execute multi-country search with what is left of the budget
+        results = await search_flights_multi_country(
+            with_deadline(request, deadline - ticket.waited),
+            on_country=on_country,
+            country_codes=country_codes,
+        )
+    return results, await search_cache.set(cache_key, results)
+
+
+def search_deadline_at(request: FlightSearchRequest) -> float:
+    """Event loop time a search started now gives up at, for coalescing."""
+    return asyncio.get_running_loop().time() + get_search_deadline(request)
+
+
+def refresh_in_background(request: FlightSearchRequest, cache_key: str) -> None:
+    """
+    Re-scrape a stale cached search without making the caller wait.
+    
+    The refresh joins any identical in-flight scrape, and is dropped
+    rather than queued when admission control rejects it.
+    """
+    async def run():
+        try:
+            scrape_codes = await select_search_countries(request)
+            await search_flights_inflight.do(
+                cache_key,
+                lambda: scrape_and_cache(request, scrape_codes, cache_key),
+                deadline=search_deadline_at(request),
+            )
+        except AdmissionRejected as e:
+            logger.info(f"Skipped background refresh ({e.reason})")
+        except Exception as e:
+            logger.warning(f"Background refresh failed: {e}")
+    
+    task = asyncio.ensure_future(run())
+    background_refreshes.add(task)
+    task.add_done_callback(background_refreshes.discard)
+
+
+async def is_search_fresh(request: FlightSearchRequest) -> bool:
+    """Whether a search's cached results stay fresh until the next prewarm cycle."""
+    country_codes = await select_search_countries(request, explore=False)
+    cache_entry = await search_cache.get(build_cache_key(request, country_codes))
+    if cache_entry is None:
+        return False
+    remaining = (cache_entry.expires_at - datetime.now(timezone.utc)).total_seconds()
+    return remaining > settings.prewarm_interval
+
+
+async def prewarm_search(request: FlightSearchRequest) -> str:
+    """
+    Re-scrape a popular search into the cache using only idle page slots.
+    
+    Returns:
+        "warmed", or "busy" if live searches need the pages
+    """
+    country_codes = await select_search_countries(request, explore=False)
+    ticket = search_scheduler.try_acquire(
+        len(country_codes), reserve=settings.prewarm_reserved_pages
+    )
+    if ticket is None:
+        return "busy"
+    
+    cache_key = build_cache_key(request, country_codes)
+    
+    async def scrape():
+        results = await search_flights_multi_country(request, country_codes=country_codes)
+        return results, await search_cache.set(cache_key, results)
+    
+    try:
+        # Live searches for the same route join this scrape
+        await search_flights_inflight.do(cache_key, scrape, deadline=search_deadline_at(request))
+    finally:
+        search_scheduler.release(ticket)
+    return "warmed"
+
+
+# Popular searches are learned from live traffic and kept warm off-peak
+route_tracker = RouteTracker()
+prewarmer = Prewarmer(warm=prewarm_search, is_fresh=is_search_fresh, tracker=route_tracker)
+
+
+async def _search_flights(
+    request: FlightSearchRequest,
+    progress: Optional[ProgressCallback] = None
+) -> FlightSearchResponse:
+    """
+    Serve a search from cache or a (coalesced) scrape.
+    
+    Results past their freshness window but within the stale window are
+    served immediately, marked stale, and refreshed in the background.
+    With adaptive country selection the cache is keyed on the route's top
+    countries; an exploratory country, when picked, is scraped on top.
+    
+    Args:
+        request: Flight search parameters
+        progress: Awaited with each country's results as it finishes. A
+            search with a progress callback runs its own scrape rather
+            than joining an identical in-flight one.
+        
+    Returns:
+        FlightSearchResponse
+    """
+    route_tracker.record(request)
+    country_codes = await select_search_countries(request, explore=False)
+    cache_key = build_cache_key(request, country_codes)
+    cache_entry = await search_cache.get(cache_key)
+    CACHE_REQUESTS.labels(result=cache_lookup_result(cache_entry)).inc()
+    
+    if cache_entry is not None:
+        if cache_entry.is_stale():
+            logger.info(
+                f"Serving stale cache ({cache_entry.age_seconds():.0f}s old) for "
+                f"{request.origin} -> {request.destination}, refreshing"
+            )
+            refresh_in_background(request, cache_key)
+        else:
+            logger.info(f"Cache hit for {request.origin} -> {request.destination}")
+        return build_cached_response(cache_entry)
+    
+    country_codes = await select_search_countries(request)
+    on_country = None
+    if progress is not None:
+        async def on_country(country_code, flights):
+            await progress(build_country_result(country_code, flights))
+    
+    if progress is None:
+        # Only joins a scrape allowed to run at least as long as this one
+        results, cache_expires_at = await search_flights_inflight.do(
+            cache_key,
+            lambda: scrape_and_cache(request, country_codes, cache_key),
+            deadline=search_deadline_at(request),
+        )
+    else:
+        results, cache_expires_at = await scrape_and_cache(
+            request, country_codes, cache_key, on_country=on_country
+        )
+    
+    response = build_search_response(results, cache_expires_at=cache_expires_at)
+    
+    logger.info(
+        f"Search complete: {len(response.flights)} flights found, "
+        f"best savings: {results.get('best_savings_percent', 0)}%"
+    )
+    
+    return response
+
+
+def _ndjson_event(event: str, data: Dict[str, Any]) -> str:
+    """Encode a single NDJSON stream event."""
+    return json.dumps({"event": event, "data": data}) + "\n"
+
+
+async def stream_search_events(
+    request: FlightSearchRequest,
+    country_codes: List[str],
+    cache_entry: Optional[CacheEntry] = None,
+    ticket: Optional[Ticket] = None,
+    cache_key: Optional[str] = None,
+) -> AsyncIterator[str]:
+    """
+    Yield NDJSON events for a search as each country finishes.
+    
+    Emits one ``country`` event per country in completion order, then a
+    ``complete`` event carrying the aggregated FlightSearchResponse. Cache
+    hits skip straight to ``complete``. Failures emit an ``error`` event.
+    
+    Args:
+        request: Flight search parameters
+        country_codes: Countries to search from
+        cache_entry: Cached results to replay instead of scraping
+        ticket: Admission ticket held for the scrape, released when done
+        cache_key: Key to cache the results under (default: derived from
+            the request and ``country_codes``)
+    """
+    try:
+        if cache_entry is not None:
+            response = build_cached_response(cache_entry)
+            yield _ndjson_event("complete", response.model_dump(mode="json"))
+            return
+        
+        start_time = datetime.utcnow()
+        country_results: Dict[str, List[Dict[str, Any]]] = {
+            code: [] for code in country_codes
+        }
+        finished = set()
+        outcomes = SearchOutcomes(circuit_breakers)
+        
+        async for country_code, flights in iter_country_results(
+            request, country_codes, timeout=get_search_deadline(request), outcomes=outcomes
+        ):
+            country_results[country_code] = flights
+            finished.add(country_code)
+            event = build_country_result(country_code, flights)
+            yield _ndjson_event("country", event.model_dump(mode="json"))
+        
+        search_time = (datetime.utcnow() - start_time).total_seconds()
+        timed_out = [code for code in country_codes if code not in finished]
+        skipped = [code for code in country_codes if code in outcomes.skipped]
+        results = aggregate_results(country_results, search_time, timed_out, skipped)
+        cache_expires_at = await search_cache.set(
+            cache_key or build_cache_key(request, country_codes), results
+        )
+        response = build_search_response(results, cache_expires_at=cache_expires_at)
+        yield _ndjson_event("complete", response.model_dump(mode="json"))
+        
+    except Exception as e:
+        logger.error(f"Streaming search failed: {str(e)}")
+        yield _ndjson_event("error", {"error": f"Search failed: {str(e)}"})
+    finally:
+        if ticket is not None:
+            search_scheduler.release(ticket)
+
+
+class TicketStreamingResponse(StreamingResponse):
+    """
+    Streaming response that returns its admission ticket however it ends.
+    
+    The event generator releases the ticket when it finishes, but it never
+    runs at all if the client disconnects before the response starts or
+    sending fails, so the response releases it too. Releasing is idempotent.
+    """
+    
+    def __init__(self, content: AsyncIterator[str], ticket: Optional[Ticket] = None, **kwargs):
+        super().__init__(content, **kwargs)
+        self.ticket = ticket
+    
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            await self.body_iterator.aclose()
+            if self.ticket is not None:
+                search_scheduler.release(self.ticket)
+
+
+@app.post("/api/search/stream")
+async def search_flights_stream(
+    request: FlightSearchRequest,
+    api_key: str = Depends(verify_api_key)
+):
+    """
+    Search for flights, streaming per-country results as they complete.
+    
+    The response body is newline-delimited JSON. Each line is an object
+    with an ``event`` of ``country``, ``complete`` or ``error`` and its
+    ``data`` payload.
+    
+    Args:
+        request: Flight search parameters
+        api_key: Validated API key (injected by dependency)
+        
+    Returns:
+        StreamingResponse of NDJSON events
+        
+    Raises:
+        HTTPException: 429 or 503 with Retry-After when overloaded
+    """
+    logger.info(
+        f"Streaming flight search: {request.origin} -> {request.destination} "
+        f"on {request.departure_date}"
+    )
+    
+    route_tracker.record(request)
+    country_codes = await select_search_countries(request, explore=False)
+    cache_key = build_cache_key(request, country_codes)
+    cache_entry = await search_cache.get(cache_key)
+    CACHE_REQUESTS.labels(result=cache_lookup_result(cache_entry)).inc()
+    
+    ticket = None
+    if cache_entry is not None and cache_entry.is_stale():
+        refresh_in_background(request, cache_key)
+    elif cache_entry is None:
+        country_codes = await select_search_countries(request)
+        # Admit before streaming starts so overload is still a 429/503
+        deadline = get_search_deadline(request)
+        try:
+            ticket = await search_scheduler.acquire(len(country_codes), deadline)
+        except AdmissionRejected as e:
+            raise admission_error(e)
+        request = with_deadline(request, deadline - ticket.waited)
+    
+    return TicketStreamingResponse(
+        stream_search_events(request, country_codes, cache_entry, ticket, cache_key),
+        ticket=ticket,
+        media_type="application/x-ndjson",
+    )
+
+
+def build_date_summary(
+    day: str,
+    request: FlightSearchRequest,
+    results: Dict[str, Any],
+    cached: bool = False,
+) -> DatePriceSummary:
+    """Reduce one date's aggregated results to its best-price row."""
+    prices_by_country: Dict[str, float] = {}
+    for flight in results["flights"]:
+        country = flight["searched_from_country"]
+        prices_by_country[country] = min(
+            flight["price"], prices_by_country.get(country, flight["price"])
+        )
+    return DatePriceSummary(
+        date=day,
+        departure_date=request.departure_date,
+        return_date=request.return_date,
+        best_price=results["best_price"],
+        best_country=(
+            results["flights"][0]["searched_from_country"] if results["flights"] else None
+        ),
+        baseline_price=results["baseline_price"],
+        best_savings_percent=results["best_savings_percent"],
+        prices_by_country=prices_by_country,
+        total_results=results["total_results"],
+        countries_timed_out=results.get("countries_timed_out", []),
+        countries_skipped=results.get("countries_skipped", []),
+        cached=cached,
+    )
+
+
+async def _search_date_range(request: DateRangeSearchRequest) -> DateRangeSearchResponse:
+    """
+    Serve a date-range search, scraping only the dates not already cached.
+    
+    Each date is cached under the same key as the equivalent single-date
+    ``/api/search``, so the two endpoints warm each other.
+    
+    Args:
+        request: Search with ``flex_days`` set
         
-        # Convert to response model
-        flights = [Flight(**f) for f in results["flights"]]
+    Returns:
+        DateRangeSearchResponse
+    """
+    country_codes = get_search_countries()
+    date_requests = expand_date_range(request)
+    day_results: Dict[str, Dict[str, Any]] = {}
+    cached_days = set()
+    to_scrape: Dict[str, FlightSearchRequest] = {}
+    
+    for day, day_request in date_requests.items():
+        cache_entry = await search_cache.get(build_cache_key(day_request, country_codes))
+        CACHE_REQUESTS.labels(result=cache_lookup_result(cache_entry)).inc()
+        # Stale dates are re-scraped with the rest of the range
+        if cache_entry is not None and not cache_entry.is_stale():
+            day_results[day] = cache_entry.results
+            cached_days.add(day)
+        else:
+            to_scrape[day] = day_request
+    
+    timed_out: List[str] = []
+    skipped: List[str] = []
+    search_time = 0.0
+    if to_scrape:
+        deadline = get_sequential_deadline(request.deadline_ms, len(to_scrape))
+        async with search_scheduler.admit(len(country_codes), deadline) as ticket:
+            scraped = await search_many_multi_country(
+                to_scrape, timeout=deadline - ticket.waited
+            )
+        for day, results in scraped["searches"].items():
+            await search_cache.set(build_cache_key(to_scrape[day], country_codes), results)
+            day_results[day] = results
+        timed_out = scraped["countries_timed_out"]
+        skipped = scraped.get("countries_skipped", [])
+        search_time = scraped["search_time_seconds"]
+    
+    rows = [
+        build_date_summary(day, day_request, day_results[day], cached=day in cached_days)
+        for day, day_request in date_requests.items()
+    ]
+    priced = [row for row in rows if row.best_price is not None]
+    cheapest = min(priced, key=lambda row: row.best_price) if priced else None
+    
+    return DateRangeSearchResponse(
+        success=True,
+        flex_date=request.flex_date,
+        dates=rows,
+        cheapest_date=cheapest.date if cheapest else None,
+        best_price=cheapest.best_price if cheapest else None,
+        countries_searched=[get_country_info(code)["name"] for code in country_codes],
+        search_time_seconds=search_time,
+        countries_timed_out=timed_out,
+        countries_skipped=skipped,
+    )
+
+
+@app.post("/api/search/dates", response_model=DateRangeSearchResponse)
+async def search_date_range(
+    request: DateRangeSearchRequest,
+    api_key: str = Depends(verify_api_key)
+):
+    """
+    Find the cheapest day to fly within a date window.
+    
+    Searches ``flexDays`` consecutive departure (or return) dates from every
+    country and returns the best price per date. Each country uses one
+    browser context for all of its dates.
+    
+    Args:
+        request: Flight search parameters with ``flexDays`` set
+        api_key: Validated API key (injected by dependency)
+        
+    Returns:
+        DateRangeSearchResponse with one row per date
         
-        response = FlightSearchResponse(
-            success=True,
-            flights=flights,
-            total_results=results["total_results"],
-            countries_searched=results["countries_searched"],
-            best_price=results["best_price"],
-            baseline_price=results["baseline_price"],
-            best_savings_percent=results["best_savings_percent"],
-            search_time_seconds=results["search_time_seconds"],
-            cached=False,
+    Raises:
+        HTTPException: 400 without ``flexDays``; 429 or 503 with
+            Retry-After when overloaded
+    """
+    if not request.flex_days:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="flexDays is required for a date-range search"
         )
+    
+    logger.info(
+        f"Date-range search: {request.origin} -> {request.destination}, "
+        f"{request.flex_days} {request.flex_date.value} dates"
+    )
+    
+    try:
+        with SEARCH_SECONDS.labels(endpoint="dates").time(), \
+                SEARCHES_IN_FLIGHT.track_inprogress():
+            return await _search_date_range(request)
+    except AdmissionRejected as e:
+        raise admission_error(e)
+    except Exception as e:
+        logger.error(f"Date-range search failed: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Search failed: {str(e)}"
+        )
+
+
+async def _search_batch(batch: BatchSearchRequest) -> BatchSearchResponse:
+    """
+    Serve a batch of searches, scraping the uncached ones together.
+    
+    Searches are keyed by their cache key, so duplicates in a batch are
+    scraped once and each result is cached for ``/api/search``.
+    
+    Args:
+        batch: Searches to run
         
-        logger.info(
-            f"Search complete: {len(flights)} flights found, "
-            f"best savings: {results.get('best_savings_percent', 0)}%"
+    Returns:
+        BatchSearchResponse
+    """
+    country_codes = get_search_countries()
+    keys = [build_cache_key(request, country_codes) for request in batch.searches]
+    cache_entries: Dict[str, CacheEntry] = {}
+    to_scrape: Dict[str, FlightSearchRequest] = {}
+    
+    for key, request in zip(keys, batch.searches):
+        if key in cache_entries or key in to_scrape:
+            continue
+        cache_entry = await search_cache.get(key)
+        CACHE_REQUESTS.labels(result=cache_lookup_result(cache_entry)).inc()
+        # Stale routes are re-scraped with the rest of the batch
+        if cache_entry is not None and not cache_entry.is_stale():
+            cache_entries[key] = cache_entry
+        else:
+            to_scrape[key] = request
+    
+    scraped: Dict[str, Dict[str, Any]] = {}
+    cache_expires_at: Dict[str, Optional[datetime]] = {}
+    timed_out: List[str] = []
+    skipped: List[str] = []
+    search_time = 0.0
+    if to_scrape:
+        per_context = max(settings.batch_searches_per_context, 1)
+        # Never plan more contexts than admission can grant at once: a big
+        # batch runs more searches per context, with a deadline to match
+        max_contexts = max(search_scheduler.max_pages // len(country_codes), 1)
+        per_context = max(per_context, math.ceil(len(to_scrape) / max_contexts))
+        contexts_per_country = math.ceil(len(to_scrape) / per_context)
+        deadline = get_sequential_deadline(
+            batch.deadline_ms, min(len(to_scrape), per_context)
         )
+        async with search_scheduler.admit(
+            len(country_codes) * contexts_per_country, deadline
+        ) as ticket:
+            results = await search_many_multi_country(
+                to_scrape, timeout=deadline - ticket.waited, per_context=per_context
+            )
+        scraped = results["searches"]
+        for key, route_results in scraped.items():
+            cache_expires_at[key] = await search_cache.set(key, route_results)
+        timed_out = results["countries_timed_out"]
+        skipped = results.get("countries_skipped", [])
+        search_time = results["search_time_seconds"]
+    
+    responses = []
+    for key in keys:
+        if key in cache_entries:
+            responses.append(build_search_response(
+                cache_entries[key].results,
+                cached=True,
+                cache_expires_at=cache_entries[key].expires_at,
+            ))
+        else:
+            responses.append(build_search_response(
+                scraped[key], cache_expires_at=cache_expires_at[key]
+            ))
+    
+    return BatchSearchResponse(
+        success=True,
+        results=responses,
+        search_time_seconds=search_time,
+        countries_timed_out=timed_out,
+        countries_skipped=skipped,
+    )
+
+
+@app.post("/api/search/batch", response_model=BatchSearchResponse)
+async def search_batch(
+    batch: BatchSearchRequest,
+    api_key: str = Depends(verify_api_key)
+):
+    """
+    Search several routes in one request.
+    
+    All (route x country) work is scheduled together and grouped by
+    country, so each proxied browser context runs several routes back to
+    back instead of every route setting up its own contexts.
+    
+    Args:
+        batch: Searches to run
+        api_key: Validated API key (injected by dependency)
         
-        return response
+    Returns:
+        BatchSearchResponse with one FlightSearchResponse per search
         
+    Raises:
+        HTTPException: 429 or 503 with Retry-After when overloaded
+    """
+    logger.info(
+        f"Batch search: {len(batch.searches)} routes "
+        f"({', '.join(f'{r.origin}->{r.destination}' for r in batch.searches)})"
+    )
+    
+    try:
+        with SEARCH_SECONDS.labels(endpoint="batch").time(), \
+                SEARCHES_IN_FLIGHT.track_inprogress():
+            return await _search_batch(batch)
+    except AdmissionRejected as e:
+        raise admission_error(e)
     except Exception as e:
-        logger.error(f"Search failed: {str(e)}")
+        logger.error(f"Batch search failed: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Search failed: {str(e)}"
         )
 
 
+@app.get("/api/history", response_model=PriceHistoryResponse)
+async def get_price_history(
+    origin: str = Query(..., min_length=3, max_length=3),
+    destination: str = Query(..., min_length=3, max_length=3),
+    departure_date: Optional[str] = Query(None, alias="departureDate"),
+    days: int = Query(30, ge=1, le=365),
+    api_key: str = Depends(verify_api_key)
+):
+    """
+    Get the recorded price trend for a route without scraping.
+    
+    Args:
+        origin: Origin airport IATA code
+        destination: Destination airport IATA code
+        departure_date: Only searches for this departure date (default: all)
+        days: How many days of scrapes to include
+        api_key: Validated API key (injected by dependency)
+        
+    Returns:
+        PriceHistoryResponse with min and median price per country per day
+    """
+    since = datetime.now(timezone.utc) - timedelta(days=days)
+    rows = await price_history.price_summary(
+        origin, destination, departure_date=departure_date, since=since
+    )
+    return PriceHistoryResponse(
+        origin=origin.upper(),
+        destination=destination.upper(),
+        departure_date=departure_date,
+        since=since,
+        points=[
+            PriceHistoryPoint(
+                country_code=row["country"],
+                country=get_country_info(row["country"])["name"],
+                day=row["day"],
+                min_price=row["min_price"],
+                median_price=row["median_price"],
+                observations=row["observations"],
+            )
+            for row in rows
+        ],
+    )
+
+
+# Background search jobs, executed through the same cached search path
+search_jobs = SearchJobRunner(execute=_search_flights, store=create_job_store())
+
+
+@app.post(
+    "/api/search/jobs",
+    response_model=SearchJob,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def create_search_job(
+    request: FlightSearchRequest,
+    api_key: str = Depends(verify_api_key)
+):
+    """
+    Start a flight search in the background and return its job ID.
+    
+    Poll ``GET /api/search/jobs/{job_id}`` for status, per-country partial
+    results and the final FlightSearchResponse.
+    
+    Args:
+        request: Flight search parameters
+        api_key: Validated API key (injected by dependency)
+        
+    Returns:
+        The queued SearchJob
+        
+    Raises:
+        HTTPException: 429 if too many jobs are pending, 503 while shutting down
+    """
+    try:
+        if graceful_shutdown.draining:
+            raise JobRunnerDraining("shutting down")
+        job = await search_jobs.submit(request)
+    except JobRunnerDraining:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Shutting down, retry later",
+            headers={"Retry-After": "1"},
+        )
+    except JobQueueFull as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=f"Too many pending search jobs: {e}",
+            headers={"Retry-After": "5"},
+        )
+    
+    logger.info(
+        f"Search job {job.job_id}: {request.origin} -> {request.destination} "
+        f"on {request.departure_date}"
+    )
+    return job
+
+
+@app.get("/api/search/jobs/{job_id}", response_model=SearchJob)
+async def get_search_job(
+    job_id: str,
+    api_key: str = Depends(verify_api_key)
+):
+    """
+    Get the status and results of a search job.
+    
+    Args:
+        job_id: ID returned when the job was created
+        api_key: Validated API key (injected by dependency)
+        
+    Returns:
+        SearchJob
+        
+    Raises:
+        HTTPException: 404 if the job does not exist or has expired
+    """
+    job = await search_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Search job not found"
+        )
+    return job
+
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     """Global exception handler for unhandled errors."""
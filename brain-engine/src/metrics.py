@@ -0,0 +1,222 @@
+"""Prometheus metrics for the search hot path."""
+
+import os
+import tempfile
+from typing import Callable, Iterator, List
+
+from src.config import settings
+
+# Scraper subprocesses report through files the API process merges on
+# /metrics. prometheus_client picks its storage when first imported, so the
+# directory has to be in the environment before that, and before any
+# subprocess is spawned (they inherit it)
+if settings.scraper_processes > 0 and not os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="brain-engine-metrics-")
+
+from prometheus_client import (  # noqa: E402
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily  # noqa: E402
+
+# Re-exported so the API serves /metrics without importing prometheus_client
+# ahead of this module
+__all__ = ["CONTENT_TYPE_LATEST", "MULTIPROCESS_DIR", "mark_process_dead", "render_metrics"]
+
+MULTIPROCESS_DIR = os.environ.get("PROMETHEUS_MULTIPROC_DIR") or None
+
+# Scrape stages are seconds-scale; searches can run to the deadline
+STAGE_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 3, 5, 8, 13, 20, 30, 45)
+SEARCH_BUCKETS = (0.5, 1, 2, 5, 10, 15, 20, 30, 45, 60, 90)
+
+CONTEXT_ACQUIRE_SECONDS = Histogram(
+    "brain_engine_context_acquire_seconds",
+    "Time to obtain a configured browser context and page, including any browser launch",
+    ["country"],
+    buckets=STAGE_BUCKETS,
+)
+PAGE_GOTO_SECONDS = Histogram(
+    "brain_engine_page_goto_seconds",
+    "Time spent in page.goto",
+    ["country"],
+    buckets=STAGE_BUCKETS,
+)
+CONSENT_SECONDS = Histogram(
+    "brain_engine_consent_seconds",
+    "Time spent detecting and dismissing the cookie consent wall",
+    ["country"],
+    buckets=STAGE_BUCKETS,
+)
+EXTRACT_SECONDS = Histogram(
+    "brain_engine_extract_seconds",
+    "Time spent extracting flights from a loaded page or payload",
+    ["country"],
+    buckets=STAGE_BUCKETS,
+)
+COUNTRY_SEARCH_SECONDS = Histogram(
+    "brain_engine_country_search_seconds",
+    "Total time to search from one country",
+    ["country"],
+    buckets=SEARCH_BUCKETS,
+)
+SEARCH_SECONDS = Histogram(
+    "brain_engine_search_seconds",
+    "End-to-end search handling time per endpoint (search, dates, batch)",
+    ["endpoint"],
+    buckets=SEARCH_BUCKETS,
+)
+
+CACHE_REQUESTS = Counter(
+    "brain_engine_cache_requests_total",
+    "Search cache lookups",
+    ["result"],
+)
+BASELINE_CACHE_REQUESTS = Counter(
+    "brain_engine_baseline_cache_requests_total",
+    "US baseline cache lookups (hit, stale or miss)",
+    ["result"],
+)
+COUNTRY_TIMEOUTS = Counter(
+    "brain_engine_country_timeouts_total",
+    "Country searches that timed out, by stage",
+    ["country", "stage"],
+)
+EXTRACTION_FAILURES = Counter(
+    "brain_engine_extraction_failures_total",
+    "Errors while extracting flights from a page or result row",
+    ["country"],
+)
+COUNTRY_ERRORS = Counter(
+    "brain_engine_country_errors_total",
+    "Country searches that failed with an error",
+    ["country"],
+)
+ZERO_RESULT_COUNTRIES = Counter(
+    "brain_engine_zero_result_countries_total",
+    "Country searches that completed with no flights",
+    ["country"],
+)
+COUNTRY_CIRCUIT_STATE = Gauge(
+    "brain_engine_country_circuit_state",
+    "Country circuit breaker state (0 closed, 1 half-open, 2 open)",
+    ["country"],
+    multiprocess_mode="livemax",
+)
+COUNTRY_CIRCUIT_SKIPS = Counter(
+    "brain_engine_country_circuit_skips_total",
+    "Country searches skipped because the country's circuit was open",
+    ["country"],
+)
+
+ADMISSION_REJECTIONS = Counter(
+    "brain_engine_admission_rejections_total",
+    "Searches rejected by admission control",
+    ["reason"],
+)
+
+PREWARM_SEARCHES = Counter(
+    "brain_engine_prewarm_searches_total",
+    "Popular searches considered for cache prewarming, by outcome",
+    ["outcome"],
+)
+
+SEARCHES_IN_FLIGHT = Gauge(
+    "brain_engine_searches_in_flight",
+    "Search requests currently being handled",
+    multiprocess_mode="livesum",
+)
+SEARCHES_QUEUED = Gauge(
+    "brain_engine_searches_queued",
+    "Searches waiting for browser page slots",
+    multiprocess_mode="livesum",
+)
+PAGE_SLOTS_IN_USE = Gauge(
+    "brain_engine_page_slots_in_use",
+    "Browser page slots held by admitted searches",
+    multiprocess_mode="livesum",
+)
+BROWSERS_OPEN = Gauge(
+    "brain_engine_browsers_open",
+    "Pooled Chromium browsers currently open",
+    multiprocess_mode="livesum",
+)
+CHROMIUM_RSS_BYTES = Gauge(
+    "brain_engine_chromium_rss_bytes",
+    "Resident memory of the Chromium processes started by this service",
+    multiprocess_mode="livesum",
+)
+BROWSER_RECYCLES = Counter(
+    "brain_engine_browser_recycles_total",
+    "Pooled browsers retired, by reason (uses, age, memory, pressure, disconnected)",
+    ["reason"],
+)
+MEMORY_PRESSURE = Gauge(
+    "brain_engine_memory_pressure",
+    "1 while Chromium memory is over its cap and new searches are held back",
+    multiprocess_mode="livemax",
+)
+
+
+class _CallbackCollector:
+    """Exposes a value owned elsewhere as a counter or gauge."""
+
+    def __init__(self, name: str, documentation: str, kind: str, fn: Callable[[], float]):
+        self.name = name
+        self.documentation = documentation
+        self.kind = kind
+        self.fn = fn
+
+    def collect(self) -> Iterator:
+        family = CounterMetricFamily if self.kind == "counter" else GaugeMetricFamily
+        yield family(self.name, self.documentation, value=self.fn())
+
+
+def register_callback_metric(
+    name: str,
+    documentation: str,
+    fn: Callable[[], float],
+    kind: str = "gauge",
+) -> None:
+    """
+    Register a metric whose value is read from ``fn`` at scrape time.
+
+    Args:
+        name: Metric name (counters get a ``_total`` suffix on exposition)
+        documentation: Help text
+        fn: Zero-argument callable returning the current value
+        kind: "counter" or "gauge"
+    """
+    collector = _CallbackCollector(name, documentation, kind, fn)
+    REGISTRY.register(collector)
+    _callback_collectors.append(collector)
+
+
+_callback_collectors: List[_CallbackCollector] = []
+
+
+def render_metrics() -> bytes:
+    """
+    Current metrics in the Prometheus text format.
+
+    With scraper subprocesses this merges every process's metrics, so
+    scrape timings and browser gauges recorded in the shards show up too.
+    """
+    if MULTIPROCESS_DIR is None:
+        return generate_latest(REGISTRY)
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry, path=MULTIPROCESS_DIR)
+    for collector in _callback_collectors:
+        registry.register(collector)
+    return generate_latest(registry)
+
+
+def mark_process_dead(pid: int) -> None:
+    """Drop a finished subprocess's live gauges from the merged metrics."""
+    if MULTIPROCESS_DIR is not None:
+        multiprocess.mark_process_dead(pid, MULTIPROCESS_DIR)
@@ -1,8 +1,8 @@
 """Pydantic models for flight data."""
 
-from pydantic import BaseModel, Field, ConfigDict
-from typing import List, Optional
-from datetime import datetime, timezone
+from pydantic import BaseModel, Field, ConfigDict, model_validator
+from typing import Any, Dict, List, Optional
+from datetime import date, datetime, timezone
 from enum import Enum
 
 
@@ -14,6 +14,12 @@ class CabinClass(str, Enum):
     FIRST = "first"
 
 
+class FlexDate(str, Enum):
+    """Which date a date-range search varies."""
+    DEPARTURE = "departure"
+    RETURN = "return"
+
+
 class FlightSearchRequest(BaseModel):
     """Request model for flight search."""
     
@@ -54,8 +60,77 @@ class FlightSearchRequest(BaseModel):
         alias="cabinClass",
         description="Cabin class preference"
     )
+    deadline_ms: Optional[int] = Field(
+        None,
+        alias="deadlineMs",
+        ge=1000,
+        le=120000,
+        description="Latency budget in milliseconds; countries not finished "
+                    "by then are dropped (default from config)"
+    )
+    max_countries: Optional[int] = Field(
+        None,
+        alias="maxCountries",
+        ge=1,
+        description="Adaptive search: scrape only this many countries with the "
+                    "best savings history for the route, plus the US baseline "
+                    "(default from config when adaptive selection is enabled)"
+    )
+    exploration_rate: Optional[float] = Field(
+        None,
+        alias="explorationRate",
+        ge=0,
+        le=1,
+        description="Adaptive search: chance of also scraping one country "
+                    "outside the top picks (default from config)"
+    )
     
     model_config = ConfigDict(populate_by_name=True)
+    
+    @model_validator(mode="before")
+    @classmethod
+    def reject_date_range(cls, data: Any) -> Any:
+        """Date-range fields are only accepted by the date-range search."""
+        if isinstance(data, dict) and "flex_days" not in cls.model_fields:
+            if {"flexDays", "flex_days", "flexDate", "flex_date"} & data.keys():
+                raise ValueError("flexDays is only supported by /api/search/dates")
+        return data
+
+
+class DateRangeSearchRequest(FlightSearchRequest):
+    """Request model for a date-range search."""
+    
+    flex_days: Optional[int] = Field(
+        None,
+        alias="flexDays",
+        ge=1,
+        le=14,
+        description="Date-range search: number of consecutive days to search, "
+                    "starting at the flexed date"
+    )
+    flex_date: FlexDate = Field(
+        default=FlexDate.DEPARTURE,
+        alias="flexDate",
+        description="Date-range search: vary the departure or the return date"
+    )
+    
+    @model_validator(mode="after")
+    def check_date_range(self) -> "DateRangeSearchRequest":
+        """Reject date ranges that cannot be searched."""
+        if not self.flex_days:
+            return self
+        if self.flex_date == FlexDate.RETURN:
+            if not self.return_date:
+                raise ValueError("returnDate is required to flex the return date")
+            if date.fromisoformat(self.return_date) < date.fromisoformat(self.departure_date):
+                raise ValueError("returnDate must not be before departureDate")
+        elif self.return_date:
+            last = date.fromordinal(
+                date.fromisoformat(self.departure_date).toordinal() + self.flex_days - 1
+            )
+            if last > date.fromisoformat(self.return_date):
+                raise ValueError("departure date range must end on or before returnDate")
+        return self
 
 
 class FlightSegment(BaseModel):
@@ -104,6 +179,18 @@ class Flight(BaseModel):
     booking_url: Optional[str] = None
     
 
+class CountrySearchResult(BaseModel):
+    """Flights found from a single country, emitted as it completes."""
+    
+    country_code: str
+    country: str
+    is_baseline: bool = Field(
+        False,
+        description="Whether this is the US baseline used for savings"
+    )
+    flights: List[Flight]
+
+
 class FlightSearchResponse(BaseModel):
     """Response model for flight search."""
     
@@ -118,8 +205,29 @@ class FlightSearchResponse(BaseModel):
     )
     best_savings_percent: Optional[float] = None
     search_time_seconds: float
+    countries_timed_out: List[str] = Field(
+        default_factory=list,
+        description="Countries abandoned at the search deadline"
+    )
+    countries_skipped: List[str] = Field(
+        default_factory=list,
+        description="Countries not searched because they have been failing "
+                    "(circuit breaker open)"
+    )
     cached: bool = False
-    cache_expires_at: Optional[datetime] = None
+    cache_expires_at: Optional[datetime] = Field(
+        None,
+        description="When these results stop being fresh"
+    )
+    stale: bool = Field(
+        False,
+        description="Served from cache past its freshness window while a "
+                    "refresh runs; prices may have moved"
+    )
+    cache_age_seconds: Optional[float] = Field(
+        None,
+        description="Age of cached results when served"
+    )
     error: Optional[str] = None
     
     model_config = ConfigDict(
@@ -154,10 +262,220 @@ class FlightSearchResponse(BaseModel):
     )
 
 
+class DatePriceSummary(BaseModel):
+    """Best prices for one date of a date-range search."""
+    
+    date: str = Field(description="The flexed date (YYYY-MM-DD)")
+    departure_date: str
+    return_date: Optional[str] = None
+    best_price: Optional[float] = None
+    best_country: Optional[str] = Field(
+        None,
+        description="Country the cheapest flight was found from"
+    )
+    baseline_price: Optional[float] = None
+    best_savings_percent: Optional[float] = None
+    prices_by_country: Dict[str, float] = Field(
+        default_factory=dict,
+        description="Cheapest price found from each country"
+    )
+    total_results: int = 0
+    countries_timed_out: List[str] = Field(default_factory=list)
+    countries_skipped: List[str] = Field(default_factory=list)
+    cached: bool = False
+
+
+class DateRangeSearchResponse(BaseModel):
+    """Response model for a date-range search: one best-price row per date."""
+    
+    success: bool = True
+    flex_date: FlexDate
+    dates: List[DatePriceSummary]
+    cheapest_date: Optional[str] = None
+    best_price: Optional[float] = None
+    countries_searched: List[str]
+    search_time_seconds: float
+    countries_timed_out: List[str] = Field(
+        default_factory=list,
+        description="Countries abandoned at the search deadline"
+    )
+    countries_skipped: List[str] = Field(
+        default_factory=list,
+        description="Countries not searched because their circuit breaker "
+                    "was open"
+    )
+    error: Optional[str] = None
+
+
+class BatchSearchRequest(BaseModel):
+    """Request model for searching several routes at once."""
+    
+    searches: List[FlightSearchRequest] = Field(
+        ...,
+        min_length=1,
+        max_length=10,
+        description="Single-date searches, e.g. several origins to one destination"
+    )
+    deadline_ms: Optional[int] = Field(
+        None,
+        alias="deadlineMs",
+        ge=1000,
+        le=120000,
+        description="Latency budget for the whole batch in milliseconds "
+                    "(default from config)"
+    )
+    
+    model_config = ConfigDict(populate_by_name=True)
+
+
+class BatchSearchResponse(BaseModel):
+    """Response model for a batch search."""
+    
+    success: bool = True
+    results: List[FlightSearchResponse] = Field(
+        description="One response per search, in request order"
+    )
+    search_time_seconds: float
+    countries_timed_out: List[str] = Field(
+        default_factory=list,
+        description="Countries abandoned at the batch deadline"
+    )
+    countries_skipped: List[str] = Field(
+        default_factory=list,
+        description="Countries not searched because their circuit breaker "
+                    "was open"
+    )
+    error: Optional[str] = None
+
+
+class PriceHistoryPoint(BaseModel):
+    """Prices seen from one country on one scrape day."""
+    
+    country_code: str
+    country: str
+    day: str = Field(description="Scrape day (YYYY-MM-DD, UTC)")
+    min_price: float
+    median_price: float
+    observations: int
+
+
+class PriceHistoryResponse(BaseModel):
+    """Price trend for a route, per country over time."""
+    
+    origin: str
+    destination: str
+    departure_date: Optional[str] = None
+    since: datetime
+    points: List[PriceHistoryPoint]
+
+
+class SearchJobStatus(str, Enum):
+    """Lifecycle states of an asynchronous search job."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class SearchJob(BaseModel):
+    """Asynchronous search job and its (partial) results."""
+    
+    job_id: str
+    status: SearchJobStatus = SearchJobStatus.QUEUED
+    request: FlightSearchRequest
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    expires_at: Optional[datetime] = Field(
+        None,
+        description="When the job and its results will be discarded"
+    )
+    partial_results: List[CountrySearchResult] = Field(
+        default_factory=list,
+        description="Per-country results in completion order, before aggregation"
+    )
+    result: Optional[FlightSearchResponse] = None
+    error: Optional[str] = None
+
+
+class ScrapeUnit(BaseModel):
+    """One country's share of a search, queued for a scraper worker."""
+    
+    unit_id: str
+    search_id: str = Field(..., description="Search this unit belongs to")
+    reply_to: str = Field(..., description="API replica waiting for the result")
+    country_code: str
+    requests: Dict[str, FlightSearchRequest] = Field(
+        ...,
+        description="Searches to run from the country in one browser context, by label"
+    )
+    expires_at: datetime = Field(
+        ...,
+        description="Workers drop the unit unstarted after this time"
+    )
+
+
+class ScrapeOutcome(BaseModel):
+    """How one search of a unit went, for the API replica to record."""
+    
+    label: str
+    failed: bool = Field(
+        False,
+        description="Errored or timed out instead of loading results"
+    )
+    seconds: float
+
+
+class ScrapeUnitResult(BaseModel):
+    """Flights a scraper worker found for a unit."""
+    
+    unit_id: str
+    search_id: str
+    country_code: str
+    results: Dict[str, List[Dict[str, Any]]] = Field(default_factory=dict)
+    outcomes: List[ScrapeOutcome] = Field(
+        default_factory=list,
+        description="One per search that finished, in search order"
+    )
+    error: Optional[str] = None
+    worker_id: Optional[str] = None
+
+
+class WorkerStatus(BaseModel):
+    """A scraper worker's periodic report to the API replicas."""
+    
+    worker_id: str
+    memory_pressure: bool = Field(
+        False,
+        description="Chromium is over its memory cap and the worker takes no units"
+    )
+
+
+class CountryHealth(BaseModel):
+    """Circuit breaker state and recent search stats for one country."""
+    
+    state: str = Field(..., description="closed, open or half_open")
+    calls: int = Field(..., description="Searches in the rolling window")
+    failure_rate: float
+    median_seconds: Optional[float] = None
+    retry_in_seconds: Optional[float] = Field(
+        None,
+        description="Seconds until an open circuit lets a probe search through"
+    )
+
+
 class HealthResponse(BaseModel):
     """Health check response."""
     
-    status: str = "healthy"
+    status: str = Field("healthy", description="healthy, or draining while shutting down")
     service: str = "brain-engine"
     version: str = "1.0.0"
+    in_flight_searches: int = Field(0, description="Distinct scrapes currently running")
+    coalesced_searches: int = Field(
+        0,
+        description="Searches served by joining an identical in-flight scrape"
+    )
+    countries: Dict[str, CountryHealth] = Field(
+        default_factory=dict,
+        description="Per-country circuit breaker state for countries searched so far"
+    )
     timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
@@ -0,0 +1,32 @@
+"""Memory pressure reported by scraper workers outside this process."""
+
+import logging
+from typing import Callable, List
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerPressure:
+    """
+    Memory pressure reported by a queue's scraper workers.
+
+    Work queues derive from it, and those handing units to workers outside
+    this process call ``_set_pressure``. ``pressure_callbacks`` (e.g.
+    admission control) are called with True when pressure starts and False
+    when it ends, as with ``BrowserPool`` for local browsers.
+    """
+
+    def __init__(self):
+        self.pressure_callbacks: List[Callable[[bool], None]] = []
+        self.memory_pressure = False
+
+    def _set_pressure(self, pressure: bool) -> None:
+        if pressure == self.memory_pressure:
+            return
+        self.memory_pressure = pressure
+        if pressure:
+            logger.warning("Scraper workers under memory pressure, holding back new searches")
+        else:
+            logger.info("Scraper workers have memory to spare again")
+        for callback in self.pressure_callbacks:
+            callback(pressure)
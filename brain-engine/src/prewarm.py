@@ -0,0 +1,224 @@
+"""Background cache prewarming for popular searches."""
+
+import asyncio
+import logging
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from src.config import settings
+from src.metrics import PREWARM_SEARCHES
+from src.models.flight import FlightSearchRequest
+
+logger = logging.getLogger(__name__)
+
+# Returns "warmed", or "busy" when no idle page slots were available
+WarmSearch = Callable[[FlightSearchRequest], Awaitable[str]]
+# Whether a search's cached results will still be fresh next cycle
+FreshCheck = Callable[[FlightSearchRequest], Awaitable[bool]]
+
+RouteIdentity = Tuple[str, str, str, Optional[str], int, str]
+
+
+def route_identity(request: FlightSearchRequest) -> RouteIdentity:
+    """The fields that make two searches return the same results."""
+    return (
+        request.origin.upper(),
+        request.destination.upper(),
+        request.departure_date,
+        request.return_date,
+        request.passengers,
+        request.cabin_class.value,
+    )
+
+
+class RouteTracker:
+    """Counts interactive searches to find the most requested ones."""
+
+    def __init__(self, max_routes: int = 1000):
+        self.max_routes = max_routes
+        self._counts: Counter = Counter()
+        self._requests: Dict[RouteIdentity, FlightSearchRequest] = {}
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def record(self, request: FlightSearchRequest) -> None:
+        identity = route_identity(request)
+        if identity not in self._counts and len(self._counts) >= self.max_routes:
+            least = min(self._counts, key=self._counts.__getitem__)
+            del self._counts[least]
+            del self._requests[least]
+        self._counts[identity] += 1
+        self._requests[identity] = request.model_copy(update={"deadline_ms": None})
+
+    def top(self, n: int, today: Optional[date] = None) -> List[FlightSearchRequest]:
+        """
+        Most requested searches that have not departed yet.
+
+        Args:
+            n: Maximum number of searches
+            today: Reference date (default: today, UTC)
+
+        Returns:
+            Searches in descending request count
+        """
+        today = today or datetime.now(timezone.utc).date()
+        for identity in [i for i in self._counts if date.fromisoformat(i[2]) < today]:
+            del self._counts[identity]
+            del self._requests[identity]
+        return [self._requests[identity] for identity, _ in self._counts.most_common(n)]
+
+
+def configured_requests(today: Optional[date] = None) -> List[FlightSearchRequest]:
+    """
+    One-way searches for ``prewarm_routes`` at each of ``prewarm_date_offsets``.
+
+    Malformed routes (not ``ORIGIN-DESTINATION`` airport codes) are skipped
+    with a warning rather than aborting the cycle.
+    """
+    today = today or datetime.now(timezone.utc).date()
+    requests = []
+    for route in settings.prewarm_routes:
+        origin, _, destination = route.partition("-")
+        try:
+            for offset in settings.prewarm_date_offsets:
+                requests.append(FlightSearchRequest(
+                    origin=origin,
+                    destination=destination,
+                    departureDate=(today + timedelta(days=offset)).isoformat(),
+                ))
+        except ValidationError as e:
+            logger.warning(f"Skipping invalid prewarm route {route!r}: {e.errors()[0]['msg']}")
+    return requests
+
+
+class Prewarmer:
+    """
+    Periodically re-scrapes popular searches before their cache goes stale.
+
+    Runs at low priority: ``warm`` is expected to use only page slots that
+    live searches leave idle and to report "busy" otherwise, which ends the
+    cycle. At most ``concurrency`` scrapes run at once, started at least
+    ``min_gap`` seconds apart, and only during ``hours`` (UTC) if set.
+    """
+
+    def __init__(
+        self,
+        warm: WarmSearch,
+        is_fresh: FreshCheck,
+        tracker: RouteTracker,
+        interval: Optional[float] = None,
+        top_n: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        min_gap: Optional[float] = None,
+        hours: Optional[List[int]] = None,
+    ):
+        self.warm = warm
+        self.is_fresh = is_fresh
+        self.tracker = tracker
+        self.interval = interval if interval is not None else settings.prewarm_interval
+        self.top_n = top_n if top_n is not None else settings.prewarm_top_n
+        self.concurrency = max(concurrency or settings.prewarm_concurrency, 1)
+        self.min_gap = min_gap if min_gap is not None else settings.prewarm_min_gap
+        self.hours = hours if hours is not None else settings.prewarm_hours
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info(
+                f"Cache prewarming started (every {self.interval}s, top {self.top_n})"
+            )
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def in_window(self, now: Optional[datetime] = None) -> bool:
+        """Whether prewarming may run at this (UTC) hour."""
+        if not self.hours:
+            return True
+        return (now or datetime.now(timezone.utc)).hour in self.hours
+
+    def candidates(self) -> List[FlightSearchRequest]:
+        """Configured searches first, then the most requested, without duplicates."""
+        seen = set()
+        requests = []
+        for request in [*configured_requests(), *self.tracker.top(self.top_n)]:
+            identity = route_identity(request)
+            if identity not in seen:
+                seen.add(identity)
+                requests.append(request)
+        return requests
+
+    async def run_once(self) -> Dict[str, int]:
+        """
+        Run one prewarm cycle.
+
+        Returns:
+            Count of candidate searches by outcome ("warmed", "fresh",
+            "busy", "failed")
+        """
+        outcomes: Counter = Counter()
+        slots = asyncio.Semaphore(self.concurrency)
+        busy = asyncio.Event()
+        tasks = []
+        last_start = None
+
+        async def warm_one(request: FlightSearchRequest) -> None:
+            try:
+                outcome = await self.warm(request)
+            except Exception as e:
+                logger.warning(
+                    f"Prewarm of {request.origin} -> {request.destination} failed: {e}"
+                )
+                outcome = "failed"
+            finally:
+                slots.release()
+            if outcome == "busy":
+                busy.set()
+            outcomes[outcome] += 1
+            PREWARM_SEARCHES.labels(outcome=outcome).inc()
+
+        try:
+            for request in self.candidates():
+                if await self.is_fresh(request):
+                    outcomes["fresh"] += 1
+                    PREWARM_SEARCHES.labels(outcome="fresh").inc()
+                    continue
+                await slots.acquire()
+                if busy.is_set():
+                    slots.release()
+                    break
+                if last_start is not None:
+                    await asyncio.sleep(max(0.0, last_start + self.min_gap - time.monotonic()))
+                last_start = time.monotonic()
+                tasks.append(asyncio.create_task(warm_one(request)))
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        if outcomes:
+            logger.info(f"Prewarm cycle: {dict(outcomes)}")
+        return dict(outcomes)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            if not self.in_window():
+                continue
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"Prewarm cycle failed: {e}")
@@ -0,0 +1,146 @@
+"""Per-route country selection driven by past savings."""
+
+import logging
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.config import settings
+from src.history import PriceHistory, price_history
+from src.models.flight import FlightSearchRequest
+
+logger = logging.getLogger(__name__)
+
+
+class CountrySelector:
+    """
+    Picks which countries are worth scraping for a route.
+
+    Countries are ranked by how often they return results times how much
+    they have saved against the US baseline on this route within the last
+    ``window_days``; faster countries win ties. The ``top_k`` best are
+    kept. Countries with fewer than ``min_samples`` searches are always
+    kept so new routes and new countries build up history, and with
+    probability ``exploration_rate`` one other country is added so a
+    country that has started saving can climb back into the top picks.
+
+    A route's stats are reused for ``stats_ttl`` seconds, so busy routes do
+    not rescan their history on every search.
+    """
+
+    # Route stats kept before expired entries are swept
+    MAX_CACHED_ROUTES = 1000
+
+    def __init__(
+        self,
+        history: PriceHistory,
+        top_k: Optional[int] = None,
+        exploration_rate: Optional[float] = None,
+        min_samples: Optional[int] = None,
+        window_days: Optional[int] = None,
+        rng: Optional[random.Random] = None,
+        stats_ttl: Optional[float] = None,
+    ):
+        self.history = history
+        self.top_k = top_k if top_k is not None else settings.adaptive_top_k
+        self.exploration_rate = (
+            exploration_rate if exploration_rate is not None
+            else settings.adaptive_exploration_rate
+        )
+        self.min_samples = min_samples if min_samples is not None else settings.adaptive_min_samples
+        self.window_days = window_days if window_days is not None else settings.adaptive_window_days
+        self.rng = rng or random.Random()
+        self.stats_ttl = stats_ttl if stats_ttl is not None else settings.adaptive_stats_ttl
+        # (origin, destination) -> (monotonic time fetched, stats)
+        self._stats: Dict[Tuple[str, str], Tuple[float, Dict[str, Dict[str, Any]]]] = {}
+
+    async def route_stats(self, request: FlightSearchRequest) -> Dict[str, Dict[str, Any]]:
+        """Per-country stats for a route, from history at most ``stats_ttl`` old."""
+        route = (request.origin, request.destination)
+        now = time.monotonic()
+        cached = self._stats.get(route)
+        if cached is not None and now - cached[0] < self.stats_ttl:
+            return cached[1]
+
+        since = datetime.now(timezone.utc) - timedelta(days=self.window_days)
+        stats = await self.history.country_stats(
+            request.origin, request.destination, since=since
+        )
+        if len(self._stats) >= self.MAX_CACHED_ROUTES:
+            self._stats = {
+                key: entry for key, entry in self._stats.items()
+                if now - entry[0] < self.stats_ttl
+            }
+        self._stats[route] = (now, stats)
+        return stats
+
+    def clear(self) -> None:
+        """Forget cached route stats."""
+        self._stats.clear()
+
+    @staticmethod
+    def score(stats: Dict[str, float]) -> float:
+        """Expected savings percent from searching a country."""
+        return stats["success_rate"] * max(stats["mean_savings_percent"] or 0.0, 0.0)
+
+    async def select(
+        self,
+        request: FlightSearchRequest,
+        candidates: List[str],
+        explore: bool = True,
+    ) -> List[str]:
+        """
+        Choose the countries to scrape for a search.
+
+        Args:
+            request: Flight search parameters; ``max_countries`` and
+                ``exploration_rate`` override the selector's defaults
+            candidates: Countries that could be searched (excluding the
+                baseline)
+            explore: Whether an exploratory country may be added
+
+        Returns:
+            Selected countries in the order of ``candidates``
+        """
+        top_k = request.max_countries or self.top_k
+        if len(candidates) <= top_k:
+            return list(candidates)
+
+        try:
+            stats = await self.route_stats(request)
+        except Exception as e:
+            logger.warning(f"Country history unavailable, searching all countries: {e}")
+            return list(candidates)
+
+        unproven = [
+            code for code in candidates
+            if stats.get(code, {}).get("searches", 0) < self.min_samples
+        ]
+        ranked = sorted(
+            (code for code in candidates if code not in unproven),
+            key=lambda code: (
+                -self.score(stats[code]),
+                stats[code]["mean_seconds"] or float("inf"),
+            ),
+        )
+        selected = set(unproven) | set(ranked[:top_k])
+
+        rate = request.exploration_rate
+        if rate is None:
+            rate = self.exploration_rate
+        rest = ranked[top_k:]
+        if explore and rest and self.rng.random() < rate:
+            selected.add(self.rng.choice(rest))
+
+        chosen = [code for code in candidates if code in selected]
+        skipped = [code for code in candidates if code not in selected]
+        if skipped:
+            logger.info(
+                f"Searching {request.origin}->{request.destination} from {chosen}, "
+                f"skipping {skipped}"
+            )
+        return chosen
+
+
+country_selector = CountrySelector(price_history)
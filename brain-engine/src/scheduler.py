@@ -0,0 +1,244 @@
+"""Admission control for scrape workloads."""
+
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Deque, Optional
+
+from src.config import settings
+from src.metrics import ADMISSION_REJECTIONS, PAGE_SLOTS_IN_USE, SEARCHES_QUEUED
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionRejected(Exception):
+    """A search was refused because the scraper is overloaded."""
+
+    def __init__(self, status_code: int, retry_after: int, reason: str):
+        super().__init__(reason)
+        self.status_code = status_code
+        self.retry_after = retry_after
+        self.reason = reason
+
+
+class Ticket:
+    """Page slots granted to (or awaited by) one search."""
+
+    def __init__(self, slots: int):
+        self.slots = slots
+        self.future: "asyncio.Future[None]" = asyncio.get_running_loop().create_future()
+        self.requested_at = time.monotonic()
+        self.granted_at: Optional[float] = None
+        # Seconds spent queued before the slots were granted
+        self.waited = 0.0
+
+
+class PageScheduler:
+    """
+    Bounds concurrent browser pages across all searches.
+
+    Each search asks for one page slot per country it will scrape and holds
+    them until it finishes. Searches that cannot start immediately wait in a
+    bounded FIFO queue. A search is rejected up front when the queue is
+    full (429) or when the estimated queueing delay would exceed its
+    deadline (503), so overload sheds load instead of timing everyone out.
+
+    While paused (e.g. under browser memory pressure) no slots are granted;
+    searches queue as if the scraper were full and start once it resumes.
+    Once draining for shutdown, new searches are rejected (503) while those
+    already admitted or queued run to completion.
+    """
+
+    def __init__(
+        self,
+        max_pages: Optional[int] = None,
+        max_queue: Optional[int] = None,
+    ):
+        self.max_pages = max_pages or settings.max_concurrent_pages or (
+            settings.browser_pool_size * settings.browser_max_contexts
+            * max(settings.scraper_processes, 1)
+        )
+        self.max_queue = max_queue if max_queue is not None else settings.max_queued_searches
+        self.in_use = 0
+        self.paused = False
+        self.draining = False
+        self._queue: Deque[Ticket] = deque()
+        # Smoothed time a search holds its slots, learned from completions
+        self._avg_hold: Optional[float] = None
+
+    @property
+    def queued(self) -> int:
+        return len(self._queue)
+
+    @property
+    def idle(self) -> bool:
+        """Whether no search holds or waits for page slots."""
+        return self.in_use == 0 and not self._queue
+
+    def estimate_wait(self, slots: int) -> float:
+        """
+        Estimate queueing delay for a new search in seconds.
+
+        Args:
+            slots: Page slots the search needs
+
+        Returns:
+            Estimated wait, 0 when it could start now or nothing is known yet
+        """
+        needed = sum(t.slots for t in self._queue) + slots
+        free = 0 if self.paused else self.max_pages - self.in_use
+        if needed <= free or self._avg_hold is None:
+            return 0.0
+        rounds = math.ceil((needed - free) / self.max_pages)
+        return rounds * self._avg_hold
+
+    def _reject(self, status_code: int, retry_after: float, reason: str) -> AdmissionRejected:
+        ADMISSION_REJECTIONS.labels(reason=reason).inc()
+        logger.warning(
+            f"Rejecting search ({reason}): {self.in_use}/{self.max_pages} pages busy, "
+            f"{self.queued} queued"
+        )
+        return AdmissionRejected(status_code, max(1, math.ceil(retry_after)), reason)
+
+    async def acquire(self, slots: int, timeout: float) -> Ticket:
+        """
+        Wait for page slots or fail fast.
+
+        Args:
+            slots: Page slots the search needs (capped at ``max_pages``)
+            timeout: Longest the caller is willing to queue, in seconds
+
+        Returns:
+            Granted ticket; pass it to ``release`` when done
+
+        Raises:
+            AdmissionRejected: If the queue is full or the wait is too long
+        """
+        slots = max(1, min(slots, self.max_pages))
+        if self.draining:
+            raise self._reject(503, 1, "draining")
+        ticket = Ticket(slots)
+
+        if not self.paused and not self._queue and self.in_use + slots <= self.max_pages:
+            self._grant(ticket)
+            return ticket
+
+        retry_after = self._avg_hold or 1
+        if len(self._queue) >= self.max_queue:
+            raise self._reject(429, retry_after, "queue_full")
+        expected_wait = self.estimate_wait(slots)
+        if expected_wait > timeout:
+            raise self._reject(503, expected_wait, "deadline")
+
+        self._queue.append(ticket)
+        SEARCHES_QUEUED.set(len(self._queue))
+        try:
+            await asyncio.wait_for(asyncio.shield(ticket.future), timeout)
+        except asyncio.TimeoutError:
+            self._abandon(ticket)
+            raise self._reject(503, retry_after, "queue_timeout")
+        except asyncio.CancelledError:
+            self._abandon(ticket)
+            raise
+        return ticket
+
+    def try_acquire(self, slots: int, reserve: int = 0) -> Optional[Ticket]:
+        """
+        Take page slots only if they are idle right now; never queue.
+
+        For background work that must not delay interactive searches.
+
+        Args:
+            slots: Page slots the work needs (capped at ``max_pages``)
+            reserve: Slots that must stay free for interactive searches
+
+        Returns:
+            Granted ticket, or None if searches are queued, the scheduler is
+            paused or draining, or not enough slots are free
+        """
+        slots = max(1, min(slots, self.max_pages))
+        if self.paused or self.draining or self._queue or self.in_use + slots > self.max_pages - reserve:
+            return None
+        ticket = Ticket(slots)
+        self._grant(ticket)
+        return ticket
+
+    def set_paused(self, paused: bool) -> None:
+        """Stop or resume granting slots; resuming admits waiting searches."""
+        self.paused = paused
+        if not paused:
+            self._wake()
+
+    def set_draining(self, draining: bool) -> None:
+        """Stop or resume admitting new searches."""
+        self.draining = draining
+
+    async def wait_idle(self, timeout: float, poll_interval: float = 0.1) -> bool:
+        """
+        Wait for admitted and queued searches to finish.
+
+        Args:
+            timeout: Longest to wait, in seconds
+
+        Returns:
+            True if the scheduler went idle, False if searches were still
+            running when the timeout passed
+        """
+        deadline = time.monotonic() + timeout
+        while not self.idle:
+            if time.monotonic() >= deadline:
+                return False
+            await asyncio.sleep(poll_interval)
+        return True
+
+    def release(self, ticket: Ticket) -> None:
+        """Return a ticket's slots and admit waiting searches."""
+        if ticket.granted_at is None:
+            return
+        held = time.monotonic() - ticket.granted_at
+        self._avg_hold = held if self._avg_hold is None else 0.8 * self._avg_hold + 0.2 * held
+        self._return_slots(ticket)
+
+    @asynccontextmanager
+    async def admit(self, slots: int, timeout: float):
+        """Hold page slots for the duration of the block."""
+        ticket = await self.acquire(slots, timeout)
+        try:
+            yield ticket
+        finally:
+            self.release(ticket)
+
+    def _grant(self, ticket: Ticket) -> None:
+        self.in_use += ticket.slots
+        ticket.granted_at = time.monotonic()
+        ticket.waited = ticket.granted_at - ticket.requested_at
+        PAGE_SLOTS_IN_USE.set(self.in_use)
+        if not ticket.future.done():
+            ticket.future.set_result(None)
+
+    def _return_slots(self, ticket: Ticket) -> None:
+        ticket.granted_at = None
+        self.in_use -= ticket.slots
+        PAGE_SLOTS_IN_USE.set(self.in_use)
+        self._wake()
+
+    def _wake(self) -> None:
+        # Strict FIFO: a large search at the head is not overtaken
+        while not self.paused and self._queue and self.in_use + self._queue[0].slots <= self.max_pages:
+            self._grant(self._queue.popleft())
+        SEARCHES_QUEUED.set(len(self._queue))
+
+    def _abandon(self, ticket: Ticket) -> None:
+        if ticket in self._queue:
+            self._queue.remove(ticket)
+            SEARCHES_QUEUED.set(len(self._queue))
+            self._wake()
+        elif ticket.granted_at is not None:
+            # Granted just as the waiter gave up; don't skew the hold average
+            self._return_slots(ticket)
+
+
+search_scheduler = PageScheduler()
@@ -1,75 +1,543 @@
 """Playwright browser management utilities."""
 
-from playwright.async_api import async_playwright, Browser, BrowserContext, Page
-from typing import Optional, Dict, Any
+import asyncio
+import logging
+import os
+import time
+from playwright.async_api import (
+    async_playwright, Browser, BrowserContext, Page, Playwright, Route
+)
+from typing import Optional, Dict, Any, List, Callable, Set, Tuple
 from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from urllib.parse import urlsplit
 
 from src.config import settings
+from src.metrics import (
+    BROWSER_RECYCLES,
+    BROWSERS_OPEN,
+    CHROMIUM_RSS_BYTES,
+    CONTEXT_ACQUIRE_SECONDS,
+    MEMORY_PRESSURE,
+)
+from src.scraper.consent import consent_states
 from src.scraper.proxy import get_proxy_config, get_country_info
 
+logger = logging.getLogger(__name__)
 
-@asynccontextmanager
-async def create_browser_context(
-    country_code: str,
-    headless: Optional[bool] = None
-):
+
+BROWSER_ARGS = [
+    '--disable-blink-features=AutomationControlled',
+    '--disable-dev-shm-usage',
+    '--no-sandbox',
+]
+
+# Stealth scripts to avoid detection
+STEALTH_SCRIPT = """
+    // Override navigator.webdriver
+    Object.defineProperty(navigator, 'webdriver', {
+        get: () => undefined,
+    });
+
+    // Override plugins
+    Object.defineProperty(navigator, 'plugins', {
+        get: () => [1, 2, 3, 4, 5],
+    });
+
+    // Override languages
+    Object.defineProperty(navigator, 'languages', {
+        get: () => ['en-US', 'en'],
+    });
+"""
+
+
+# Process names Chromium runs under (full and headless-shell builds)
+CHROMIUM_PROCESS_NAMES = ("chrome", "headless_shell", "chromium")
+
+
+def read_rss_bytes(pid: int) -> int:
+    """Resident memory of a process from /proc, 0 if it is gone or unknown."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    return 0
+
+
+def read_process_table() -> Dict[int, Tuple[int, str]]:
+    """Parent PID and name of every process visible in /proc, by PID."""
+    processes = {}
+    if not os.path.isdir("/proc"):
+        return processes
+    for pid in os.listdir("/proc"):
+        if not pid.isdigit():
+            continue
+        try:
+            with open(f"/proc/{pid}/stat") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # "pid (name) state ppid ...", where the name may contain spaces
+        name = stat[stat.find("(") + 1:stat.rfind(")")]
+        fields = stat[stat.rfind(")") + 2:].split()
+        try:
+            processes[int(pid)] = (int(fields[1]), name)
+        except (IndexError, ValueError):
+            continue
+    return processes
+
+
+def chromium_rss_bytes(root_pid: Optional[int] = None) -> int:
     """
-    Create a browser context configured for a specific country.
-    
+    Resident memory of the Chromium processes this process started.
+
+    Only descendants of ``root_pid`` (default: this process) count, so
+    scraper subprocesses sharing a container each measure their own
+    browsers.
+    """
+    root_pid = root_pid or os.getpid()
+    children: Dict[int, List[int]] = {}
+    processes = read_process_table()
+    for pid, (ppid, _) in processes.items():
+        children.setdefault(ppid, []).append(pid)
+    total = 0
+    stack = list(children.get(root_pid, []))
+    while stack:
+        pid = stack.pop()
+        stack.extend(children.get(pid, []))
+        if processes[pid][1].startswith(CHROMIUM_PROCESS_NAMES):
+            total += read_rss_bytes(pid)
+    return total
+
+
+async def browser_rss_bytes(browser: Browser) -> Optional[int]:
+    """
+    Resident memory of one browser and its renderer/GPU processes.
+
+    Process IDs come from the DevTools protocol; memory from /proc.
+
+    Returns:
+        Bytes, or None if it could not be measured
+    """
+    try:
+        session = await browser.new_browser_cdp_session()
+        try:
+            info = await session.send("SystemInfo.getProcessInfo")
+        finally:
+            await session.detach()
+    except Exception as e:
+        logger.debug(f"Could not list browser processes: {e}")
+        return None
+    pids = [process["id"] for process in info.get("processInfo", [])]
+    return await asyncio.to_thread(lambda: sum(read_rss_bytes(pid) for pid in pids))
+
+
+@dataclass
+class PooledBrowser:
+    """A pooled Chromium instance and its usage counters."""
+
+    browser: Browser
+    active_contexts: int = 0
+    total_uses: int = 0
+    retiring: bool = False
+    retire_reason: Optional[str] = None
+    launched_at: float = field(default_factory=time.monotonic)
+    rss_bytes: Optional[int] = None
+
+
+class BrowserPool:
+    """
+    Long-lived pool of Chromium browsers.
+
+    Browsers are launched on demand up to ``size`` and shared between
+    searches. Each checkout gets a fresh, country-configured context so
+    proxy sessions and cookies never leak between searches. A browser is
+    recycled once it has served ``max_uses`` contexts, is older than
+    ``max_age`` seconds or uses more than ``max_rss_mb``; it takes no new
+    contexts and is closed once its open ones finish.
+
+    Every ``memory_check_interval`` seconds the pool measures browser
+    memory. While the Chromium processes started by this process together
+    use more than ``max_total_rss_mb``, the largest browser is recycled and
+    the pool reports memory pressure to ``pressure_callbacks`` (e.g.
+    admission control) so no new work starts until memory comes back down.
+    """
+
+    def __init__(
+        self,
+        size: Optional[int] = None,
+        max_contexts_per_browser: Optional[int] = None,
+        max_uses: Optional[int] = None,
+        headless: Optional[bool] = None,
+        max_age: Optional[float] = None,
+        max_rss_mb: Optional[int] = None,
+        max_total_rss_mb: Optional[int] = None,
+        memory_check_interval: Optional[float] = None,
+    ):
+        self.size = size or settings.browser_pool_size
+        self.max_contexts_per_browser = (
+            max_contexts_per_browser or settings.browser_max_contexts
+        )
+        self.max_uses = max_uses or settings.browser_max_uses
+        self.headless = headless if headless is not None else settings.headless
+        self.max_age = max_age if max_age is not None else settings.browser_max_age
+        self.max_rss_mb = max_rss_mb if max_rss_mb is not None else settings.browser_max_rss_mb
+        self.max_total_rss_mb = (
+            max_total_rss_mb if max_total_rss_mb is not None
+            else settings.browser_total_rss_mb
+        )
+        self.memory_check_interval = (
+            memory_check_interval if memory_check_interval is not None
+            else settings.browser_memory_check_interval
+        )
+        # Called with True when memory pressure starts and False when it ends
+        self.pressure_callbacks: List[Callable[[bool], None]] = []
+        self.memory_pressure = False
+
+        self._playwright: Optional[Playwright] = None
+        self._browsers: List[PooledBrowser] = []
+        self._launching = 0
+        self._condition: Optional[asyncio.Condition] = None
+        self._start_lock: Optional[asyncio.Lock] = None
+        self._monitor: Optional[asyncio.Task] = None
+        self._memory_ok: Optional[asyncio.Event] = None
+        # Closes of recycled browsers running in the background
+        self._closing: Set[asyncio.Task] = set()
+
+    @property
+    def started(self) -> bool:
+        """Whether the Playwright driver is running."""
+        return self._playwright is not None
+
+    async def start(self) -> None:
+        """Start the Playwright driver. Browsers are launched lazily."""
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+        async with self._start_lock:
+            if self._playwright is not None:
+                return
+            self._condition = asyncio.Condition()
+            self._memory_ok = asyncio.Event()
+            self._memory_ok.set()
+            self._playwright = await async_playwright().start()
+            if self.memory_check_interval > 0:
+                self._monitor = asyncio.create_task(self._monitor_memory())
+            logger.info(
+                f"Browser pool started (size={self.size}, "
+                f"max_contexts={self.max_contexts_per_browser}, "
+                f"max_uses={self.max_uses})"
+            )
+
+    async def stop(self) -> None:
+        """Close every pooled browser and stop the Playwright driver."""
+        if self._monitor is not None:
+            self._monitor.cancel()
+            await asyncio.gather(self._monitor, return_exceptions=True)
+            self._monitor = None
+        self._set_pressure(False)
+        await asyncio.gather(*self._closing, return_exceptions=True)
+        browsers, self._browsers = self._browsers, []
+        for entry in browsers:
+            await self._close_browser(entry)
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+        self._condition = None
+        self._start_lock = None
+        logger.info("Browser pool stopped")
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of pool usage for health reporting."""
+        return {
+            "browsers": len(self._browsers),
+            "active_contexts": sum(b.active_contexts for b in self._browsers),
+            "capacity": self.size * self.max_contexts_per_browser,
+        }
+
+    @asynccontextmanager
+    async def context(self, country_code: str):
+        """
+        Check out a fresh browser context configured for a country.
+
+        Args:
+            country_code: Two-letter country code for proxy routing
+
+        Yields:
+            Tuple of (browser, context, page)
+        """
+        started = time.perf_counter()
+        entry = await self._checkout()
+        context = None
+        try:
+            context = await new_country_context(entry.browser, country_code)
+            page = await context.new_page()
+            page.set_default_timeout(settings.browser_timeout)
+            CONTEXT_ACQUIRE_SECONDS.labels(country=country_code).observe(
+                time.perf_counter() - started
+            )
+            yield entry.browser, context, page
+        finally:
+            if context is not None:
+                try:
+                    await context.close()
+                except Exception as e:
+                    logger.debug(f"Error closing context for {country_code}: {e}")
+            await self._checkin(entry)
+
+    def _pick_browser(self) -> Optional[PooledBrowser]:
+        """Return the least loaded browser with a free context slot."""
+        candidates = []
+        for entry in self._browsers:
+            if not entry.browser.is_connected() and not entry.retiring:
+                self._retire(entry, "disconnected")
+            if entry.retiring or entry.active_contexts >= self.max_contexts_per_browser:
+                continue
+            candidates.append(entry)
+        if not candidates:
+            return None
+        return min(candidates, key=lambda b: b.active_contexts)
+
+    def _claim(self, entry: PooledBrowser) -> PooledBrowser:
+        entry.active_contexts += 1
+        entry.total_uses += 1
+        if entry.total_uses >= self.max_uses and not entry.retiring:
+            self._retire(entry, "uses")
+        return entry
+
+    def _retire(self, entry: PooledBrowser, reason: str) -> None:
+        """Stop giving a browser new contexts; it closes when its last one does."""
+        entry.retiring = True
+        entry.retire_reason = reason
+        BROWSER_RECYCLES.labels(reason=reason).inc()
+
+    async def _checkout(self) -> PooledBrowser:
+        await self.start()
+        async with self._condition:
+            while True:
+                # Don't hold up the checkout closing them, but close them:
+                # dropped from the list, nothing else would
+                for idle in self._pop_idle_retired():
+                    self._close_in_background(idle)
+                entry = self._pick_browser()
+                if entry is not None:
+                    return self._claim(entry)
+                live = sum(1 for b in self._browsers if not b.retiring)
+                if live + self._launching < self.size:
+                    self._launching += 1
+                    break
+                await self._condition.wait()
+
+        # Launch outside the lock so checkins are not blocked meanwhile
+        try:
+            browser = await self._playwright.chromium.launch(
+                headless=self.headless,
+                args=BROWSER_ARGS,
+            )
+        except BaseException:
+            async with self._condition:
+                self._launching -= 1
+                self._condition.notify_all()
+            raise
+
+        async with self._condition:
+            self._launching -= 1
+            entry = PooledBrowser(browser=browser)
+            self._browsers.append(entry)
+            BROWSERS_OPEN.inc()
+            self._condition.notify_all()
+            logger.debug(f"Launched pooled browser ({len(self._browsers)}/{self.size})")
+            return self._claim(entry)
+
+    async def _checkin(self, entry: PooledBrowser) -> None:
+        async with self._condition:
+            entry.active_contexts -= 1
+            recycle = entry.retiring and entry.active_contexts == 0
+            if recycle and entry in self._browsers:
+                self._browsers.remove(entry)
+            self._condition.notify_all()
+        if recycle:
+            logger.debug(f"Recycling browser ({entry.retire_reason}) after {entry.total_uses} uses")
+            await self._close_browser(entry)
+
+    async def wait_for_memory(self) -> None:
+        """Return once the pool is not under memory pressure."""
+        if self._memory_ok is not None:
+            await self._memory_ok.wait()
+
+    def _set_pressure(self, pressure: bool) -> None:
+        if pressure == self.memory_pressure:
+            return
+        self.memory_pressure = pressure
+        MEMORY_PRESSURE.set(1 if pressure else 0)
+        if self._memory_ok is not None:
+            if pressure:
+                self._memory_ok.clear()
+            else:
+                self._memory_ok.set()
+        if pressure:
+            logger.warning(
+                f"Chromium memory over {self.max_total_rss_mb} MB, holding back new searches"
+            )
+        else:
+            logger.info("Chromium memory back under its cap")
+        for callback in self.pressure_callbacks:
+            callback(pressure)
+
+    async def check_memory(self) -> None:
+        """Retire browsers over their age or memory limit and update pressure."""
+        now = time.monotonic()
+        for entry in list(self._browsers):
+            if entry.retiring:
+                continue
+            if self.max_age and now - entry.launched_at > self.max_age:
+                self._retire(entry, "age")
+                continue
+            entry.rss_bytes = await browser_rss_bytes(entry.browser)
+            if self.max_rss_mb and (entry.rss_bytes or 0) > self.max_rss_mb * 1024 * 1024:
+                logger.warning(
+                    f"Recycling browser using {entry.rss_bytes // (1024 * 1024)} MB"
+                )
+                self._retire(entry, "memory")
+
+        total = await asyncio.to_thread(chromium_rss_bytes)
+        CHROMIUM_RSS_BYTES.set(total)
+        pressure = bool(self.max_total_rss_mb) and total > self.max_total_rss_mb * 1024 * 1024
+        if pressure:
+            # Get memory back by recycling the largest browser still in service
+            live = [b for b in self._browsers if not b.retiring]
+            if live:
+                self._retire(max(live, key=lambda b: b.rss_bytes or 0), "pressure")
+        self._set_pressure(pressure)
+        await self._close_idle_retired()
+
+    def _pop_idle_retired(self) -> List[PooledBrowser]:
+        """Remove retired browsers with no open contexts; the caller closes them."""
+        idle = [b for b in self._browsers if b.retiring and b.active_contexts == 0]
+        if idle:
+            self._browsers = [b for b in self._browsers if b not in idle]
+        return idle
+
+    def _close_in_background(self, entry: PooledBrowser) -> None:
+        logger.debug(f"Recycling idle browser ({entry.retire_reason})")
+        task = asyncio.create_task(self._close_browser(entry))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    async def _close_idle_retired(self) -> None:
+        async with self._condition:
+            idle = self._pop_idle_retired()
+            self._condition.notify_all()
+        for entry in idle:
+            logger.debug(f"Recycling idle browser ({entry.retire_reason})")
+            await self._close_browser(entry)
+
+    async def _monitor_memory(self) -> None:
+        while True:
+            await asyncio.sleep(self.memory_check_interval)
+            try:
+                await self.check_memory()
+            except Exception as e:
+                logger.warning(f"Browser memory check failed: {e}")
+
+    async def _close_browser(self, entry: PooledBrowser) -> None:
+        BROWSERS_OPEN.dec()
+        try:
+            await entry.browser.close()
+        except Exception as e:
+            logger.debug(f"Error closing browser: {e}")
+
+
+# Shared pool, started and stopped by the FastAPI lifespan
+browser_pool = BrowserPool()
+
+
+async def new_country_context(browser: Browser, country_code: str) -> BrowserContext:
+    """
+    Create a proxy- and locale-configured context on an existing browser.
+
     Args:
+        browser: Browser to open the context on
         country_code: Two-letter country code for proxy routing
-        headless: Override headless setting (default from config)
-        
-    Yields:
-        Tuple of (browser, context, page)
+
+    Returns:
+        Configured browser context
     """
     proxy_config = get_proxy_config(country_code)
     country_info = get_country_info(country_code)
+
+    context = await browser.new_context(
+        proxy=proxy_config,
+        viewport={"width": 1920, "height": 1080},
+        locale=country_info.get("locale", "en-US"),
+        timezone_id=get_timezone_for_country(country_code),
+        user_agent=get_user_agent(),
+        # Cookies from an earlier accepted consent wall, if any
+        storage_state=await consent_states.get(country_code),
+    )
+    await context.add_init_script(STEALTH_SCRIPT)
+    await apply_resource_blocking(context)
+    return context
+
+
+def should_block_request(resource_type: str, url: str) -> bool:
+    """
+    Decide whether a request is unnecessary for scraping results.
     
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(
-            headless=headless if headless is not None else settings.headless,
-            args=[
-                '--disable-blink-features=AutomationControlled',
-                '--disable-dev-shm-usage',
-                '--no-sandbox',
-            ]
-        )
-        
-        context = await browser.new_context(
-            proxy=proxy_config,
-            viewport={"width": 1920, "height": 1080},
-            locale=country_info.get("locale", "en-US"),
-            timezone_id=get_timezone_for_country(country_code),
-            user_agent=get_user_agent(),
-        )
-        
-        # Add stealth scripts to avoid detection
-        await context.add_init_script("""
-            // Override navigator.webdriver
-            Object.defineProperty(navigator, 'webdriver', {
-                get: () => undefined,
-            });
-            
-            // Override plugins
-            Object.defineProperty(navigator, 'plugins', {
-                get: () => [1, 2, 3, 4, 5],
-            });
-            
-            // Override languages
-            Object.defineProperty(navigator, 'languages', {
-                get: () => ['en-US', 'en'],
-            });
-        """)
-        
-        page = await context.new_page()
-        page.set_default_timeout(settings.browser_timeout)
+    Args:
+        resource_type: Playwright resource type (e.g. "image", "script")
+        url: Request URL
         
-        try:
-            yield browser, context, page
-        finally:
-            await context.close()
-            await browser.close()
+    Returns:
+        True if the request should be aborted
+    """
+    if resource_type in settings.blocked_resource_types:
+        return True
+    host = urlsplit(url).hostname or ""
+    return any(
+        host == blocked or host.endswith(f".{blocked}")
+        for blocked in settings.blocked_hosts
+    )
+
+
+async def _route_request(route: Route) -> None:
+    request = route.request
+    if should_block_request(request.resource_type, request.url):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def apply_resource_blocking(context: BrowserContext) -> None:
+    """
+    Abort images, fonts, media and tracking requests on a context.
+    
+    Cuts proxy bytes and page load time. No route is installed when
+    nothing is configured to be blocked, since routing adds a driver
+    round-trip per request.
+    """
+    if settings.blocked_resource_types or settings.blocked_hosts:
+        await context.route("**/*", _route_request)
+
+
+@asynccontextmanager
+async def create_browser_context(country_code: str):
+    """
+    Create a browser context configured for a specific country.
+
+    The context is opened on a browser from the shared pool rather than
+    a freshly launched Chromium process.
+
+    Args:
+        country_code: Two-letter country code for proxy routing
+
+    Yields:
+        Tuple of (browser, context, page)
+    """
+    async with browser_pool.context(country_code) as handles:
+        yield handles
 
 
 def get_timezone_for_country(country_code: str) -> str:
@@ -0,0 +1,126 @@
+"""Per-country browser storage state captured after accepting cookie consent."""
+
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+StorageState = Dict[str, Any]
+
+
+class ConsentStateStore:
+    """
+    Cookies and localStorage saved once a country's consent wall is accepted.
+
+    New contexts for the country are created from the saved state, so the
+    wall does not appear again. States are kept in memory and, when
+    ``directory`` is set, written to ``<directory>/<country>.json`` so they
+    survive restarts. A state older than ``ttl`` seconds is discarded.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        ttl: Optional[int] = None,
+        enabled: Optional[bool] = None,
+    ):
+        self.directory = directory if directory is not None else settings.consent_state_dir
+        self.ttl = ttl if ttl is not None else settings.consent_state_ttl
+        self.enabled = enabled if enabled is not None else settings.consent_state_enabled
+        # country -> (epoch seconds when saved, state)
+        self._states: Dict[str, Tuple[float, StorageState]] = {}
+        self._loaded = set()
+
+    def _path(self, country_code: str) -> str:
+        return os.path.join(self.directory, f"{country_code}.json")
+
+    def _read(self, country_code: str) -> Optional[Tuple[float, StorageState]]:
+        try:
+            with open(self._path(country_code)) as f:
+                data = json.load(f)
+            return data["saved_at"], data["state"]
+        except FileNotFoundError:
+            return None
+
+    def _write(self, country_code: str, saved_at: float, state: StorageState) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        # Unique per write: shard processes may save the same country at once
+        with tempfile.NamedTemporaryFile(
+            "w", dir=self.directory, suffix=".tmp", delete=False
+        ) as f:
+            json.dump({"saved_at": saved_at, "state": state}, f)
+        try:
+            os.replace(f.name, self._path(country_code))
+        except OSError:
+            os.remove(f.name)
+            raise
+
+    def _remove(self, country_code: str) -> None:
+        try:
+            os.remove(self._path(country_code))
+        except FileNotFoundError:
+            pass
+
+    def cached(self, country_code: str) -> Optional[StorageState]:
+        """Saved state already in memory, without touching disk."""
+        entry = self._states.get(country_code)
+        if entry is None or time.time() - entry[0] > self.ttl:
+            return None
+        return entry[1]
+
+    async def get(self, country_code: str) -> Optional[StorageState]:
+        """
+        Saved state to create a country's contexts from.
+
+        Args:
+            country_code: Two-letter country code
+
+        Returns:
+            Playwright storage state, or None if none is saved or it expired
+        """
+        if not self.enabled:
+            return None
+        if self.directory and country_code not in self._loaded:
+            self._loaded.add(country_code)
+            try:
+                entry = await asyncio.to_thread(self._read, country_code)
+            except Exception as e:
+                logger.warning(f"Failed to load consent state for {country_code}: {e}")
+                entry = None
+            if entry is not None:
+                self._states.setdefault(country_code, entry)
+        return self.cached(country_code)
+
+    async def save(self, country_code: str, state: StorageState) -> None:
+        """Remember a country's state after its consent wall was accepted."""
+        if not self.enabled:
+            return
+        saved_at = time.time()
+        self._states[country_code] = (saved_at, state)
+        self._loaded.add(country_code)
+        if self.directory:
+            try:
+                await asyncio.to_thread(self._write, country_code, saved_at, state)
+            except Exception as e:
+                logger.warning(f"Failed to persist consent state for {country_code}: {e}")
+        logger.info(f"Saved consent state for {country_code}")
+
+    async def invalidate(self, country_code: str) -> None:
+        """Forget a country's state, e.g. because the consent wall came back."""
+        self._states.pop(country_code, None)
+        if self.directory:
+            try:
+                await asyncio.to_thread(self._remove, country_code)
+            except Exception as e:
+                logger.warning(f"Failed to delete consent state for {country_code}: {e}")
+        logger.info(f"Invalidated consent state for {country_code}")
+
+
+consent_states = ConsentStateStore()
@@ -1,16 +1,42 @@
 """Flight scraping logic for Google Flights."""
 
 import asyncio
+import contextvars
 import hashlib
-from typing import List, Dict, Any, Optional
-from datetime import datetime
+import logging
+import time
+import uuid
+from typing import List, Dict, Any, Optional, AsyncIterator, Awaitable, Callable, Iterable, Tuple
+from datetime import date, datetime, timedelta
+from urllib.parse import urlsplit
 
 from playwright.async_api import Page, TimeoutError as PlaywrightTimeout
 
+from src.cache.baseline import BASELINE_COUNTRY, baseline_cache
+from src.circuit import SEARCH_OUTCOMES, SearchOutcomes, circuit_breakers
 from src.config import settings, COUNTRY_CONFIG
+from src.history import price_history
+from src.metrics import (
+    CONSENT_SECONDS,
+    COUNTRY_ERRORS,
+    COUNTRY_SEARCH_SECONDS,
+    COUNTRY_TIMEOUTS,
+    EXTRACT_SECONDS,
+    EXTRACTION_FAILURES,
+    PAGE_GOTO_SECONDS,
+    ZERO_RESULT_COUNTRIES,
+)
 from src.scraper.browser import create_browser_context
+from src.scraper.consent import consent_states
+from src.scraper.payload import is_results_response_url, parse_results_payload
+from src.routing import country_selector
 from src.scraper.proxy import get_country_info
-from src.models.flight import Flight, FlightSearchRequest, CabinClass
+from src.workqueue import SCRAPE_OUTCOMES, SEARCH_ID, scrape_client, scrapes_remotely
+from src.models.flight import (
+    Flight, FlightSearchRequest, CabinClass, DateRangeSearchRequest, FlexDate, ScrapeOutcome
+)
+
+logger = logging.getLogger(__name__)
 
 
 def build_google_flights_url(request: FlightSearchRequest) -> str:
@@ -23,7 +49,7 @@ def build_google_flights_url(request: FlightSearchRequest) -> str:
     Returns:
         Google Flights URL string
     """
-    base_url = "https://www.google.com/travel/flights"
+    base_url = settings.google_flights_url
     
     # Build the search parameters
     origin = request.origin.upper()
@@ -39,6 +65,64 @@ def build_google_flights_url(request: FlightSearchRequest) -> str:
     return url
 
 
+# Note: Google Flights selectors change frequently
+# These are common patterns but may need adjustment
+RESULT_SELECTORS = [
+    '[class*="pIav2d"]',  # Main result container
+    '[class*="yR1fYc"]',  # Alternative selector
+    'li[data-ved]',       # List item fallback
+]
+
+FIELD_SELECTORS = {
+    "price": '[class*="price"], [class*="YMlIz"]',
+    "airline": '[class*="airline"], [class*="sSHqwe"], [class*="Ir0Voe"]',
+    "times": '[class*="mv1WYe"], [class*="zxVSec"]',
+    "duration": '[class*="Ak5kof"], [class*="gvkrdb"]',
+    "stops": '[class*="EfT7Ae"], [class*="BbR8Ec"]',
+}
+
+# Runs in the page and returns the raw text of every result row at once
+EXTRACT_ROWS_SCRIPT = """
+({ resultSelectors, fields, maxResults }) => {
+    let rows = [];
+    for (const selector of resultSelectors) {
+        rows = Array.from(document.querySelectorAll(selector));
+        if (rows.length) break;
+    }
+    const text = (root, selector) => {
+        const el = root.querySelector(selector);
+        return el ? el.innerText : null;
+    };
+    return rows.slice(0, maxResults).map((row) => {
+        const times = row.querySelectorAll(fields.times);
+        return {
+            price: text(row, fields.price),
+            airline: text(row, fields.airline),
+            departure_time: times.length >= 2 ? times[0].innerText : "",
+            arrival_time: times.length >= 2 ? times[1].innerText : "",
+            duration: text(row, fields.duration),
+            stops: text(row, fields.stops),
+        };
+    });
+}
+"""
+
+
+def get_navigation_wait_until() -> str:
+    """Load state ``page.goto`` waits for under the readiness strategy."""
+    if settings.page_readiness == "networkidle":
+        return "networkidle"
+    return "domcontentloaded"
+
+
+def get_ready_selector() -> str:
+    """Selector that signals results are ready to extract."""
+    if settings.page_readiness == "networkidle":
+        return 'div[data-ved]'
+    # Navigation returned early, so wait for actual result rows
+    return ", ".join(RESULT_SELECTORS)
+
+
 async def extract_flights_from_page(
     page: Page,
     country_code: str,
@@ -47,6 +131,10 @@ async def extract_flights_from_page(
     """
     Extract flight data from Google Flights results page.
     
+    Uses one element handle round-trip per field when
+    ``settings.extraction_mode`` is "element", otherwise a single in-page
+    ``evaluate`` call (this is also the fallback for "network" mode).
+    
     Args:
         page: Playwright page object
         country_code: Country the search was performed from
@@ -61,39 +149,93 @@ async def extract_flights_from_page(
     try:
         # Wait for results to load
         await page.wait_for_selector(
-            'div[data-ved]',
+            get_ready_selector(),
             timeout=15000
         )
         
-        # Get all flight result containers
-        # Note: Google Flights selectors change frequently
-        # These are common patterns but may need adjustment
-        result_selectors = [
-            '[class*="pIav2d"]',  # Main result container
-            '[class*="yR1fYc"]',  # Alternative selector
-            'li[data-ved]',       # List item fallback
-        ]
-        
-        results = []
-        for selector in result_selectors:
-            results = await page.query_selector_all(selector)
-            if results:
-                break
-        
-        for i, result in enumerate(results[:max_results]):
-            try:
-                flight_data = await extract_single_flight(result, country_info["name"], i)
-                if flight_data:
-                    flights.append(flight_data)
-            except Exception as e:
-                print(f"Error extracting flight {i} from {country_info['name']}: {e}")
-                continue
+        if settings.extraction_mode == "element":
+            flights = await extract_flights_by_element(
+                page, country_info["name"], max_results
+            )
+        else:
+            flights = await extract_flights_by_evaluate(
+                page, country_info["name"], max_results
+            )
                 
     except PlaywrightTimeout:
-        print(f"Timeout waiting for results from {country_info['name']}")
+        COUNTRY_TIMEOUTS.labels(country=country_code, stage="results").inc()
+        logger.warning(f"Timeout waiting for results from {country_info['name']}")
     except Exception as e:
-        print(f"Error extracting flights from {country_info['name']}: {e}")
+        EXTRACTION_FAILURES.labels(country=country_code).inc()
+        logger.error(f"Error extracting flights from {country_info['name']}: {e}")
+    
+    return flights
+
+
+async def extract_flights_by_evaluate(
+    page: Page,
+    country_name: str,
+    max_results: int
+) -> List[Dict[str, Any]]:
+    """
+    Extract all result rows in one ``page.evaluate`` round-trip.
+    
+    Args:
+        page: Playwright page object
+        country_name: Name of country searched from
+        max_results: Maximum number of results to extract
+        
+    Returns:
+        List of flight dictionaries
+    """
+    rows = await page.evaluate(
+        EXTRACT_ROWS_SCRIPT,
+        {
+            "resultSelectors": RESULT_SELECTORS,
+            "fields": FIELD_SELECTORS,
+            "maxResults": max_results,
+        },
+    )
+    
+    flights = []
+    for row in rows:
+        flight_data = build_flight(row, country_name)
+        if flight_data:
+            flights.append(flight_data)
+    return flights
+
+
+async def extract_flights_by_element(
+    page: Page,
+    country_name: str,
+    max_results: int
+) -> List[Dict[str, Any]]:
+    """
+    Extract result rows through individual element handles.
+    
+    Args:
+        page: Playwright page object
+        country_name: Name of country searched from
+        max_results: Maximum number of results to extract
+        
+    Returns:
+        List of flight dictionaries
+    """
+    results = []
+    for selector in RESULT_SELECTORS:
+        results = await page.query_selector_all(selector)
+        if results:
+            break
     
+    flights = []
+    for i, result in enumerate(results[:max_results]):
+        try:
+            flight_data = await extract_single_flight(result, country_name, i)
+            if flight_data:
+                flights.append(flight_data)
+        except Exception as e:
+            logger.warning(f"Error extracting flight {i} from {country_name}: {e}")
+            continue
     return flights
 
 
@@ -115,23 +257,17 @@ async def extract_single_flight(
     """
     try:
         # Extract price
-        price_element = await element.query_selector('[class*="price"], [class*="YMlIz"]')
+        price_element = await element.query_selector(FIELD_SELECTORS["price"])
         if not price_element:
             return None
-            
         price_text = await price_element.inner_text()
-        price = parse_price(price_text)
-        if not price:
-            return None
         
         # Extract airline
-        airline_element = await element.query_selector(
-            '[class*="airline"], [class*="sSHqwe"], [class*="Ir0Voe"]'
-        )
-        airline = await airline_element.inner_text() if airline_element else "Unknown Airline"
+        airline_element = await element.query_selector(FIELD_SELECTORS["airline"])
+        airline = await airline_element.inner_text() if airline_element else None
         
         # Extract times
-        time_elements = await element.query_selector_all('[class*="mv1WYe"], [class*="zxVSec"]')
+        time_elements = await element.query_selector_all(FIELD_SELECTORS["times"])
         departure_time = ""
         arrival_time = ""
         if len(time_elements) >= 2:
@@ -139,34 +275,71 @@ async def extract_single_flight(
             arrival_time = await time_elements[1].inner_text()
         
         # Extract duration
-        duration_element = await element.query_selector('[class*="Ak5kof"], [class*="gvkrdb"]')
-        duration = await duration_element.inner_text() if duration_element else ""
+        duration_element = await element.query_selector(FIELD_SELECTORS["duration"])
+        duration = await duration_element.inner_text() if duration_element else None
         
         # Extract stops
-        stops_element = await element.query_selector('[class*="EfT7Ae"], [class*="BbR8Ec"]')
-        stops_text = await stops_element.inner_text() if stops_element else "Nonstop"
-        stops = parse_stops(stops_text)
+        stops_element = await element.query_selector(FIELD_SELECTORS["stops"])
+        stops_text = await stops_element.inner_text() if stops_element else None
         
-        # Generate unique ID
-        flight_id = generate_flight_id(
-            airline, departure_time, arrival_time, price, country_name
+        return build_flight(
+            {
+                "price": price_text,
+                "airline": airline,
+                "departure_time": departure_time,
+                "arrival_time": arrival_time,
+                "duration": duration,
+                "stops": stops_text,
+            },
+            country_name,
         )
         
-        return {
-            "id": flight_id,
-            "airline": airline.strip(),
-            "price": price,
-            "currency": "USD",
-            "departure_time": departure_time.strip(),
-            "arrival_time": arrival_time.strip(),
-            "duration": duration.strip(),
-            "stops": stops,
-            "searched_from_country": country_name,
-        }
-        
     except Exception as e:
-        print(f"Error parsing flight element: {e}")
+        logger.warning(f"Error parsing flight element: {e}")
+        return None
+
+
+def build_flight(
+    fields: Dict[str, Optional[str]],
+    country_name: str
+) -> Optional[Dict[str, Any]]:
+    """
+    Build a flight dictionary from raw text fields of a result row.
+    
+    Args:
+        fields: Raw text keyed by price, airline, departure_time,
+            arrival_time, duration and stops (missing fields may be None)
+        country_name: Name of country searched from
+        
+    Returns:
+        Flight dictionary or None if the row has no usable price
+    """
+    price = parse_price(fields.get("price"))
+    if not price:
         return None
+    
+    airline = fields.get("airline") or "Unknown Airline"
+    departure_time = fields.get("departure_time") or ""
+    arrival_time = fields.get("arrival_time") or ""
+    duration = fields.get("duration") or ""
+    stops = parse_stops(fields.get("stops") or "Nonstop")
+    
+    # Generate unique ID
+    flight_id = generate_flight_id(
+        airline, departure_time, arrival_time, price, country_name
+    )
+    
+    return {
+        "id": flight_id,
+        "airline": airline.strip(),
+        "price": price,
+        "currency": "USD",
+        "departure_time": departure_time.strip(),
+        "arrival_time": arrival_time.strip(),
+        "duration": duration.strip(),
+        "stops": stops,
+        "searched_from_country": country_name,
+    }
 
 
 def parse_price(price_text: str) -> Optional[float]:
@@ -203,6 +376,65 @@ def generate_flight_id(
     return hashlib.md5(data.encode()).hexdigest()[:12]
 
 
+async def record_outcome(
+    request: FlightSearchRequest,
+    country_code: str,
+    flights: List[Dict[str, Any]],
+    failed: bool,
+    seconds: float,
+    label: str = "search"
+) -> None:
+    """
+    Record a finished search in its country's circuit breaker and the
+    price history.
+    
+    On a scraper worker the outcome is collected instead, to be sent back
+    with the unit and recorded by the API replica that asked for it.
+    
+    Args:
+        request: Flight search parameters
+        country_code: Country searched from
+        flights: Flights found
+        failed: Whether the search errored or timed out
+        seconds: How long the search took
+        label: Search within a batch the outcome belongs to
+    """
+    collected = SCRAPE_OUTCOMES.get()
+    if collected is not None:
+        collected.append(ScrapeOutcome(label=label, failed=failed, seconds=seconds))
+        return
+    if failed:
+        circuit_breakers.record(country_code, False, seconds)
+    else:
+        circuit_breakers.record_results(country_code, bool(flights), seconds, label=label)
+    await price_history.record(request, country_code, flights, search_seconds=seconds)
+
+
+async def record_failure(
+    requests: Iterable[FlightSearchRequest],
+    country_code: str,
+    seconds: float
+) -> None:
+    """
+    Count a search that was cut off before finishing as a circuit failure,
+    and store it in the price history as finding nothing, so countries that
+    always run out of time still get samples.
+    
+    Skipped on a scraper worker, where the API replica sees the unit go
+    unanswered and records it.
+    
+    Args:
+        requests: Searches that did not finish
+        country_code: Country searched from
+        seconds: How long they ran before being cut off
+    """
+    if SCRAPE_OUTCOMES.get() is not None:
+        return
+    circuit_breakers.record(country_code, False, seconds)
+    for request in requests:
+        await price_history.record(request, country_code, [], search_seconds=seconds)
+
+
 async def search_flights_from_country(
     request: FlightSearchRequest,
     country_code: str
@@ -210,6 +442,9 @@ async def search_flights_from_country(
     """
     Search for flights appearing to browse from a specific country.
     
+    Countries whose circuit breaker is open are skipped without opening a
+    browser context.
+    
     Args:
         request: Flight search parameters
         country_code: Country to search from
@@ -218,89 +453,537 @@ async def search_flights_from_country(
         List of flight results
     """
     country_info = get_country_info(country_code)
-    print(f"Searching from {country_info['name']}...")
+    if not circuit_breakers.allow(country_code):
+        logger.info(f"Skipping {country_info['name']}: circuit open")
+        return []
+    logger.info(f"Searching from {country_info['name']}...")
+    started = time.perf_counter()
+    flights: List[Dict[str, Any]] = []
+    failed = False
     
     try:
         async with create_browser_context(country_code) as (browser, context, page):
-            url = build_google_flights_url(request)
-            
-            await page.goto(url, wait_until="networkidle", timeout=settings.request_timeout)
+            flights = await scrape_flights(page, request, country_code)
             
-            # Handle cookie consent if present
-            try:
-                consent_button = await page.query_selector(
-                    'button[aria-label*="Accept"], button:has-text("Accept all")'
-                )
-                if consent_button:
-                    await consent_button.click()
-                    await page.wait_for_timeout(1000)
-            except:
-                pass
+            if not flights:
+                ZERO_RESULT_COUNTRIES.labels(country=country_code).inc()
+            logger.info(f"Found {len(flights)} flights from {country_info['name']}")
             
+    except PlaywrightTimeout as e:
+        COUNTRY_TIMEOUTS.labels(country=country_code, stage="navigation").inc()
+        logger.warning(f"Timeout searching from {country_info['name']}: {e}")
+        failed = True
+    except Exception as e:
+        COUNTRY_ERRORS.labels(country=country_code).inc()
+        logger.error(f"Error searching from {country_info['name']}: {e}")
+        failed = True
+    except asyncio.CancelledError:
+        # Cut off at the search deadline: as costly as a timeout
+        await record_failure([request], country_code, time.perf_counter() - started)
+        raise
+    finally:
+        COUNTRY_SEARCH_SECONDS.labels(country=country_code).observe(
+            time.perf_counter() - started
+        )
+    
+    await record_outcome(
+        request, country_code, flights, failed, time.perf_counter() - started
+    )
+    return flights
+
+
+async def scrape_flights(
+    page: Page,
+    request: FlightSearchRequest,
+    country_code: str
+) -> List[Dict[str, Any]]:
+    """
+    Load a search on an already configured page and extract its flights.
+    
+    Args:
+        page: Playwright page in a context set up for ``country_code``
+        request: Flight search parameters
+        country_code: Country the page is browsing from
+        
+    Returns:
+        List of flight results
+    """
+    url = build_google_flights_url(request)
+    flights: List[Dict[str, Any]] = []
+    
+    if settings.extraction_mode == "network":
+        with EXTRACT_SECONDS.labels(country=country_code).time():
+            flights = await intercept_flights_from_network(
+                page,
+                url,
+                country_code,
+                settings.max_results_per_country
+            )
+        if not flights:
+            logger.info(
+                f"No results payload from {get_country_info(country_code)['name']}, "
+                f"falling back to DOM"
+            )
+    else:
+        with PAGE_GOTO_SECONDS.labels(country=country_code).time():
+            await page.goto(
+                url,
+                wait_until=get_navigation_wait_until(),
+                timeout=settings.request_timeout
+            )
+    
+    if not flights:
+        # Contexts created from saved consent state skip the consent check
+        # unless the wall is back
+        saved_consent = consent_states.cached(country_code) is not None
+        checked_consent = not saved_consent or is_consent_page(page)
+        if checked_consent:
+            with CONSENT_SECONDS.labels(country=country_code).time():
+                await handle_consent(page, country_code)
+        with EXTRACT_SECONDS.labels(country=country_code).time():
             flights = await extract_flights_from_page(
                 page,
                 country_code,
                 settings.max_results_per_country
             )
-            
-            print(f"Found {len(flights)} flights from {country_info['name']}")
-            return flights
-            
+        if not flights and not checked_consent:
+            with CONSENT_SECONDS.labels(country=country_code).time():
+                accepted = await handle_consent(page, country_code)
+            if accepted:
+                with EXTRACT_SECONDS.labels(country=country_code).time():
+                    flights = await extract_flights_from_page(
+                        page,
+                        country_code,
+                        settings.max_results_per_country
+                    )
+    return flights
+
+
+async def search_many_from_country(
+    requests: Dict[str, FlightSearchRequest],
+    country_code: str,
+    results: Optional[Dict[str, List[Dict[str, Any]]]] = None
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Run several searches from one country in a single browser context.
+    
+    Searches are loaded one after another on the same page, so browser,
+    proxy and context setup is paid once rather than once per search. A
+    search that fails or times out gets no flights and does not stop the
+    ones after it.
+    
+    Args:
+        requests: Searches keyed by caller-chosen label, in search order
+        country_code: Country to search from
+        results: Filled in as each search finishes, so a caller keeps the
+            completed searches if this one is cancelled
+        
+    Returns:
+        Flights per label
+    """
+    results = {} if results is None else results
+    country_info = get_country_info(country_code)
+    if not circuit_breakers.allow(country_code):
+        logger.info(f"Skipping {len(requests)} searches from {country_info['name']}: circuit open")
+        return results
+    logger.info(f"Running {len(requests)} searches from {country_info['name']}...")
+    started = time.perf_counter()
+    
+    try:
+        async with create_browser_context(country_code) as (browser, context, page):
+            for label, request in requests.items():
+                started = time.perf_counter()
+                failed = True
+                try:
+                    flights = await scrape_flights(page, request, country_code)
+                    failed = False
+                except PlaywrightTimeout as e:
+                    COUNTRY_TIMEOUTS.labels(country=country_code, stage="navigation").inc()
+                    logger.warning(f"Timeout searching {label} from {country_info['name']}: {e}")
+                    flights = []
+                except Exception as e:
+                    COUNTRY_ERRORS.labels(country=country_code).inc()
+                    logger.error(f"Error searching {label} from {country_info['name']}: {e}")
+                    flights = []
+                
+                if not flights:
+                    ZERO_RESULT_COUNTRIES.labels(country=country_code).inc()
+                results[label] = flights
+                await record_outcome(
+                    request, country_code, flights, failed,
+                    time.perf_counter() - started, label=label,
+                )
     except Exception as e:
-        print(f"Error searching from {country_info['name']}: {e}")
-        return []
+        COUNTRY_ERRORS.labels(country=country_code).inc()
+        logger.error(f"Error running searches from {country_info['name']}: {e}")
+        unfinished = [r for label, r in requests.items() if label not in results]
+        if unfinished:
+            await record_failure(unfinished, country_code, time.perf_counter() - started)
+    except asyncio.CancelledError:
+        unfinished = [r for label, r in requests.items() if label not in results]
+        if unfinished:
+            await record_failure(unfinished, country_code, time.perf_counter() - started)
+        raise
+    
+    logger.info(
+        f"Completed {len(results)}/{len(requests)} searches from {country_info['name']}"
+    )
+    return results
 
 
-async def search_flights_multi_country(
-    request: FlightSearchRequest
-) -> Dict[str, Any]:
+async def get_cached_baseline(request: FlightSearchRequest) -> Optional[List[Dict[str, Any]]]:
+    """Cached US baseline flights for a search, refreshed in the background when old."""
+    return await baseline_cache.get(
+        request,
+        refresh=lambda: scrape_country(request, BASELINE_COUNTRY),
+    )
+
+
+async def scrape_country(
+    request: FlightSearchRequest,
+    country_code: str
+) -> List[Dict[str, Any]]:
     """
-    Search for flights from multiple countries concurrently.
+    Scrape one country, in this process or on a scraper worker.
+    
+    With ``DEPLOYMENT_MODE=api`` or ``SCRAPER_PROCESSES`` the scrape is
+    queued for a worker and this waits for its flights.
+    """
+    if scrapes_remotely():
+        results = await scrape_remotely({"search": request}, country_code)
+        return results.get("search", [])
+    return await search_flights_from_country(request, country_code)
+
+
+async def scrape_country_many(
+    requests: Dict[str, FlightSearchRequest],
+    country_code: str,
+    results: Dict[str, List[Dict[str, Any]]],
+    timeout: Optional[float] = None,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Run several searches from one country in a single browser context, in
+    this process or on a scraper worker; see ``search_many_from_country``.
+    
+    Searches run by a worker are only added to ``results`` once they have
+    all finished.
+    """
+    if scrapes_remotely():
+        results.update(await scrape_remotely(requests, country_code, timeout=timeout))
+        return results
+    return await search_many_from_country(requests, country_code, results=results)
+
+
+async def scrape_remotely(
+    requests: Dict[str, FlightSearchRequest],
+    country_code: str,
+    timeout: Optional[float] = None
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Run searches from one country on a scraper worker.
+    
+    Circuit breakers and price history stay with the API replica: open
+    circuits are skipped before anything is queued, and the outcomes the
+    worker sends back are recorded here. A unit that fails, expires or
+    never answers counts as a failure.
+    
+    Args:
+        requests: Searches keyed by label, run in one browser context
+        country_code: Country to search from
+        timeout: See ``WorkQueueClient.submit``
+        
+    Returns:
+        Flights per label
+        
+    Raises:
+        RuntimeError: If the worker reported an error
+    """
+    country_info = get_country_info(country_code)
+    if not circuit_breakers.allow(country_code):
+        logger.info(f"Skipping {country_info['name']}: circuit open")
+        return {}
+    started = time.perf_counter()
+    try:
+        result = await scrape_client.submit(requests, country_code, timeout=timeout)
+    except (Exception, asyncio.CancelledError):
+        await record_failure(requests.values(), country_code, time.perf_counter() - started)
+        raise
+    
+    for outcome in result.outcomes:
+        await record_outcome(
+            requests[outcome.label], country_code, result.results.get(outcome.label, []),
+            outcome.failed, outcome.seconds, label=outcome.label,
+        )
+    if not result.outcomes:
+        circuit_breakers.record(country_code, False, time.perf_counter() - started)
+    if result.error:
+        raise RuntimeError(f"Worker {result.worker_id} failed: {result.error}")
+    return result.results
+
+
+async def search_from_country(
+    request: FlightSearchRequest,
+    country_code: str
+) -> List[Dict[str, Any]]:
+    """
+    Search from one country, serving the US baseline from its own cache.
     
     Args:
         request: Flight search parameters
+        country_code: Country to search from
         
     Returns:
-        Aggregated results from all countries
+        List of flight results
     """
-    start_time = datetime.utcnow()
+    if country_code != BASELINE_COUNTRY:
+        return await scrape_country(request, country_code)
+    
+    flights = await get_cached_baseline(request)
+    if flights is not None:
+        logger.info("Using cached US baseline")
+        return flights
+    flights = await scrape_country(request, country_code)
+    await baseline_cache.set(request, flights)
+    return flights
+
+
+def is_consent_page(page: Page) -> bool:
+    """Whether navigation was redirected to Google's consent wall."""
+    url = page.url
+    return isinstance(url, str) and (urlsplit(url).hostname or "").startswith("consent.")
+
+
+async def handle_consent(page: Page, country_code: str) -> bool:
+    """
+    Dismiss the cookie consent wall if present.
+    
+    After accepting, the context's cookies and localStorage are saved so
+    later contexts for the country start past the wall. If the wall shows
+    up despite saved state, that state is invalidated first.
+    
+    Args:
+        page: Playwright page object
+        country_code: Country the page is browsing from
+        
+    Returns:
+        True if a consent wall was found and accepted
+    """
+    try:
+        consent_button = await page.query_selector(
+            'button[aria-label*="Accept"], button:has-text("Accept all")'
+        )
+        if not consent_button:
+            return False
+        if consent_states.cached(country_code) is not None:
+            logger.info(f"Consent wall reappeared for {country_code}")
+            await consent_states.invalidate(country_code)
+        await consent_button.click()
+        await page.wait_for_timeout(1000)
+        await consent_states.save(country_code, await page.context.storage_state())
+        return True
+    except Exception:
+        return False
+
+
+async def intercept_flights_from_network(
+    page: Page,
+    url: str,
+    country_code: str,
+    max_results: int
+) -> List[Dict[str, Any]]:
+    """
+    Navigate and parse flights from the results RPC response.
+    
+    Returns as soon as the results payload arrives rather than waiting for
+    the page to render or go network-idle. The page is left navigated so
+    callers can fall back to DOM extraction.
+    
+    Args:
+        page: Playwright page object
+        url: Google Flights search URL
+        country_code: Country the search was performed from
+        max_results: Maximum number of results to extract
+        
+    Returns:
+        List of flight dictionaries, empty if no payload was captured
+    """
+    country_name = get_country_info(country_code)["name"]
+    try:
+        async with page.expect_response(
+            lambda response: is_results_response_url(response.url),
+            timeout=settings.request_timeout
+        ) as response_info:
+            with PAGE_GOTO_SECONDS.labels(country=country_code).time():
+                await page.goto(url, wait_until="commit", timeout=settings.request_timeout)
+        response = await response_info.value
+        body = await response.text()
+    except PlaywrightTimeout:
+        COUNTRY_TIMEOUTS.labels(country=country_code, stage="payload").inc()
+        logger.warning(f"Timeout waiting for results payload from {country_name}")
+        return []
+    
+    flights = []
+    for row in parse_results_payload(body, max_results):
+        flight_data = build_flight(row, country_name)
+        if flight_data:
+            flights.append(flight_data)
+    return flights
+
+
+def get_search_deadline(request: FlightSearchRequest) -> float:
+    """Latency budget for a search in seconds."""
+    return (request.deadline_ms or settings.search_deadline_ms) / 1000
+
+
+def with_deadline(request: FlightSearchRequest, seconds: float) -> FlightSearchRequest:
+    """Copy of a request whose latency budget is ``seconds``."""
+    return request.model_copy(update={"deadline_ms": max(int(seconds * 1000), 1)})
+
+
+def get_sequential_deadline(deadline_ms: Optional[int], loads: int) -> float:
+    """
+    Latency budget in seconds for searches that load pages back to back.
+    
+    An explicit ``deadline_ms`` covers the whole run; otherwise each
+    sequential page load gets the default single-search budget.
+    """
+    if deadline_ms:
+        return deadline_ms / 1000
+    return settings.search_deadline_ms / 1000 * max(loads, 1)
+
+
+def expand_date_range(request: DateRangeSearchRequest) -> Dict[str, FlightSearchRequest]:
+    """
+    Split a date-range search into single-date searches.
+    
+    Args:
+        request: Date-range search with ``flex_days`` set
+        
+    Returns:
+        Single-date requests keyed by the flexed date (YYYY-MM-DD), in order
+    """
+    field = "return_date" if request.flex_date == FlexDate.RETURN else "departure_date"
+    start = date.fromisoformat(getattr(request, field))
+    single = request.model_dump(exclude={"flex_days", "flex_date"})
+    date_requests: Dict[str, FlightSearchRequest] = {}
+    for offset in range(request.flex_days or 1):
+        day = (start + timedelta(days=offset)).isoformat()
+        date_requests[day] = FlightSearchRequest(**{**single, field: day})
+    return date_requests
+
+
+async def iter_country_results(
+    request: FlightSearchRequest,
+    country_codes: List[str],
+    timeout: Optional[float] = None,
+    search: Optional[Callable[[FlightSearchRequest, str], Awaitable[Any]]] = None,
+    outcomes: Optional[SearchOutcomes] = None
+) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    Search from several countries concurrently, yielding as each finishes.
+    
+    Countries still running when the timeout expires are cancelled and
+    never yielded. Countries that found nothing are only held against
+    their circuit breakers once every country has finished.
+    
+    Args:
+        request: Flight search parameters
+        country_codes: Countries to search from
+        timeout: Overall budget in seconds (default: no limit)
+        search: Per-country search coroutine (default:
+            ``search_from_country``)
+        outcomes: Collects the search's circuit outcomes, e.g. to read
+            which countries were skipped (default: a fresh one)
+        
+    Yields:
+        Tuples of (country_code, flights) in completion order
+    """
+    search = search or search_from_country
+    outcomes = outcomes or SearchOutcomes(circuit_breakers)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout if timeout is not None else None
+    search_id = uuid.uuid4().hex
     
-    # Create search tasks for each country
-    tasks = [
-        search_flights_from_country(request, country_code)
-        for country_code in settings.search_countries
-    ]
+    def start(code: str) -> asyncio.Task:
+        # Tag every country's scrape with the search it belongs to
+        context = contextvars.copy_context()
+        context.run(SEARCH_ID.set, search_id)
+        context.run(SEARCH_OUTCOMES.set, outcomes)
+        return loop.create_task(search(request, code), context=context)
     
-    # Also search from US as baseline for comparison
-    tasks.append(search_flights_from_country(request, "us"))
+    tasks = {start(code): code for code in country_codes}
     
-    # Execute all searches concurrently
-    results = await asyncio.gather(*tasks, return_exceptions=True)
+    try:
+        pending = set(tasks)
+        while pending:
+            remaining = deadline - loop.time() if deadline is not None else None
+            if remaining is not None and remaining <= 0:
+                timed_out = [tasks[t] for t in pending]
+                for code in timed_out:
+                    COUNTRY_TIMEOUTS.labels(country=code, stage="deadline").inc()
+                logger.warning(f"Search deadline reached, abandoning: {', '.join(timed_out)}")
+                break
+            done, pending = await asyncio.wait(
+                pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                country_code = tasks[task]
+                if task.cancelled():
+                    continue
+                if task.exception() is not None:
+                    logger.error(f"Search task for {country_code} failed: {task.exception()}")
+                    yield country_code, []
+                    continue
+                yield country_code, task.result()
+    finally:
+        # Deadline hit or consumer stopped early; don't leak scrapes
+        unfinished = [task for task in tasks if not task.done()]
+        for task in unfinished:
+            task.cancel()
+        if unfinished:
+            # Let cancelled searches release their browser contexts
+            await asyncio.gather(*unfinished, return_exceptions=True)
+        outcomes.settle()
+
+
+def aggregate_results(
+    country_results: Dict[str, List[Dict[str, Any]]],
+    search_time: float,
+    timed_out_countries: Optional[List[str]] = None,
+    skipped_countries: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    Combine per-country flights into a ranked result set.
     
-    # Process results
+    Flights found from the US are used only as the baseline price that
+    savings are computed against.
+    
+    Args:
+        country_results: Flights keyed by country code, in search order
+        search_time: Elapsed search time in seconds
+        timed_out_countries: Country codes abandoned at the search deadline
+        skipped_countries: Country codes not searched because their
+            circuit breaker was open
+        
+    Returns:
+        Aggregated results dictionary
+    """
     all_flights = []
     countries_searched = []
     us_baseline_price = None
     
-    for i, result in enumerate(results):
-        if isinstance(result, Exception):
-            print(f"Search task {i} failed: {result}")
+    for country_code, result in country_results.items():
+        if not result:
             continue
-            
-        if isinstance(result, list) and result:
-            country_code = (
-                settings.search_countries[i]
-                if i < len(settings.search_countries)
-                else "us"
-            )
-            country_info = get_country_info(country_code)
-            countries_searched.append(country_info["name"])
-            
-            # Track US baseline
-            if country_code == "us" and result:
-                us_baseline_price = min(f["price"] for f in result)
-            else:
-                all_flights.extend(result)
+        
+        country_info = get_country_info(country_code)
+        countries_searched.append(country_info["name"])
+        
+        # Track US baseline
+        if country_code == "us":
+            us_baseline_price = min(f["price"] for f in result)
+        else:
+            all_flights.extend(result)
     
     # Sort by price
     all_flights.sort(key=lambda x: x["price"])
@@ -319,8 +1002,6 @@ async def search_flights_multi_country(
     best_price = all_flights[0]["price"] if all_flights else None
     best_savings = all_flights[0].get("savings_percent") if all_flights else None
     
-    search_time = (datetime.utcnow() - start_time).total_seconds()
-    
     return {
         "flights": all_flights,
         "total_results": len(all_flights),
@@ -329,4 +1010,189 @@ async def search_flights_multi_country(
         "baseline_price": us_baseline_price,
         "best_savings_percent": best_savings,
         "search_time_seconds": round(search_time, 2),
+        "countries_timed_out": [
+            get_country_info(code)["name"] for code in timed_out_countries or []
+        ],
+        "countries_skipped": [
+            get_country_info(code)["name"] for code in skipped_countries or []
+        ],
+    }
+
+
+def get_search_countries() -> List[str]:
+    """Countries searched per request, with the US baseline last."""
+    return [*settings.search_countries, "us"]
+
+
+async def select_search_countries(
+    request: FlightSearchRequest,
+    explore: bool = True,
+) -> List[str]:
+    """
+    Countries to scrape for a search, with the US baseline last.
+    
+    All configured countries are searched unless adaptive selection is
+    enabled in config or requested via ``maxCountries``/``explorationRate``,
+    in which case only the countries with the best savings history for the
+    route are kept.
+    
+    Args:
+        request: Flight search parameters
+        explore: Whether an exploratory country may be added
+        
+    Returns:
+        Country codes to search
+    """
+    if not (
+        settings.adaptive_countries_enabled
+        or request.max_countries is not None
+        or request.exploration_rate is not None
+    ):
+        return get_search_countries()
+    chosen = await country_selector.select(
+        request, list(settings.search_countries), explore=explore
+    )
+    return [*chosen, BASELINE_COUNTRY]
+
+
+CountryResultCallback = Callable[[str, List[Dict[str, Any]]], Awaitable[None]]
+
+
+async def search_flights_multi_country(
+    request: FlightSearchRequest,
+    on_country: Optional[CountryResultCallback] = None,
+    country_codes: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Search for flights from multiple countries concurrently.
+    
+    Countries that have not finished within the request's deadline are
+    cancelled and reported in ``countries_timed_out``, and countries whose
+    circuit breaker is open are reported in ``countries_skipped``; the
+    aggregate is built from the countries that did finish.
+    
+    Args:
+        request: Flight search parameters
+        on_country: Awaited with (country_code, flights) as each country
+            finishes, e.g. to publish partial results
+        country_codes: Countries to search (default: every configured
+            country plus the US baseline)
+        
+    Returns:
+        Aggregated results from all countries
+    """
+    start_time = datetime.utcnow()
+    
+    # Search each configured country plus the US as baseline for comparison
+    country_codes = country_codes or get_search_countries()
+    country_results: Dict[str, List[Dict[str, Any]]] = {
+        code: [] for code in country_codes
+    }
+    finished = set()
+    outcomes = SearchOutcomes(circuit_breakers)
+    
+    async for country_code, flights in iter_country_results(
+        request, country_codes, timeout=get_search_deadline(request), outcomes=outcomes
+    ):
+        country_results[country_code] = flights
+        finished.add(country_code)
+        if on_country is not None:
+            await on_country(country_code, flights)
+    
+    timed_out = [code for code in country_codes if code not in finished]
+    skipped = [code for code in country_codes if code in outcomes.skipped]
+    search_time = (datetime.utcnow() - start_time).total_seconds()
+    return aggregate_results(country_results, search_time, timed_out, skipped)
+
+
+async def search_many_multi_country(
+    requests: Dict[str, FlightSearchRequest],
+    timeout: Optional[float] = None,
+    per_context: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Run several searches from every country over shared browser contexts.
+    
+    Work is grouped by country: each context handles up to ``per_context``
+    searches back to back, and a country with more searches than that
+    opens several contexts in parallel. At the deadline unfinished
+    countries are cancelled, keeping the searches they had completed.
+    
+    Args:
+        requests: Searches keyed by caller-chosen label (e.g. from
+            ``expand_date_range``)
+        timeout: Overall budget in seconds (default: no limit)
+        per_context: Searches per browser context (default: all of them)
+        
+    Returns:
+        Dict with ``searches`` (label -> aggregated results, as from
+        ``aggregate_results``), ``countries_timed_out``,
+        ``countries_skipped`` and ``search_time_seconds``
+    """
+    start_time = datetime.utcnow()
+    country_codes = get_search_countries()
+    by_country: Dict[str, Dict[str, List[Dict[str, Any]]]] = {
+        code: {} for code in country_codes
+    }
+    finished = set()
+    
+    labels = list(requests)
+    per_context = per_context or len(labels)
+    
+    # Only scrape the US for searches without a cached baseline
+    for label in labels:
+        baseline = await get_cached_baseline(requests[label])
+        if baseline is not None:
+            by_country[BASELINE_COUNTRY][label] = baseline
+    baseline_labels = [l for l in labels if l not in by_country[BASELINE_COUNTRY]]
+    if not baseline_labels:
+        finished.add(BASELINE_COUNTRY)
+    
+    def chunk(country_labels: List[str]) -> List[Dict[str, FlightSearchRequest]]:
+        return [
+            {label: requests[label] for label in country_labels[i:i + per_context]}
+            for i in range(0, len(country_labels), per_context)
+        ]
+    
+    async def search_country(request: FlightSearchRequest, country_code: str):
+        country_labels = baseline_labels if country_code == BASELINE_COUNTRY else labels
+        await asyncio.gather(*(
+            scrape_country_many(
+                group, country_code, results=by_country[country_code], timeout=timeout
+            )
+            for group in chunk(country_labels)
+        ))
+        if country_code == BASELINE_COUNTRY:
+            for label in country_labels:
+                await baseline_cache.set(requests[label], by_country[country_code].get(label, []))
+    
+    outcomes = SearchOutcomes(circuit_breakers)
+    async for country_code, _ in iter_country_results(
+        requests[labels[0]],
+        [code for code in country_codes if code not in finished],
+        timeout=timeout,
+        search=search_country,
+        outcomes=outcomes,
+    ):
+        finished.add(country_code)
+    
+    search_time = (datetime.utcnow() - start_time).total_seconds()
+    skipped = [code for code in country_codes if code in outcomes.skipped]
+    searches = {}
+    for label in labels:
+        country_results = {code: by_country[code].get(label, []) for code in country_codes}
+        missing = [
+            code for code in country_codes
+            if label not in by_country[code] and code not in skipped
+        ]
+        searches[label] = aggregate_results(country_results, search_time, missing, skipped)
+    
+    return {
+        "searches": searches,
+        "countries_timed_out": [
+            get_country_info(code)["name"]
+            for code in country_codes if code not in finished
+        ],
+        "countries_skipped": [get_country_info(code)["name"] for code in skipped],
+        "search_time_seconds": round(search_time, 2),
     }
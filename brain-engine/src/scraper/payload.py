@@ -0,0 +1,181 @@
+"""Parsing of Google Flights result payloads captured from network traffic."""
+
+import json
+from datetime import date
+from typing import Any, Dict, Iterator, List, Optional
+
+# RPC that returns itineraries for a search
+RESULTS_RPC_PATH = "FlightsFrontendService/GetShoppingResults"
+
+# Anti-JSON-hijacking prefix Google puts in front of RPC responses
+XSSI_PREFIX = ")]}'"
+
+
+def is_results_response_url(url: str) -> bool:
+    """Whether a response URL carries search results."""
+    return RESULTS_RPC_PATH in url
+
+
+def iter_json_chunks(body: str) -> Iterator[Any]:
+    """
+    Decode the JSON values in a (possibly length-prefixed) RPC body.
+
+    Responses look like ``)]}'`` followed by lines of JSON, each optionally
+    preceded by a line holding its byte length.
+
+    Args:
+        body: Raw response text
+
+    Yields:
+        Decoded JSON values
+    """
+    text = body.lstrip()
+    if text.startswith(XSSI_PREFIX):
+        text = text[len(XSSI_PREFIX):]
+
+    decoder = json.JSONDecoder()
+    index = 0
+    length = len(text)
+    while index < length:
+        char = text[index]
+        if char.isspace() or char.isdigit():
+            index += 1
+            continue
+        try:
+            value, index = decoder.raw_decode(text, index)
+        except json.JSONDecodeError:
+            # Skip to the next line and try again
+            newline = text.find("\n", index)
+            if newline == -1:
+                break
+            index = newline + 1
+            continue
+        yield value
+
+
+def iter_rpc_payloads(body: str) -> Iterator[Any]:
+    """
+    Yield the decoded inner payload of every ``wrb.fr`` RPC envelope.
+
+    Args:
+        body: Raw response text
+
+    Yields:
+        Decoded RPC payloads
+    """
+    for chunk in iter_json_chunks(body):
+        if not isinstance(chunk, list):
+            continue
+        for envelope in chunk:
+            if (
+                isinstance(envelope, list)
+                and len(envelope) > 2
+                and envelope[0] == "wrb.fr"
+                and isinstance(envelope[2], str)
+            ):
+                try:
+                    yield json.loads(envelope[2])
+                except json.JSONDecodeError:
+                    continue
+
+
+def format_clock(clock: Optional[List[Optional[int]]]) -> str:
+    """Format an ``[hour, minute]`` pair as ``10:30 AM``."""
+    if not clock:
+        return ""
+    hour = clock[0] or 0
+    minute = clock[1] if len(clock) > 1 and clock[1] else 0
+    suffix = "AM" if hour < 12 else "PM"
+    return f"{hour % 12 or 12}:{minute:02d} {suffix}"
+
+
+def format_duration(minutes: Optional[int]) -> str:
+    """Format a duration in minutes as ``11 hr 15 min``."""
+    if not minutes:
+        return ""
+    hours, mins = divmod(int(minutes), 60)
+    if not hours:
+        return f"{mins} min"
+    return f"{hours} hr {mins} min" if mins else f"{hours} hr"
+
+
+def _day_offset(departure_date: List[int], arrival_date: List[int]) -> int:
+    try:
+        return (date(*arrival_date[:3]) - date(*departure_date[:3])).days
+    except (TypeError, ValueError):
+        return 0
+
+
+def parse_itinerary(item: List[Any]) -> Optional[Dict[str, str]]:
+    """
+    Convert one raw itinerary entry into a result row.
+
+    The entry layout is ``[itinerary, summary]`` where ``itinerary`` holds
+    airline names at index 1, segments at 2, departure date/time at 4/5,
+    arrival date/time at 7/8 and total minutes at 9, and the price sits at
+    ``summary[0][1]``.
+
+    Args:
+        item: Raw itinerary entry from the payload
+
+    Returns:
+        Row dictionary with the same keys as the DOM extractor, or None
+    """
+    try:
+        itinerary, summary = item[0], item[1]
+        price = summary[0][1]
+        if price is None:
+            return None
+
+        airlines = itinerary[1] or []
+        segments = itinerary[2] or []
+        stops = max(len(segments) - 1, 0)
+
+        arrival_time = format_clock(itinerary[8])
+        offset = _day_offset(itinerary[4], itinerary[7])
+        if offset > 0:
+            arrival_time += f"+{offset}"
+
+        return {
+            "price": str(price),
+            "airline": ", ".join(a for a in airlines if a),
+            "departure_time": format_clock(itinerary[5]),
+            "arrival_time": arrival_time,
+            "duration": format_duration(itinerary[9]),
+            "stops": "Nonstop" if stops == 0 else f"{stops} stop{'s' if stops > 1 else ''}",
+        }
+    except (IndexError, TypeError, KeyError):
+        return None
+
+
+def parse_results_payload(body: str, max_results: int) -> List[Dict[str, str]]:
+    """
+    Extract result rows from a GetShoppingResults response body.
+
+    Best flights (payload index 2) come before other flights (index 3).
+
+    Args:
+        body: Raw response text
+        max_results: Maximum number of rows to return
+
+    Returns:
+        List of raw row dictionaries, empty if nothing could be parsed
+    """
+    rows: List[Dict[str, str]] = []
+    for payload in iter_rpc_payloads(body):
+        if not isinstance(payload, list):
+            continue
+        for section in (2, 3):
+            try:
+                items = payload[section][0]
+            except (IndexError, TypeError):
+                continue
+            if not isinstance(items, list):
+                continue
+            for item in items:
+                row = parse_itinerary(item)
+                if row:
+                    rows.append(row)
+                if len(rows) >= max_results:
+                    return rows
+    return rows
@@ -4,7 +4,7 @@ from typing import Dict, Optional
 from src.config import settings, COUNTRY_CONFIG
 
 
-def get_proxy_config(country_code: str) -> Dict[str, str]:
+def get_proxy_config(country_code: str) -> Optional[Dict[str, str]]:
     """
     Generate Oxylabs proxy configuration for a specific country.
     
@@ -12,8 +12,11 @@ def get_proxy_config(country_code: str) -> Dict[str, str]:
         country_code: Two-letter country code (e.g., 'in', 'mx', 'br')
         
     Returns:
-        Proxy configuration dictionary for Playwright
+        Proxy configuration dictionary for Playwright, or None when
+        proxying is disabled
     """
+    if not settings.proxy_enabled:
+        return None
     return {
         "server": f"http://{settings.oxylabs_endpoint}",
         "username": f"{settings.oxylabs_username}-cc-{country_code}",
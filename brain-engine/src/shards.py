@@ -0,0 +1,305 @@
+"""Scraper subprocesses, each owning a browser pool for a subset of countries."""
+
+import asyncio
+import json
+import logging
+import multiprocessing
+import signal
+import zlib
+from dataclasses import dataclass, field
+from multiprocessing.connection import Connection
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from src.config import settings
+from src.metrics import mark_process_dead
+from src.models.flight import ScrapeUnit, ScrapeUnitResult, WorkerStatus
+from src.pressure import WorkerPressure
+
+logger = logging.getLogger(__name__)
+
+# Fresh interpreters: forking a process with a running event loop and
+# Playwright driver is unsafe
+MP_CONTEXT = multiprocessing.get_context("spawn")
+
+
+async def send_message(conn: Connection, lock: asyncio.Lock, payload: str) -> None:
+    """Write one message without blocking the event loop on a full pipe."""
+    async with lock:
+        await asyncio.to_thread(conn.send_bytes, payload.encode())
+
+
+class PipeWorkerQueue:
+    """Child side of a shard's pipe, shaped like a work queue for ScrapeWorker."""
+
+    in_process = False
+
+    def __init__(self, conn: Connection):
+        self.conn = conn
+        self.closed = asyncio.Event()
+        self._units: "asyncio.Queue[ScrapeUnit]" = asyncio.Queue()
+        self._send_lock = asyncio.Lock()
+
+    def start(self) -> None:
+        asyncio.get_running_loop().add_reader(self.conn.fileno(), self._on_readable)
+
+    def _on_readable(self) -> None:
+        try:
+            data = self.conn.recv_bytes()
+        except (EOFError, OSError):
+            # The main process closed its end: time to shut down
+            asyncio.get_running_loop().remove_reader(self.conn.fileno())
+            self.closed.set()
+            return
+        self._units.put_nowait(ScrapeUnit.model_validate_json(data))
+
+    async def pop_unit(self, timeout: float) -> Optional[ScrapeUnit]:
+        try:
+            return await asyncio.wait_for(self._units.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def push_result(self, reply_to: str, result: ScrapeUnitResult) -> None:
+        await send_message(self.conn, self._send_lock, result.model_dump_json())
+
+    async def report_status(self, status: WorkerStatus) -> None:
+        await send_message(self.conn, self._send_lock, status.model_dump_json())
+
+    async def clear_status(self, worker_id: str) -> None:
+        # The main process forgets a shard's status when its pipe closes
+        pass
+
+    async def close(self) -> None:
+        if not self.closed.is_set():
+            asyncio.get_running_loop().remove_reader(self.conn.fileno())
+        self.conn.close()
+
+
+async def serve_shard(conn: Connection, index: int, countries: List[str]) -> None:
+    """Run a ScrapeWorker on this process's own browser pool until the pipe closes."""
+    from src.scraper.browser import browser_pool
+    from src.worker import ScrapeWorker
+
+    queue = PipeWorkerQueue(conn)
+    queue.start()
+    await browser_pool.start()
+    worker = ScrapeWorker(queue, worker_id=f"shard-{index}")
+    worker.start()
+    logger.info(f"Scraper shard {index} serving {', '.join(countries)}")
+    try:
+        await queue.closed.wait()
+    finally:
+        await worker.stop()
+        await browser_pool.stop()
+        await queue.close()
+
+
+def _ignore_signal(signum: int, frame) -> None:
+    logger.info(f"Ignoring signal {signum}; the API process stops this shard")
+
+
+def ignore_group_signals() -> None:
+    """
+    Keep SIGINT and SIGTERM from stopping this shard.
+
+    Sent to the whole process group, they would kill the shard mid-unit
+    before the API process has drained; the shard stops when the API
+    process closes its pipe instead. A handler rather than SIG_IGN, so
+    browsers started from here still get default handling.
+    """
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, _ignore_signal)
+
+
+def run_shard(conn: Connection, index: int, countries: List[str]) -> None:
+    """Subprocess entry point."""
+    ignore_group_signals()
+    # The node's Chromium memory budget is shared between the shards
+    settings.browser_total_rss_mb //= max(settings.scraper_processes, 1)
+    # This process is the shard: it scrapes directly rather than dispatching
+    settings.scraper_processes = 0
+    logging.basicConfig(
+        level=logging.DEBUG if settings.debug else logging.INFO,
+        format=f"%(asctime)s - shard-{index} - %(name)s - %(levelname)s - %(message)s"
+    )
+    asyncio.run(serve_shard(conn, index, countries))
+
+
+@dataclass
+class Shard:
+    """A running scraper subprocess and the main process's end of its pipe."""
+
+    index: int
+    process: multiprocessing.process.BaseProcess
+    conn: Connection
+    send_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+class ProcessShardQueue(WorkerPressure):
+    """
+    Work queue that hands each unit to the subprocess owning its country.
+
+    Countries are spread round-robin over ``processes`` subprocesses, each
+    with its own browser pool and event loop, so scraping uses several
+    cores and a crashing Chromium only takes down its shard. When a shard
+    dies, its in-flight units fail immediately and it is restarted after
+    ``restart_delay`` seconds. Shards ignore SIGINT and SIGTERM, so closing
+    the queue closes their pipes and kills any that do not exit in time.
+
+    Shards report their memory pressure over the pipe. Each country has a
+    single shard, so pressure in any of them is reported as pressure.
+    """
+
+    in_process = False
+
+    def __init__(
+        self,
+        processes: Optional[int] = None,
+        countries: Optional[List[str]] = None,
+        target: Callable[[Connection, int, List[str]], None] = run_shard,
+        restart_delay: float = 1.0,
+    ):
+        super().__init__()
+        self.processes = max(processes or settings.scraper_processes, 1)
+        codes = countries or [*settings.search_countries, "us"]
+        self.assignments = {code: i % self.processes for i, code in enumerate(codes)}
+        self.target = target
+        self.restart_delay = restart_delay
+        self._shards: Dict[int, Shard] = {}
+        # unit ID -> (shard index, unit) for units sent but not answered
+        self._inflight: Dict[str, Tuple[int, ScrapeUnit]] = {}
+        self._results: Optional["asyncio.Queue[ScrapeUnitResult]"] = None
+        self._closing = False
+        self._reapers: Set[asyncio.Task] = set()
+        # Indexes of shards reporting memory pressure
+        self._pressured: Set[int] = set()
+
+    def shard_for(self, country_code: str) -> int:
+        if country_code in self.assignments:
+            return self.assignments[country_code]
+        return zlib.crc32(country_code.encode()) % self.processes
+
+    def countries_for(self, index: int) -> List[str]:
+        return [code for code, shard in self.assignments.items() if shard == index]
+
+    def _result_queue(self) -> "asyncio.Queue[ScrapeUnitResult]":
+        if self._results is None:
+            self._results = asyncio.Queue()
+        return self._results
+
+    async def start(self) -> None:
+        """Launch every shard subprocess."""
+        self._closing = False
+        for index in range(self.processes):
+            self._spawn(index)
+        logger.info(f"Started {self.processes} scraper shards: {self.assignments}")
+
+    def _spawn(self, index: int) -> None:
+        if self._closing:
+            return
+        parent_conn, child_conn = MP_CONTEXT.Pipe()
+        process = MP_CONTEXT.Process(
+            target=self.target,
+            args=(child_conn, index, self.countries_for(index)),
+            name=f"scraper-shard-{index}",
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        self._shards[index] = Shard(index=index, process=process, conn=parent_conn)
+        asyncio.get_running_loop().add_reader(parent_conn.fileno(), self._on_readable, index)
+
+    def _on_readable(self, index: int) -> None:
+        shard = self._shards[index]
+        try:
+            data = shard.conn.recv_bytes()
+        except (EOFError, OSError):
+            self._on_exit(index)
+            return
+        message = json.loads(data)
+        if "unit_id" not in message:
+            status = WorkerStatus.model_validate(message)
+            if status.memory_pressure:
+                self._pressured.add(index)
+            else:
+                self._pressured.discard(index)
+            self._set_pressure(bool(self._pressured))
+            return
+        result = ScrapeUnitResult.model_validate(message)
+        self._inflight.pop(result.unit_id, None)
+        self._result_queue().put_nowait(result)
+
+    def _on_exit(self, index: int) -> None:
+        shard = self._shards.pop(index)
+        loop = asyncio.get_running_loop()
+        loop.remove_reader(shard.conn.fileno())
+        shard.conn.close()
+        reaper = loop.create_task(self._reap(shard))
+        self._reapers.add(reaper)
+        reaper.add_done_callback(self._reapers.discard)
+        # Its browsers died with it
+        self._pressured.discard(index)
+        self._set_pressure(bool(self._pressured))
+        if self._closing:
+            return
+        logger.error(f"Scraper shard {index} exited, restarting")
+        for unit_id, (owner, unit) in list(self._inflight.items()):
+            if owner == index:
+                del self._inflight[unit_id]
+                self._result_queue().put_nowait(self._failed(unit, f"scraper shard {index} exited"))
+        loop.call_later(self.restart_delay, self._spawn, index)
+
+    async def _reap(self, shard: Shard, timeout: float = 5.0) -> None:
+        # The pipe closes a moment before the process is gone; joining on the
+        # event loop would stall every search in the meantime
+        await asyncio.to_thread(shard.process.join, timeout)
+        if shard.process.is_alive():
+            logger.warning(f"Scraper shard {shard.index} closed its pipe but is still running, killing")
+            shard.process.kill()
+            await asyncio.to_thread(shard.process.join, timeout)
+        logger.info(f"Scraper shard {shard.index} exited with code {shard.process.exitcode}")
+        mark_process_dead(shard.process.pid)
+
+    @staticmethod
+    def _failed(unit: ScrapeUnit, error: str) -> ScrapeUnitResult:
+        return ScrapeUnitResult(
+            unit_id=unit.unit_id,
+            search_id=unit.search_id,
+            country_code=unit.country_code,
+            error=error,
+        )
+
+    async def push_unit(self, unit: ScrapeUnit) -> None:
+        index = self.shard_for(unit.country_code)
+        shard = self._shards.get(index)
+        if shard is None:
+            self._result_queue().put_nowait(self._failed(unit, f"scraper shard {index} is restarting"))
+            return
+        self._inflight[unit.unit_id] = (index, unit)
+        await send_message(shard.conn, shard.send_lock, unit.model_dump_json())
+
+    async def pop_result(self, reply_to: str, timeout: float) -> Optional[ScrapeUnitResult]:
+        try:
+            return await asyncio.wait_for(self._result_queue().get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def close(self, timeout: float = 10.0) -> None:
+        """Close every shard's pipe, letting it shut down, then reap it."""
+        self._closing = True
+        loop = asyncio.get_running_loop()
+        shards, self._shards = list(self._shards.values()), {}
+        for shard in shards:
+            loop.remove_reader(shard.conn.fileno())
+            shard.conn.close()
+        for shard in shards:
+            await asyncio.to_thread(shard.process.join, timeout)
+            if shard.process.is_alive():
+                # Shards ignore SIGTERM, see run_shard
+                logger.warning(f"Scraper shard {shard.index} did not exit, killing")
+                shard.process.kill()
+                await asyncio.to_thread(shard.process.join, 5)
+            mark_process_dead(shard.process.pid)
+        await asyncio.gather(*self._reapers, return_exceptions=True)
+        self._inflight.clear()
+        self._pressured.clear()
+        self._set_pressure(False)
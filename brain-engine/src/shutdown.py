@@ -0,0 +1,140 @@
+"""Graceful shutdown: drain in-flight searches before the API process exits."""
+
+import asyncio
+import logging
+import signal
+import threading
+import time
+from typing import Awaitable, Callable, List, Optional
+
+from src.config import settings
+from src.scheduler import PageScheduler, search_scheduler
+
+logger = logging.getLogger(__name__)
+
+
+class GracefulShutdown:
+    """
+    Drains an API instance before it stops.
+
+    Draining stops admission of new searches (503 with Retry-After) and
+    turns ``/health`` into a 503, while searches that already hold or wait
+    for page slots keep running for up to ``timeout`` seconds. Other work
+    that needs draining, such as background search jobs, registers a
+    coroutine function in ``drainers``; each is called with ``timeout`` and
+    waited for alongside the searches. On SIGTERM
+    this happens before the server is told to exit: the instance keeps
+    answering for at least ``notice`` seconds so load balancer health
+    checks see it draining, and until its searches finish, then the signal
+    is handed to the server's own handler (uvicorn), which closes the
+    listener and runs the lifespan shutdown. A second SIGTERM skips the
+    wait.
+    """
+
+    def __init__(
+        self,
+        scheduler: PageScheduler,
+        timeout: Optional[float] = None,
+        notice: Optional[float] = None,
+    ):
+        self.scheduler = scheduler
+        self.timeout = timeout if timeout is not None else settings.drain_timeout
+        self.notice = notice if notice is not None else settings.drain_notice_seconds
+        self.started_at: Optional[float] = None
+        self._drain: Optional[asyncio.Task] = None
+        self._handoff: Optional[asyncio.Task] = None
+        self._previous_handler: Optional[Callable] = None
+        self.drainers: List[Callable[[float], Awaitable[bool]]] = []
+
+    @property
+    def draining(self) -> bool:
+        return self.scheduler.draining
+
+    async def drain(self, notice: float = 0.0) -> bool:
+        """
+        Stop admitting searches and wait for in-flight ones to finish.
+
+        Safe to call more than once; every caller waits on the same drain.
+
+        Args:
+            notice: Keep waiting until at least this many seconds after
+                draining started, even once idle
+
+        Returns:
+            True if every search finished within ``timeout``
+        """
+        if self._drain is None:
+            self.started_at = time.monotonic()
+            self.scheduler.set_draining(True)
+            logger.info(
+                f"Draining: {self.scheduler.in_use} pages busy, "
+                f"{self.scheduler.queued} searches queued"
+            )
+            self._drain = asyncio.ensure_future(self._wait_idle())
+        drained = await asyncio.shield(self._drain)
+        if not drained:
+            logger.warning(
+                f"Drain timed out after {self.timeout:.0f}s with "
+                f"{self.scheduler.in_use} pages still busy"
+            )
+        remaining = self.started_at + notice - time.monotonic()
+        if remaining > 0:
+            await asyncio.sleep(remaining)
+        return drained
+
+    async def _wait_idle(self) -> bool:
+        drained = await asyncio.gather(
+            self.scheduler.wait_idle(self.timeout),
+            *(drainer(self.timeout) for drainer in self.drainers),
+        )
+        return all(drained)
+
+    def reset(self) -> None:
+        """Accept searches again, e.g. when the app starts up."""
+        if self._drain is not None:
+            self._drain.cancel()
+        self._drain = None
+        self._handoff = None
+        self.started_at = None
+        self.scheduler.set_draining(False)
+
+    def install(self) -> None:
+        """Drain on SIGTERM before passing it on to the server's handler."""
+        # Signal handlers can only be set from the main thread, and without a
+        # server handler to hand over to there is nothing to delay
+        if threading.current_thread() is not threading.main_thread():
+            return
+        previous = signal.getsignal(signal.SIGTERM)
+        if not callable(previous):
+            return
+        loop = asyncio.get_running_loop()
+
+        def on_sigterm(sig, frame):
+            if self._handoff is not None:
+                logger.warning("Second SIGTERM, shutting down without waiting")
+                previous(sig, frame)
+                return
+            loop.call_soon_threadsafe(self._start_handoff, previous, sig)
+
+        self._previous_handler = previous
+        signal.signal(signal.SIGTERM, on_sigterm)
+
+    def _start_handoff(self, previous: Callable, sig: int) -> None:
+        async def handoff():
+            logger.info(f"SIGTERM received, draining for up to {self.timeout:.0f}s")
+            await self.drain(notice=self.notice)
+            previous(sig, None)
+
+        if self._handoff is None:
+            self._handoff = asyncio.ensure_future(handoff())
+
+    def uninstall(self) -> None:
+        """Give SIGTERM back to the handler that was there before ``install``."""
+        if self._previous_handler is None:
+            return
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, self._previous_handler)
+        self._previous_handler = None
+
+
+graceful_shutdown = GracefulShutdown(search_scheduler)
@@ -0,0 +1,218 @@
+"""Scraper worker: runs queued country scrapes on its own browser pool.
+
+Run one or more per node with ``python -m src.worker`` alongside API
+replicas started with ``DEPLOYMENT_MODE=api``. Workers and replicas meet
+through the Redis work queue (``REDIS_URL``).
+"""
+
+import asyncio
+import logging
+import signal
+import socket
+import uuid
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from src.config import settings
+from src.models.flight import ScrapeUnit, ScrapeUnitResult, WorkerStatus
+from src.scraper.browser import browser_pool
+from src.scraper.flights import search_flights_from_country, search_many_from_country
+from src.workqueue import SCRAPE_OUTCOMES, SEARCH_ID, RedisWorkQueue
+
+logger = logging.getLogger(__name__)
+
+
+class ScrapeWorker:
+    """
+    Pulls scrape units from a work queue and sends back their flights.
+
+    Each search's outcome goes back with the flights rather than being
+    recorded here, so circuit breakers, price history and the country
+    stats built on it live with the API replicas.
+
+    Runs ``concurrency`` consumers, so at most that many country scrapes
+    use this process's browser pool at once. Units whose ``expires_at``
+    passed while queued are answered with an error instead of scraped.
+    Consumers stop taking units while the pool is under memory pressure,
+    leaving them to other workers, and for good once draining. The worker
+    reports that pressure through the queue every ``status_interval``
+    seconds and whenever it changes, so API replicas can hold back new
+    searches too.
+    """
+
+    def __init__(
+        self,
+        queue,
+        concurrency: Optional[int] = None,
+        worker_id: Optional[str] = None,
+        poll_interval: float = 1.0,
+        status_interval: Optional[float] = None,
+    ):
+        self.queue = queue
+        self.concurrency = concurrency or settings.worker_concurrency or (
+            settings.browser_pool_size * settings.browser_max_contexts
+        )
+        self.worker_id = worker_id or f"{socket.gethostname()}-{uuid.uuid4().hex[:8]}"
+        self.poll_interval = poll_interval
+        self.status_interval = (
+            status_interval if status_interval is not None
+            else settings.worker_status_interval
+        )
+        self._tasks: List[asyncio.Task] = []
+        self._reporter: Optional[asyncio.Task] = None
+        self._status_changed: Optional[asyncio.Event] = None
+        self._draining = False
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        self._draining = False
+        self._tasks = [
+            asyncio.create_task(self._consume(i)) for i in range(self.concurrency)
+        ]
+        if self.status_interval > 0:
+            self._status_changed = asyncio.Event()
+            browser_pool.pressure_callbacks.append(self._on_pressure)
+            self._reporter = asyncio.create_task(self._report_status())
+        logger.info(f"Scrape worker {self.worker_id} started with {self.concurrency} consumers")
+
+    async def stop(self) -> None:
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self._reporter is not None:
+            browser_pool.pressure_callbacks.remove(self._on_pressure)
+            self._reporter.cancel()
+            await asyncio.gather(self._reporter, return_exceptions=True)
+            self._reporter = None
+            try:
+                await self.queue.clear_status(self.worker_id)
+            except Exception as e:
+                logger.debug(f"Failed to clear status of worker {self.worker_id}: {e}")
+
+    def _on_pressure(self, pressure: bool) -> None:
+        self._status_changed.set()
+
+    async def _report_status(self) -> None:
+        while True:
+            self._status_changed.clear()
+            status = WorkerStatus(
+                worker_id=self.worker_id, memory_pressure=browser_pool.memory_pressure
+            )
+            try:
+                await self.queue.report_status(status)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Failed to report status of worker {self.worker_id}: {e}")
+            try:
+                await asyncio.wait_for(self._status_changed.wait(), self.status_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def drain(self, timeout: float) -> bool:
+        """
+        Stop taking units and let the ones being scraped finish, then stop.
+
+        Args:
+            timeout: Longest to wait for running units, in seconds
+
+        Returns:
+            True if every running unit finished in time
+        """
+        self._draining = True
+        drained = True
+        if self._tasks:
+            _, pending = await asyncio.wait(self._tasks, timeout=timeout)
+            drained = not pending
+            if pending:
+                logger.warning(f"Worker {self.worker_id} stopping with {len(pending)} units unfinished")
+        await self.stop()
+        return drained
+
+    async def run_unit(self, unit: ScrapeUnit) -> ScrapeUnitResult:
+        """
+        Scrape one unit.
+
+        Args:
+            unit: Searches to run from one country
+
+        Returns:
+            Flights and outcomes per label, or the error that stopped the unit
+        """
+        result = ScrapeUnitResult(
+            unit_id=unit.unit_id,
+            search_id=unit.search_id,
+            country_code=unit.country_code,
+            worker_id=self.worker_id,
+        )
+        if unit.expires_at <= datetime.now(timezone.utc):
+            result.error = "expired before a worker was free"
+            return result
+
+        SEARCH_ID.set(unit.search_id)
+        SCRAPE_OUTCOMES.set(result.outcomes)
+        try:
+            if len(unit.requests) == 1:
+                [(label, request)] = unit.requests.items()
+                result.results = {
+                    label: await search_flights_from_country(request, unit.country_code)
+                }
+            else:
+                result.results = await search_many_from_country(unit.requests, unit.country_code)
+        except Exception as e:
+            logger.error(f"Unit {unit.unit_id} of search {unit.search_id} failed: {e}")
+            result.error = str(e)
+        return result
+
+    async def _consume(self, index: int) -> None:
+        while not self._draining:
+            await browser_pool.wait_for_memory()
+            try:
+                unit = await self.queue.pop_unit(self.poll_interval)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Failed to read scrape units: {e}")
+                await asyncio.sleep(self.poll_interval)
+                continue
+            if unit is None:
+                continue
+            result = await self.run_unit(unit)
+            try:
+                await self.queue.push_result(unit.reply_to, result)
+            except Exception as e:
+                logger.error(f"Failed to return unit {unit.unit_id} to {unit.reply_to}: {e}")
+
+
+async def main() -> None:
+    """Run a worker until SIGINT or SIGTERM, then drain its running units."""
+    logging.basicConfig(
+        level=logging.DEBUG if settings.debug else logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    if not settings.redis_url:
+        raise SystemExit("REDIS_URL must be set to run a standalone scrape worker")
+    queue = RedisWorkQueue(settings.redis_url)
+
+    stopping = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stopping.set)
+
+    await browser_pool.start()
+    worker = ScrapeWorker(queue)
+    worker.start()
+    try:
+        await stopping.wait()
+        logger.info(f"Draining worker for up to {settings.drain_timeout:.0f}s")
+        await worker.drain(settings.drain_timeout)
+    finally:
+        await worker.stop()
+        await browser_pool.stop()
+        await queue.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
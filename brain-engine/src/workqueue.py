@@ -0,0 +1,332 @@
+"""Work queue between API replicas and scraper workers."""
+
+import asyncio
+import contextvars
+import logging
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from src.config import settings
+from src.pressure import WorkerPressure
+from src.models.flight import (
+    FlightSearchRequest,
+    ScrapeOutcome,
+    ScrapeUnit,
+    ScrapeUnitResult,
+    WorkerStatus,
+)
+
+logger = logging.getLogger(__name__)
+
+UNIT_QUEUE_KEY = "brain-engine:scrape-units"
+REPLY_KEY_PREFIX = "brain-engine:scrape-results:"
+WORKER_STATUS_PREFIX = "brain-engine:worker-status:"
+
+# Search the current scrape belongs to, so its units can be correlated
+SEARCH_ID: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "search_id", default=None
+)
+
+# Set while a worker runs a unit: searches report their outcomes here, to be
+# sent back and recorded by the API replica, instead of recording them
+SCRAPE_OUTCOMES: contextvars.ContextVar[Optional[List[ScrapeOutcome]]] = contextvars.ContextVar(
+    "scrape_outcomes", default=None
+)
+
+
+class InProcessWorkQueue(WorkerPressure):
+    """Units and results passed through asyncio queues in this process."""
+
+    in_process = True
+
+    def __init__(self):
+        super().__init__()
+        self._units: Optional["asyncio.Queue[ScrapeUnit]"] = None
+        self._replies: Dict[str, "asyncio.Queue[ScrapeUnitResult]"] = {}
+
+    def _unit_queue(self) -> "asyncio.Queue[ScrapeUnit]":
+        if self._units is None:
+            self._units = asyncio.Queue()
+        return self._units
+
+    def _reply_queue(self, reply_to: str) -> "asyncio.Queue[ScrapeUnitResult]":
+        return self._replies.setdefault(reply_to, asyncio.Queue())
+
+    async def push_unit(self, unit: ScrapeUnit) -> None:
+        self._unit_queue().put_nowait(unit)
+
+    async def pop_unit(self, timeout: float) -> Optional[ScrapeUnit]:
+        try:
+            return await asyncio.wait_for(self._unit_queue().get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def push_result(self, reply_to: str, result: ScrapeUnitResult) -> None:
+        self._reply_queue(reply_to).put_nowait(result)
+
+    async def pop_result(self, reply_to: str, timeout: float) -> Optional[ScrapeUnitResult]:
+        try:
+            return await asyncio.wait_for(self._reply_queue(reply_to).get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def pending(self) -> int:
+        return self._units.qsize() if self._units is not None else 0
+
+    async def report_status(self, status: WorkerStatus) -> None:
+        # The worker shares this process's browser pool and its pressure
+        pass
+
+    async def clear_status(self, worker_id: str) -> None:
+        pass
+
+    async def start(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        self._units = None
+        self._replies.clear()
+
+
+class RedisWorkQueue(WorkerPressure):
+    """
+    Units in a shared Redis list, results in one list per API replica.
+
+    Any worker on any node can take a unit; its result goes back to the
+    replica that queued it. Workers also keep a status key with a TTL
+    fresh; once started, the replica polls those and reports memory
+    pressure while every live worker is under it, since until then the
+    others keep taking units.
+    """
+
+    in_process = False
+
+    def __init__(
+        self,
+        url: str,
+        result_ttl: int = 300,
+        status_interval: Optional[float] = None,
+    ):
+        super().__init__()
+        self.url = url
+        self.result_ttl = result_ttl
+        self.status_interval = (
+            status_interval if status_interval is not None
+            else settings.worker_status_interval
+        )
+        self._client = None
+        self._watcher: Optional[asyncio.Task] = None
+
+    def _get_client(self):
+        if self._client is None:
+            import redis.asyncio as redis
+
+            self._client = redis.from_url(self.url)
+        return self._client
+
+    async def start(self) -> None:
+        """Start watching worker status."""
+        if self._watcher is None and self.status_interval > 0:
+            self._watcher = asyncio.create_task(self._watch_workers())
+
+    async def push_unit(self, unit: ScrapeUnit) -> None:
+        await self._get_client().lpush(UNIT_QUEUE_KEY, unit.model_dump_json())
+
+    async def pop_unit(self, timeout: float) -> Optional[ScrapeUnit]:
+        item = await self._get_client().brpop([UNIT_QUEUE_KEY], timeout=max(int(timeout), 1))
+        return ScrapeUnit.model_validate_json(item[1]) if item else None
+
+    async def push_result(self, reply_to: str, result: ScrapeUnitResult) -> None:
+        key = f"{REPLY_KEY_PREFIX}{reply_to}"
+        client = self._get_client()
+        await client.rpush(key, result.model_dump_json())
+        # A replica that went away should not leave results behind forever
+        await client.expire(key, self.result_ttl)
+
+    async def pop_result(self, reply_to: str, timeout: float) -> Optional[ScrapeUnitResult]:
+        item = await self._get_client().blpop(
+            [f"{REPLY_KEY_PREFIX}{reply_to}"], timeout=max(int(timeout), 1)
+        )
+        return ScrapeUnitResult.model_validate_json(item[1]) if item else None
+
+    async def report_status(self, status: WorkerStatus) -> None:
+        # Missing a few reports (a dead worker) lets the key expire
+        await self._get_client().set(
+            f"{WORKER_STATUS_PREFIX}{status.worker_id}",
+            status.model_dump_json(),
+            ex=max(int(self.status_interval * 3), 1),
+        )
+
+    async def clear_status(self, worker_id: str) -> None:
+        await self._get_client().delete(f"{WORKER_STATUS_PREFIX}{worker_id}")
+
+    async def worker_statuses(self) -> List[WorkerStatus]:
+        """Latest status of every live worker."""
+        client = self._get_client()
+        keys = [key async for key in client.scan_iter(match=f"{WORKER_STATUS_PREFIX}*")]
+        if not keys:
+            return []
+        values = await client.mget(keys)
+        return [WorkerStatus.model_validate_json(value) for value in values if value]
+
+    async def _watch_workers(self) -> None:
+        while True:
+            try:
+                statuses = await self.worker_statuses()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Failed to read worker status: {e}")
+            else:
+                self._set_pressure(
+                    bool(statuses) and all(status.memory_pressure for status in statuses)
+                )
+            await asyncio.sleep(self.status_interval)
+
+    async def close(self) -> None:
+        if self._watcher is not None:
+            self._watcher.cancel()
+            await asyncio.gather(self._watcher, return_exceptions=True)
+            self._watcher = None
+        self._set_pressure(False)
+        if self._client is not None:
+            try:
+                await self._client.aclose()
+            except Exception as e:
+                logger.debug(f"Error closing Redis client: {e}")
+            self._client = None
+
+
+class WorkQueueClient:
+    """
+    Sends country scrapes to scraper workers and waits for their results.
+
+    Each client has its own reply channel; a single listener task matches
+    incoming results to waiting callers by unit ID. The listener starts
+    lazily on first use and restarts if the event loop changes. A unit's
+    result is waited for until ``result_margin`` seconds past its expiry,
+    so a worker that dies mid-unit cannot leave the caller hanging.
+    """
+
+    def __init__(
+        self,
+        queue,
+        reply_to: Optional[str] = None,
+        poll_interval: float = 1.0,
+        result_margin: float = 30.0,
+    ):
+        self.queue = queue
+        self.reply_to = reply_to or uuid.uuid4().hex
+        self.poll_interval = poll_interval
+        self.result_margin = result_margin
+        self._waiting: Dict[str, "asyncio.Future[ScrapeUnitResult]"] = {}
+        self._listener: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._listener is not None and self._loop is loop and not self._listener.done():
+            return
+        self._loop = loop
+        self._waiting.clear()
+        self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+        for future in self._waiting.values():
+            future.cancel()
+        self._waiting.clear()
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                result = await self.queue.pop_result(self.reply_to, self.poll_interval)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Failed to read scrape results: {e}")
+                await asyncio.sleep(self.poll_interval)
+                continue
+            if result is None:
+                continue
+            future = self._waiting.pop(result.unit_id, None)
+            if future is not None and not future.done():
+                future.set_result(result)
+
+    async def submit(
+        self,
+        requests: Dict[str, FlightSearchRequest],
+        country_code: str,
+        timeout: Optional[float] = None,
+    ) -> ScrapeUnitResult:
+        """
+        Have a worker run searches from one country and wait for its result.
+
+        Args:
+            requests: Searches keyed by label, run in one browser context
+            country_code: Country to search from
+            timeout: Seconds after which an unstarted unit is dropped by
+                workers (default: the first request's deadline)
+
+        Returns:
+            The worker's result, including per-search outcomes to record
+
+        Raises:
+            asyncio.TimeoutError: If no result arrived ``result_margin``
+                seconds after the unit expired
+        """
+        self.start()
+        if timeout is None:
+            deadline_ms = next(iter(requests.values())).deadline_ms
+            timeout = (deadline_ms or settings.search_deadline_ms) / 1000
+        unit = ScrapeUnit(
+            unit_id=uuid.uuid4().hex,
+            search_id=SEARCH_ID.get() or uuid.uuid4().hex,
+            reply_to=self.reply_to,
+            country_code=country_code,
+            requests=requests,
+            expires_at=datetime.now(timezone.utc) + timedelta(seconds=timeout),
+        )
+        future = asyncio.get_running_loop().create_future()
+        self._waiting[unit.unit_id] = future
+        try:
+            await self.queue.push_unit(unit)
+            return await asyncio.wait_for(future, timeout + self.result_margin)
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"No result for unit {unit.unit_id} ({country_code}) "
+                f"after {timeout + self.result_margin:.0f}s"
+            )
+            raise
+        finally:
+            self._waiting.pop(unit.unit_id, None)
+
+
+def scrapes_remotely() -> bool:
+    """Whether country scrapes go through the work queue instead of running here."""
+    return settings.deployment_mode == "api" or settings.scraper_processes > 0
+
+
+def create_work_queue():
+    """
+    Queue country scrapes are sent through.
+    
+    Redis when API replicas share workers (``DEPLOYMENT_MODE=api`` with
+    ``REDIS_URL``), local scraper subprocesses when ``SCRAPER_PROCESSES``
+    is set, otherwise in-process.
+    """
+    if settings.deployment_mode == "api" and settings.redis_url:
+        return RedisWorkQueue(settings.redis_url)
+    if settings.scraper_processes > 0:
+        from src.shards import ProcessShardQueue
+
+        return ProcessShardQueue()
+    return InProcessWorkQueue()
+
+
+work_queue = create_work_queue()
+scrape_client = WorkQueueClient(work_queue)
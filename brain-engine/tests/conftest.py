@@ -0,0 +1,77 @@
+"""Shared pytest configuration for Brain Engine tests."""
+
+import os
+import sys
+
+# Settings are instantiated at import time, so required env vars must be
+# present before any ``src`` module is imported by a test module.
+os.environ.setdefault('API_KEY', 'test-api-key')
+os.environ.setdefault('OXYLABS_USERNAME', 'test-user')
+os.environ.setdefault('OXYLABS_PASSWORD', 'test-pass')
+os.environ.setdefault('HISTORY_DB_PATH', ':memory:')
+os.environ.setdefault('CONSENT_STATE_DIR', '')
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import pytest
+
+
+def make_request(**overrides):
+    """Build a FlightSearchRequest for LAX -> NRT, with API-style overrides."""
+    from src.models.flight import FlightSearchRequest
+
+    body = {"origin": "LAX", "destination": "NRT", "departureDate": "2030-01-01"}
+    body.update(overrides)
+    return FlightSearchRequest(**body)
+
+
+def make_flight(country_code: str, price: float) -> dict:
+    """Build one scraped flight as returned from a country."""
+    return {
+        "id": f"flight-{country_code}",
+        "airline": "Test Airlines",
+        "price": price,
+        "currency": "USD",
+        "departure_time": "10:00 AM",
+        "arrival_time": "3:00 PM",
+        "duration": "11h 00m",
+        "stops": 0,
+        "searched_from_country": country_code,
+    }
+
+
+@pytest.fixture(autouse=True)
+def clear_baseline_cache():
+    """Keep US baseline prices cached by one test out of the next."""
+    from src.cache.baseline import baseline_cache
+
+    baseline_cache.cache.local.clear()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def reset_circuit_breakers():
+    """Keep countries failed by one test from being skipped in the next."""
+    from src.circuit import circuit_breakers
+
+    circuit_breakers.reset()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def reset_graceful_shutdown():
+    """Accept searches again after a test whose app shut down and drained."""
+    from src.shutdown import graceful_shutdown
+
+    graceful_shutdown.reset()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def clear_route_stats():
+    """Keep country stats cached for one test's routes out of the next."""
+    from src.routing import country_selector
+
+    country_selector.clear()
+    yield
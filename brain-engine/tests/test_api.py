@@ -12,6 +12,8 @@ import os
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
+from tests.conftest import make_flight
+
 
 # Mock settings before importing app
 @pytest.fixture(autouse=True)
@@ -59,6 +61,43 @@ class TestHealthEndpoints:
         data = response.json()
         assert data["status"] == "healthy"
         assert data["service"] == "brain-engine"
+    
+    def test_health_reports_open_circuits(self, client):
+        """Test /health lists per-country circuit breaker state."""
+        from src.circuit import circuit_breakers
+        
+        for _ in range(circuit_breakers.get("th").min_calls):
+            circuit_breakers.record("th", False, 1.0)
+        
+        countries = client.get("/health").json()["countries"]
+        assert countries["th"]["state"] == "open"
+        assert countries["th"]["failure_rate"] == 1.0
+        assert countries["th"]["retry_in_seconds"] > 0
+    
+    def test_health_reports_draining_with_503(self, client):
+        """Test /health turns 503 while shutting down so load balancers stop routing."""
+        from src.scheduler import search_scheduler
+        
+        search_scheduler.set_draining(True)
+        response = client.get("/health")
+        
+        assert response.status_code == 503
+        assert response.json()["status"] == "draining"
+
+
+class TestMetricsEndpoint:
+    """Tests for the Prometheus metrics endpoint."""
+    
+    def test_metrics_exposes_search_metrics(self, client):
+        """Test /metrics serves hot-path metrics in Prometheus text format."""
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        body = response.text
+        assert "brain_engine_searches_in_flight" in body
+        assert "brain_engine_browsers_open" in body
+        assert "brain_engine_coalesced_searches_total" in body
+        assert "brain_engine_page_goto_seconds" in body
 
 
 class TestSearchEndpoint:
@@ -178,6 +217,240 @@ class TestSearchEndpoint:
         # For now, we're testing the validation and auth logic
 
 
+class TestSearchStreamEndpoint:
+    """Tests for the streaming search endpoint."""
+    
+    def test_stream_requires_auth(self, client):
+        """Test that the streaming endpoint requires authorization."""
+        response = client.post(
+            "/api/search/stream",
+            json={
+                "origin": "LAX",
+                "destination": "NRT",
+                "departureDate": "2025-03-15"
+            }
+        )
+        assert response.status_code == 401
+    
+    def test_stream_emits_country_events_then_complete(self, client):
+        """Test that each country is streamed before the final aggregate."""
+        import json
+        
+        prices = {"in": 450.0, "us": 600.0}
+        
+        async def fake_search(request, country_code):
+            if country_code not in prices:
+                return []
+            return [make_flight(country_code, prices[country_code])]
+        
+        with patch('src.scraper.flights.search_flights_from_country', fake_search):
+            response = client.post(
+                "/api/search/stream",
+                json={
+                    "origin": "LAX",
+                    "destination": "HND",
+                    "departureDate": "2025-05-01"
+                },
+                headers={"Authorization": "Bearer test-api-key"}
+            )
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        events = [json.loads(line) for line in response.text.splitlines()]
+        
+        country_events = [e for e in events if e["event"] == "country"]
+        assert len(country_events) == 6
+        assert {e["data"]["country_code"] for e in country_events} >= {"in", "us"}
+        
+        assert events[-1]["event"] == "complete"
+        result = events[-1]["data"]
+        assert result["best_price"] == 450.0
+        assert result["baseline_price"] == 600.0
+        assert result["best_savings_percent"] == 25.0
+    
+    @pytest.mark.asyncio
+    async def test_stream_releases_slots_when_never_sent(self):
+        """Test that admitted slots come back when the client is gone before the stream starts."""
+        from src.main import TicketStreamingResponse, stream_search_events
+        from src.models.flight import FlightSearchRequest
+        from src.scheduler import search_scheduler
+        
+        request = FlightSearchRequest(origin="LAX", destination="NRT", departureDate="2031-03-15")
+        ticket = await search_scheduler.acquire(6, timeout=1)
+        response = TicketStreamingResponse(
+            stream_search_events(request, ["in", "us"], ticket=ticket), ticket=ticket
+        )
+        
+        async def receive():
+            return {"type": "http.disconnect"}
+        
+        async def send(message):
+            raise OSError("client went away")
+        
+        with pytest.raises(Exception):
+            await response({"type": "http", "asgi": {"spec_version": "2.4"}}, receive, send)
+        
+        assert search_scheduler.in_use == 0
+
+
+class TestDateRangeEndpoint:
+    """Tests for the date-range search endpoint."""
+    
+    def test_date_range_requires_flex_days(self, client):
+        """Test that a plain search body is rejected."""
+        response = client.post(
+            "/api/search/dates",
+            json={
+                "origin": "LAX",
+                "destination": "NRT",
+                "departureDate": "2031-03-15"
+            },
+            headers={"Authorization": "Bearer test-api-key"}
+        )
+        assert response.status_code == 400
+    
+    def test_date_range_returns_cheapest_date(self, client):
+        """Test that the best price per date and the cheapest date are returned."""
+        def day_results(price):
+            return {
+                "flights": [make_flight("India", price)],
+                "total_results": 1,
+                "countries_searched": ["India"],
+                "best_price": price,
+                "baseline_price": None,
+                "best_savings_percent": None,
+                "search_time_seconds": 1.0,
+                "countries_timed_out": [],
+            }
+        
+        async def fake_search(requests, timeout=None):
+            return {
+                "searches": {
+                    "2031-04-01": day_results(700.0),
+                    "2031-04-02": day_results(450.0),
+                },
+                "countries_timed_out": [],
+                "search_time_seconds": 2.0,
+            }
+        
+        with patch('src.main.search_many_multi_country', fake_search):
+            response = client.post(
+                "/api/search/dates",
+                json={
+                    "origin": "LAX",
+                    "destination": "NRT",
+                    "departureDate": "2031-04-01",
+                    "flexDays": 2
+                },
+                headers={"Authorization": "Bearer test-api-key"}
+            )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert [row["date"] for row in data["dates"]] == ["2031-04-01", "2031-04-02"]
+        assert data["cheapest_date"] == "2031-04-02"
+        assert data["best_price"] == 450.0
+        assert data["dates"][1]["best_country"] == "India"
+        assert data["dates"][1]["prices_by_country"] == {"India": 450.0}
+
+
+class TestBatchSearchEndpoint:
+    """Tests for the batch search endpoint."""
+    
+    def test_batch_returns_one_response_per_search(self, client):
+        """Test that duplicate routes are scraped once and results keep request order."""
+        scraped = []
+        
+        async def fake_search(requests, timeout=None, per_context=None):
+            scraped.extend(r.origin for r in requests.values())
+            return {
+                "searches": {
+                    key: {
+                        "flights": [],
+                        "total_results": 0,
+                        "countries_searched": ["India"],
+                        "best_price": None,
+                        "baseline_price": None,
+                        "best_savings_percent": None,
+                        "search_time_seconds": 1.0,
+                        "countries_timed_out": [],
+                    }
+                    for key in requests
+                },
+                "countries_timed_out": [],
+                "search_time_seconds": 1.0,
+            }
+        
+        searches = [
+            {"origin": origin, "destination": "LHR", "departureDate": "2031-06-01"}
+            for origin in ["JFK", "BOS", "JFK"]
+        ]
+        with patch('src.main.search_many_multi_country', fake_search):
+            response = client.post(
+                "/api/search/batch",
+                json={"searches": searches},
+                headers={"Authorization": "Bearer test-api-key"}
+            )
+        
+        assert response.status_code == 200
+        assert sorted(scraped) == ["BOS", "JFK"]
+        assert len(response.json()["results"]) == 3
+    
+    def test_large_batch_fits_admitted_contexts(self, client):
+        """Test that a batch needing more contexts than page slots packs more searches per context."""
+        from src.scheduler import search_scheduler
+        
+        planned = {}
+        
+        async def fake_search(requests, timeout=None, per_context=None):
+            planned.update(per_context=per_context, timeout=timeout)
+            return {
+                "searches": {key: {
+                    "flights": [],
+                    "total_results": 0,
+                    "countries_searched": [],
+                    "best_price": None,
+                    "baseline_price": None,
+                    "best_savings_percent": None,
+                    "search_time_seconds": 1.0,
+                    "countries_timed_out": [],
+                } for key in requests},
+                "countries_timed_out": [],
+                "search_time_seconds": 1.0,
+            }
+        
+        searches = [
+            {"origin": f"A{i:02d}", "destination": "LHR", "departureDate": "2031-06-01"}
+            for i in range(10)
+        ]
+        with patch('src.main.search_many_multi_country', fake_search), \
+                patch.object(search_scheduler, 'max_pages', 12):
+            response = client.post(
+                "/api/search/batch",
+                json={"searches": searches},
+                headers={"Authorization": "Bearer test-api-key"}
+            )
+        
+        assert response.status_code == 200
+        # 12 slots over 6 countries: 2 contexts per country, 5 searches each
+        assert planned["per_context"] == 5
+        assert planned["timeout"] > 4 * 45
+    
+    def test_batch_rejects_date_ranges(self, client):
+        """Test that flexible-date searches are rejected in a batch."""
+        response = client.post(
+            "/api/search/batch",
+            json={"searches": [{
+                "origin": "JFK",
+                "destination": "LHR",
+                "departureDate": "2031-06-01",
+                "flexDays": 3
+            }]},
+            headers={"Authorization": "Bearer test-api-key"}
+        )
+        assert response.status_code == 422
+
+
 class TestRequestValidation:
     """Tests for request validation."""
     
@@ -193,6 +466,20 @@ class TestRequestValidation:
         )
         assert response.status_code == 422
     
+    def test_search_rejects_flex_days(self, client):
+        """Test that date-range fields are rejected outside the date-range endpoint."""
+        response = client.post(
+            "/api/search",
+            json={
+                "origin": "LAX",
+                "destination": "NRT",
+                "departureDate": "2031-03-15",
+                "flexDays": 3
+            },
+            headers={"Authorization": "Bearer test-api-key"}
+        )
+        assert response.status_code == 422
+    
     def test_passengers_range(self, client):
         """Test that passengers must be between 1 and 9."""
         # Test too many passengers
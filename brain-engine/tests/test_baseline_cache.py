@@ -0,0 +1,149 @@
+"""Tests for the separately cached US baseline."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+
+from src.cache.baseline import BaselineCache, baseline_cache
+from src.circuit import SEARCH_OUTCOMES, CircuitState, SearchOutcomes, circuit_breakers
+from src.scheduler import PageScheduler
+from src.scraper.flights import search_flights_multi_country, search_many_multi_country
+from tests.conftest import make_flight, make_request
+
+
+class TestBaselineCache:
+    """Tests for baseline reuse and background refresh."""
+
+    @pytest.mark.asyncio
+    async def test_second_search_reuses_baseline(self):
+        searched = []
+
+        async def fake_search(request, country_code):
+            searched.append(country_code)
+            return [make_flight(country_code, 800.0 if country_code == "us" else 500.0)]
+
+        with patch('src.scraper.flights.search_flights_from_country', fake_search):
+            first = await search_flights_multi_country(make_request())
+            searched.clear()
+            second = await search_flights_multi_country(make_request())
+
+        assert "us" not in searched
+        assert len(searched) == 5
+        assert second["baseline_price"] == first["baseline_price"] == 800.0
+        assert second["best_savings_percent"] == first["best_savings_percent"]
+
+    @pytest.mark.asyncio
+    async def test_empty_baseline_is_not_cached(self):
+        request = make_request()
+        await baseline_cache.set(request, [])
+        assert await baseline_cache.get(request) is None
+
+    @pytest.mark.asyncio
+    async def test_old_baseline_is_served_and_refreshed_once(self):
+        cache = BaselineCache(ttl=3600, refresh_after=60)
+        request = make_request()
+        await cache.set(request, [make_flight("us", 800.0)])
+        entry = cache.cache.local.get(cache.key(request))
+        entry.stored_at = datetime.now(timezone.utc) - timedelta(seconds=120)
+
+        calls = 0
+
+        async def refresh():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0)
+            return [make_flight("us", 750.0)]
+
+        served = await asyncio.gather(*(cache.get(request, refresh=refresh) for _ in range(3)))
+        assert all(flights[0]["price"] == 800.0 for flights in served)
+
+        await asyncio.sleep(0.01)
+        assert calls == 1
+        refreshed = await cache.get(request, refresh=refresh)
+        assert refreshed[0]["price"] == 750.0
+        await cache.close()
+
+    @pytest.mark.asyncio
+    async def test_refresh_does_not_report_into_the_triggering_search(self):
+        cache = BaselineCache(ttl=3600, refresh_after=60)
+        request = make_request()
+        await cache.set(request, [make_flight("us", 800.0)])
+        entry = cache.cache.local.get(cache.key(request))
+        entry.stored_at = datetime.now(timezone.utc) - timedelta(seconds=120)
+        for _ in range(circuit_breakers.get("us").min_calls):
+            circuit_breakers.record("us", False, 1.0)
+        circuit_breakers.get("us").opened_at -= circuit_breakers.get("us").open_seconds
+        seen = []
+
+        async def refresh():
+            # The probe of a half-open circuit, finishing after the search
+            assert circuit_breakers.allow("us")
+            await asyncio.sleep(0.01)
+            seen.append(SEARCH_OUTCOMES.get())
+            circuit_breakers.record_results("us", False, 1.0)
+            return []
+
+        outcomes = SearchOutcomes(circuit_breakers)
+        token = SEARCH_OUTCOMES.set(outcomes)
+        try:
+            await cache.get(request, refresh=refresh)
+        finally:
+            SEARCH_OUTCOMES.reset(token)
+        outcomes.settle()
+        await asyncio.sleep(0.05)
+
+        assert seen == [None]
+        assert circuit_breakers.get("us").state == CircuitState.CLOSED
+        await cache.close()
+
+    @pytest.mark.asyncio
+    async def test_refresh_skipped_without_idle_page_slot(self):
+        scheduler = PageScheduler(max_pages=12, max_queue=2)
+        cache = BaselineCache(ttl=3600, refresh_after=60, scheduler=scheduler)
+        request = make_request()
+        await cache.set(request, [make_flight("us", 800.0)])
+        entry = cache.cache.local.get(cache.key(request))
+        entry.stored_at = datetime.now(timezone.utc) - timedelta(seconds=120)
+        ticket = await scheduler.acquire(12, timeout=1)
+
+        calls = 0
+
+        async def refresh():
+            nonlocal calls
+            calls += 1
+            return [make_flight("us", 750.0)]
+
+        served = await cache.get(request, refresh=refresh)
+        await asyncio.sleep(0.01)
+        assert served[0]["price"] == 800.0
+        assert calls == 0
+
+        scheduler.release(ticket)
+        await cache.get(request, refresh=refresh)
+        await asyncio.sleep(0.01)
+        assert calls == 1
+        assert scheduler.in_use == 0
+        await cache.close()
+
+    @pytest.mark.asyncio
+    async def test_batch_only_scrapes_missing_baselines(self):
+        cached = make_request(origin="SFO")
+        await baseline_cache.set(cached, [make_flight("us", 900.0)])
+        requests = {"SFO": cached, "SEA": make_request(origin="SEA")}
+        scraped = []
+
+        async def fake_many(group, country_code, results=None):
+            for label, request in group.items():
+                scraped.append((country_code, label))
+                results[label] = [make_flight(country_code, 500.0)]
+            return results
+
+        with patch('src.scraper.flights.search_many_from_country', fake_many):
+            results = await search_many_multi_country(requests)
+
+        assert [label for code, label in scraped if code == "us"] == ["SEA"]
+        assert results["searches"]["SFO"]["baseline_price"] == 900.0
+        assert results["searches"]["SEA"]["baseline_price"] == 500.0
+        assert await baseline_cache.get(requests["SEA"]) is not None
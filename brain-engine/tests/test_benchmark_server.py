@@ -0,0 +1,56 @@
+"""Tests keeping the benchmark's fake Google Flights server in sync with the scraper."""
+
+import os
+from unittest.mock import patch
+
+import httpx
+
+from benchmarks.fake_server import FakeGoogleFlightsServer, ITINERARIES
+from benchmarks.run import configure_environment, parse_args, percentile
+from src.scraper.payload import RESULTS_RPC_PATH, parse_results_payload
+
+
+class TestFakeServer:
+    """Tests for the local benchmark server."""
+
+    def test_serves_results_page_with_scraper_selectors(self):
+        with FakeGoogleFlightsServer() as server:
+            response = httpx.get(f"{server.flights_url}?q=flights")
+
+        assert response.status_code == 200
+        assert response.text.count('class="pIav2d"') == len(ITINERARIES)
+        assert 'class="YMlIz"' in response.text
+
+    def test_payload_parses_and_varies_by_locale(self):
+        with FakeGoogleFlightsServer() as server:
+            host, port = server.address
+            url = f"http://{host}:{port}/_/data/{RESULTS_RPC_PATH}"
+            us = httpx.post(url, headers={"Accept-Language": "en-US"}).text
+            india = httpx.post(url, headers={"Accept-Language": "en-IN,en;q=0.9"}).text
+
+        us_rows = parse_results_payload(us, max_results=20)
+        india_rows = parse_results_payload(india, max_results=20)
+        assert len(us_rows) == len(ITINERARIES)
+        assert float(india_rows[0]["price"]) < float(us_rows[0]["price"])
+
+    def test_injected_failures(self):
+        with FakeGoogleFlightsServer(failure_rate=1.0) as server:
+            response = httpx.get(server.flights_url)
+            assert response.status_code == 503
+            assert server.requests_served == 1
+
+
+def test_percentile_interpolates():
+    assert percentile([1.0, 2.0, 3.0, 4.0], 50) == 2.5
+    assert percentile([5.0], 99) == 5.0
+    assert percentile([], 50) == 0.0
+
+
+def test_benchmark_keeps_history_and_consent_out_of_data_dir():
+    with patch.dict(os.environ), FakeGoogleFlightsServer() as server:
+        configure_environment(server, parse_args([]))
+        history = os.environ["HISTORY_DB_PATH"]
+        consent = os.environ["CONSENT_STATE_DIR"]
+
+    assert not history.startswith("data")
+    assert os.path.dirname(history) == os.path.dirname(consent)
@@ -0,0 +1,209 @@
+"""Tests for the shared browser pool."""
+
+import asyncio
+import time
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.scraper.browser import BrowserPool, chromium_rss_bytes
+
+
+def make_fake_playwright():
+    """Build a fake Playwright driver whose launches return mock browsers."""
+    launched = []
+
+    async def launch(**kwargs):
+        browser = MagicMock()
+        browser.is_connected.return_value = True
+        browser.close = AsyncMock()
+        browser.new_context = AsyncMock(side_effect=lambda **kw: make_fake_context())
+        launched.append(browser)
+        return browser
+
+    playwright = MagicMock()
+    playwright.chromium.launch = AsyncMock(side_effect=launch)
+    playwright.stop = AsyncMock()
+    return playwright, launched
+
+
+def make_fake_context():
+    context = MagicMock()
+    context.add_init_script = AsyncMock()
+    context.route = AsyncMock()
+    context.close = AsyncMock()
+    context.new_page = AsyncMock(return_value=MagicMock())
+    return context
+
+
+@pytest.fixture
+def fake_playwright():
+    playwright, launched = make_fake_playwright()
+    starter = MagicMock()
+    starter.start = AsyncMock(return_value=playwright)
+    with patch('src.scraper.browser.async_playwright', return_value=starter):
+        yield playwright, launched
+
+
+class TestBrowserPool:
+    """Tests for browser reuse, capacity and recycling."""
+
+    @pytest.mark.asyncio
+    async def test_reuses_browser_across_contexts(self, fake_playwright):
+        """Sequential checkouts share one browser instead of relaunching."""
+        _, launched = fake_playwright
+        pool = BrowserPool(size=2, max_contexts_per_browser=4, max_uses=50)
+
+        for country in ["in", "mx", "br"]:
+            async with pool.context(country):
+                pass
+
+        assert len(launched) == 1
+        await pool.stop()
+
+    @pytest.mark.asyncio
+    async def test_respects_context_capacity(self, fake_playwright):
+        """Checkouts beyond size * max_contexts wait for a free slot."""
+        _, launched = fake_playwright
+        pool = BrowserPool(size=1, max_contexts_per_browser=2, max_uses=50)
+        in_use = 0
+        peak = 0
+
+        async def use(country):
+            nonlocal in_use, peak
+            async with pool.context(country):
+                in_use += 1
+                peak = max(peak, in_use)
+                await asyncio.sleep(0.01)
+                in_use -= 1
+
+        await asyncio.gather(*(use(c) for c in ["in", "mx", "br", "th", "tr"]))
+
+        assert peak == 2
+        assert len(launched) == 1
+        await pool.stop()
+
+    @pytest.mark.asyncio
+    async def test_recycles_browser_after_max_uses(self, fake_playwright):
+        """A browser is closed and replaced once it hits max_uses."""
+        _, launched = fake_playwright
+        pool = BrowserPool(size=1, max_contexts_per_browser=2, max_uses=2)
+
+        for country in ["in", "mx", "br"]:
+            async with pool.context(country):
+                pass
+
+        assert len(launched) == 2
+        launched[0].close.assert_awaited()
+        await pool.stop()
+
+    @pytest.mark.asyncio
+    async def test_memory_check_drains_oversized_browser(self, fake_playwright):
+        """A browser over its memory limit takes no new contexts and closes when idle."""
+        _, launched = fake_playwright
+        pool = BrowserPool(
+            size=1, max_contexts_per_browser=2, max_uses=50,
+            max_rss_mb=100, memory_check_interval=0,
+        )
+
+        with patch('src.scraper.browser.browser_rss_bytes',
+                   AsyncMock(return_value=200 * 1024 * 1024)), \
+             patch('src.scraper.browser.chromium_rss_bytes', return_value=0):
+            async with pool.context("in"):
+                await pool.check_memory()
+                launched[0].close.assert_not_awaited()
+                async with pool.context("mx"):
+                    assert len(launched) == 2
+
+        launched[0].close.assert_awaited()
+        await pool.stop()
+
+    @pytest.mark.asyncio
+    async def test_memory_check_recycles_old_idle_browser(self, fake_playwright):
+        _, launched = fake_playwright
+        pool = BrowserPool(size=1, max_uses=50, max_age=60, memory_check_interval=0)
+        async with pool.context("in"):
+            pass
+        pool._browsers[0].launched_at -= 120
+
+        with patch('src.scraper.browser.chromium_rss_bytes', return_value=0):
+            await pool.check_memory()
+
+        launched[0].close.assert_awaited()
+        assert pool._browsers == []
+        await pool.stop()
+
+    @pytest.mark.asyncio
+    async def test_checkout_during_memory_check_closes_retired_browser(self, fake_playwright):
+        """A browser retired by the check but dropped by a checkout is still closed."""
+        _, launched = fake_playwright
+        pool = BrowserPool(size=1, max_uses=50, max_age=60, memory_check_interval=0)
+        async with pool.context("in"):
+            pass
+        pool._browsers[0].launched_at -= 120
+
+        def slow_rss():
+            time.sleep(0.2)
+            return 0
+
+        with patch('src.scraper.browser.chromium_rss_bytes', slow_rss):
+            check = asyncio.create_task(pool.check_memory())
+            await asyncio.sleep(0.05)
+            async with pool.context("mx"):
+                pass
+            await check
+
+        assert len(launched) == 2
+        await pool.stop()
+        launched[0].close.assert_awaited_once()
+
+    def test_chromium_memory_counts_only_own_descendants(self):
+        processes = {
+            10: (1, "python"),
+            11: (10, "chrome"),
+            12: (11, "chrome"),
+            13: (10, "node"),
+            20: (1, "chrome"),
+        }
+        with patch('src.scraper.browser.read_process_table', return_value=processes), \
+             patch('src.scraper.browser.read_rss_bytes', side_effect=lambda pid: pid):
+            assert chromium_rss_bytes(10) == 11 + 12
+
+    @pytest.mark.asyncio
+    async def test_memory_pressure_pauses_until_it_clears(self, fake_playwright):
+        """Over the total cap, callbacks hear about pressure and waiters block."""
+        pool = BrowserPool(size=1, max_uses=50, max_total_rss_mb=100, memory_check_interval=0)
+        pressure = []
+        pool.pressure_callbacks.append(pressure.append)
+        await pool.start()
+
+        with patch('src.scraper.browser.chromium_rss_bytes', return_value=200 * 1024 * 1024):
+            await pool.check_memory()
+        waiter = asyncio.create_task(pool.wait_for_memory())
+        await asyncio.sleep(0.01)
+        assert not waiter.done()
+
+        with patch('src.scraper.browser.chromium_rss_bytes', return_value=50 * 1024 * 1024):
+            await pool.check_memory()
+        await asyncio.wait_for(waiter, 1)
+
+        assert pressure == [True, False]
+        await pool.stop()
+
+
+class TestResourceBlocking:
+    """Tests for the request routing policy on scraping contexts."""
+
+    def test_blocks_heavy_resource_types(self):
+        from src.scraper.browser import should_block_request
+
+        assert should_block_request("image", "https://www.gstatic.com/logo.png")
+        assert should_block_request("font", "https://fonts.gstatic.com/a.woff2")
+        assert not should_block_request("script", "https://www.gstatic.com/app.js")
+        assert not should_block_request("document", "https://www.google.com/travel/flights")
+
+    def test_blocks_tracking_hosts_and_subdomains(self):
+        from src.scraper.browser import should_block_request
+
+        assert should_block_request("script", "https://www.google-analytics.com/analytics.js")
+        assert should_block_request("xhr", "https://stats.g.doubleclick.net/collect")
+        assert not should_block_request("xhr", "https://notdoubleclick.net/x")
@@ -0,0 +1,178 @@
+"""Tests for per-country circuit breakers."""
+
+from contextlib import asynccontextmanager
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.cache.search_cache import SearchCache
+from src.circuit import CircuitBreaker, CircuitState, SearchOutcomes, circuit_breakers
+from src.scraper.flights import search_flights_from_country, search_flights_multi_country
+from tests.conftest import make_flight, make_request
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_breaker(clock, **overrides):
+    options = dict(
+        window=60, min_calls=4, failure_threshold=0.5, open_seconds=30,
+        slow_call_seconds=10, clock=clock,
+    )
+    options.update(overrides)
+    return CircuitBreaker("th", **options)
+
+
+class TestCircuitBreaker:
+    """Tests for opening, probing and closing a country's circuit."""
+
+    def test_opens_once_failure_rate_crosses_threshold(self):
+        breaker = make_breaker(FakeClock())
+        for ok in (True, False, True):
+            breaker.record(ok, 1.0)
+        assert breaker.state == CircuitState.CLOSED
+
+        breaker.record(False, 1.0)
+        assert breaker.state == CircuitState.OPEN
+        assert breaker.allow() is False
+
+    def test_slow_searches_count_as_failures(self):
+        breaker = make_breaker(FakeClock())
+        for _ in range(4):
+            breaker.record(True, 12.0)
+        assert breaker.state == CircuitState.OPEN
+
+    def test_old_failures_leave_the_window(self):
+        clock = FakeClock()
+        breaker = make_breaker(clock)
+        for _ in range(3):
+            breaker.record(False, 1.0)
+        clock.now += 61
+        breaker.record(False, 1.0)
+        assert breaker.state == CircuitState.CLOSED
+        assert breaker.failure_rate() == 1.0
+        assert breaker.snapshot()["calls"] == 1
+
+    def test_half_open_allows_a_single_probe(self):
+        clock = FakeClock()
+        breaker = make_breaker(clock)
+        for _ in range(4):
+            breaker.record(False, 1.0)
+
+        clock.now += 31
+        assert breaker.allow() is True
+        assert breaker.state == CircuitState.HALF_OPEN
+        assert breaker.allow() is False
+
+        breaker.record(True, 1.0)
+        assert breaker.state == CircuitState.CLOSED
+        assert breaker.allow() is True
+
+    def test_failed_probe_reopens(self):
+        clock = FakeClock()
+        breaker = make_breaker(clock)
+        for _ in range(4):
+            breaker.record(False, 1.0)
+
+        clock.now += 31
+        assert breaker.allow() is True
+        breaker.record(False, 1.0)
+        assert breaker.state == CircuitState.OPEN
+        assert breaker.snapshot()["retry_in_seconds"] == 30
+
+
+class TestCountrySearchCircuit:
+    """Tests for skipping broken countries during a search."""
+
+    @pytest.mark.asyncio
+    async def test_open_country_is_skipped_without_a_browser(self):
+        opened = []
+
+        @asynccontextmanager
+        async def fake_context(country_code):
+            opened.append(country_code)
+            yield MagicMock(), MagicMock(), MagicMock()
+
+        async def fake_scrape(page, request, country_code):
+            raise RuntimeError("blocked")
+
+        request = make_request()
+        min_calls = circuit_breakers.get("tr").min_calls
+        with patch('src.scraper.flights.create_browser_context', fake_context), \
+                patch('src.scraper.flights.scrape_flights', fake_scrape):
+            for _ in range(min_calls + 2):
+                assert await search_flights_from_country(request, "tr") == []
+
+        assert len(opened) == min_calls
+        assert circuit_breakers.get("tr").state == CircuitState.OPEN
+
+    @pytest.mark.asyncio
+    async def test_route_empty_everywhere_does_not_trip_circuits(self):
+        @asynccontextmanager
+        async def fake_context(country_code):
+            yield MagicMock(), MagicMock(), MagicMock()
+
+        async def fake_scrape(page, request, country_code):
+            return []
+
+        min_calls = circuit_breakers.get("tr").min_calls
+        with patch('src.scraper.flights.create_browser_context', fake_context), \
+                patch('src.scraper.flights.scrape_flights', fake_scrape), \
+                patch('src.scraper.flights.get_search_countries', return_value=["tr", "us"]):
+            for _ in range(min_calls + 1):
+                await search_flights_multi_country(make_request())
+
+        assert circuit_breakers.get("tr").state == CircuitState.CLOSED
+        assert circuit_breakers.get("tr").failure_rate() == 0.0
+
+    @pytest.mark.asyncio
+    async def test_empty_country_fails_when_others_found_flights(self):
+        @asynccontextmanager
+        async def fake_context(country_code):
+            yield MagicMock(), MagicMock(), MagicMock()
+
+        async def fake_scrape(page, request, country_code):
+            return [make_flight(country_code, 500.0)] if country_code == "us" else []
+
+        with patch('src.scraper.flights.create_browser_context', fake_context), \
+                patch('src.scraper.flights.scrape_flights', fake_scrape), \
+                patch('src.scraper.flights.get_search_countries', return_value=["tr", "us"]):
+            await search_flights_multi_country(make_request())
+
+        assert circuit_breakers.get("tr").failure_rate() == 1.0
+        assert circuit_breakers.get("us").failure_rate() == 0.0
+
+    @pytest.mark.asyncio
+    async def test_skipped_country_is_reported_and_not_cached(self):
+        @asynccontextmanager
+        async def fake_context(country_code):
+            yield MagicMock(), MagicMock(), MagicMock()
+
+        async def fake_scrape(page, request, country_code):
+            return [make_flight(country_code, 500.0)]
+
+        for _ in range(circuit_breakers.get("tr").min_calls):
+            circuit_breakers.record("tr", False, 1.0)
+
+        with patch('src.scraper.flights.create_browser_context', fake_context), \
+                patch('src.scraper.flights.scrape_flights', fake_scrape), \
+                patch('src.scraper.flights.get_search_countries', return_value=["tr", "th", "us"]):
+            results = await search_flights_multi_country(make_request())
+
+        assert results["countries_skipped"] == ["Turkey"]
+        assert results["countries_timed_out"] == []
+        assert await SearchCache(ttl=60).set("key", results) is None
+
+    def test_empty_result_after_settle_is_recorded_at_once(self):
+        outcomes = SearchOutcomes(circuit_breakers)
+        outcomes.found("search")
+        outcomes.settle()
+
+        outcomes.defer_empty("tr", "search", 1.0)
+
+        assert circuit_breakers.get("tr").failure_rate() == 1.0
@@ -0,0 +1,126 @@
+"""Tests for saved consent state."""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.models.flight import FlightSearchRequest
+from src.scraper.consent import ConsentStateStore
+from src.scraper.flights import scrape_flights
+
+STATE = {"cookies": [{"name": "SOCS", "value": "abc", "domain": ".google.com"}], "origins": []}
+
+
+def make_page(url="https://www.google.com/travel/flights", consent_button=None):
+    page = MagicMock()
+    page.url = url
+    page.goto = AsyncMock()
+    page.wait_for_timeout = AsyncMock()
+    page.query_selector = AsyncMock(return_value=consent_button)
+    page.context.storage_state = AsyncMock(return_value=STATE)
+    return page
+
+
+def make_button():
+    button = MagicMock()
+    button.click = AsyncMock()
+    return button
+
+
+class TestConsentStateStore:
+    """Tests for saving, loading and expiring consent state."""
+
+    @pytest.mark.asyncio
+    async def test_state_survives_restart(self, tmp_path):
+        await ConsentStateStore(directory=str(tmp_path), ttl=60, enabled=True).save("in", STATE)
+
+        restarted = ConsentStateStore(directory=str(tmp_path), ttl=60, enabled=True)
+        assert restarted.cached("in") is None
+        assert await restarted.get("in") == STATE
+        assert restarted.cached("in") == STATE
+
+    @pytest.mark.asyncio
+    async def test_expired_state_is_ignored(self, tmp_path):
+        store = ConsentStateStore(directory=str(tmp_path), ttl=60, enabled=True)
+        await store.save("in", STATE)
+        with patch("src.scraper.consent.time.time", return_value=time.time() + 61):
+            assert await store.get("in") is None
+
+    @pytest.mark.asyncio
+    async def test_invalidate_removes_file(self, tmp_path):
+        store = ConsentStateStore(directory=str(tmp_path), ttl=60, enabled=True)
+        await store.save("in", STATE)
+        await store.invalidate("in")
+
+        assert not (tmp_path / "in.json").exists()
+        assert await ConsentStateStore(directory=str(tmp_path), ttl=60, enabled=True).get("in") is None
+
+
+    @pytest.mark.asyncio
+    async def test_concurrent_saves_from_processes_do_not_collide(self, tmp_path):
+        stores = [ConsentStateStore(directory=str(tmp_path), ttl=60, enabled=True) for _ in range(8)]
+        await asyncio.gather(*(store.save("in", STATE) for store in stores))
+
+        assert [path.name for path in tmp_path.iterdir()] == ["in.json"]
+        assert await ConsentStateStore(directory=str(tmp_path), ttl=60, enabled=True).get("in") == STATE
+
+
+class TestScrapeWithConsentState:
+    """Tests for skipping and refreshing consent handling during a scrape."""
+
+    @pytest.fixture
+    def store(self):
+        store = ConsentStateStore(directory="", ttl=60, enabled=True)
+        with patch("src.scraper.flights.consent_states", store):
+            yield store
+
+    @pytest.fixture
+    def request_(self):
+        return FlightSearchRequest(origin="LAX", destination="NRT", departureDate="2030-01-01")
+
+    @pytest.mark.asyncio
+    async def test_first_consent_is_saved(self, store, request_):
+        button = make_button()
+        page = make_page(consent_button=button)
+        with patch("src.scraper.flights.extract_flights_from_page", AsyncMock(return_value=[{"price": 1}])):
+            await scrape_flights(page, request_, "in")
+
+        button.click.assert_awaited_once()
+        assert store.cached("in") == STATE
+
+    @pytest.mark.asyncio
+    async def test_saved_state_skips_consent_check(self, store, request_):
+        await store.save("in", STATE)
+        page = make_page()
+        with patch("src.scraper.flights.extract_flights_from_page", AsyncMock(return_value=[{"price": 1}])):
+            flights = await scrape_flights(page, request_, "in")
+
+        assert flights == [{"price": 1}]
+        page.query_selector.assert_not_awaited()
+        page.wait_for_timeout.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_reappearing_wall_replaces_saved_state(self, store, request_):
+        await store.save("in", {"cookies": [], "origins": []})
+        button = make_button()
+        page = make_page(url="https://consent.google.com/ml?continue=x", consent_button=button)
+        with patch("src.scraper.flights.extract_flights_from_page", AsyncMock(return_value=[{"price": 1}])):
+            await scrape_flights(page, request_, "in")
+
+        button.click.assert_awaited_once()
+        assert store.cached("in") == STATE
+
+    @pytest.mark.asyncio
+    async def test_empty_results_recheck_consent(self, store, request_):
+        await store.save("in", STATE)
+        button = make_button()
+        page = make_page(consent_button=button)
+        extract = AsyncMock(side_effect=[[], [{"price": 1}]])
+        with patch("src.scraper.flights.extract_flights_from_page", extract):
+            flights = await scrape_flights(page, request_, "in")
+
+        assert flights == [{"price": 1}]
+        button.click.assert_awaited_once()
+        assert extract.await_count == 2
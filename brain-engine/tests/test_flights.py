@@ -0,0 +1,242 @@
+"""Tests for multi-country search orchestration."""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+from pydantic import ValidationError
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.history import price_history
+from src.models.flight import DateRangeSearchRequest, FlightSearchRequest
+from src.scraper.flights import (
+    build_flight,
+    expand_date_range,
+    extract_flights_by_evaluate,
+    search_flights_multi_country,
+    search_many_multi_country,
+)
+from tests.conftest import make_flight
+
+
+class TestSearchDeadline:
+    """Tests for the per-request latency budget."""
+
+    @pytest.mark.asyncio
+    async def test_slow_countries_are_dropped_at_deadline(self):
+        """Unfinished countries are cancelled and reported as timed out."""
+        cancelled = []
+
+        async def fake_search(request, country_code):
+            if country_code == "th":
+                try:
+                    await asyncio.sleep(30)
+                except asyncio.CancelledError:
+                    cancelled.append(country_code)
+                    raise
+            return [make_flight(country_code, 500.0 if country_code != "us" else 700.0)]
+
+        request = FlightSearchRequest(
+            origin="LAX", destination="BKK", departureDate="2025-03-15", deadlineMs=1000
+        )
+        with patch('src.scraper.flights.search_flights_from_country', fake_search):
+            results = await search_flights_multi_country(request)
+
+        assert results["countries_timed_out"] == ["Thailand"]
+        assert cancelled == ["th"]
+        assert "Thailand" not in results["countries_searched"]
+        assert results["baseline_price"] == 700.0
+        assert results["search_time_seconds"] < 5
+
+    @pytest.mark.asyncio
+    async def test_cut_off_country_is_recorded_as_finding_nothing(self):
+        """A country cancelled at the deadline still leaves a history sample."""
+        @asynccontextmanager
+        async def fake_context(country_code):
+            yield MagicMock(), MagicMock(), MagicMock()
+
+        async def fake_scrape(page, request, country_code):
+            if country_code == "th":
+                await asyncio.sleep(30)
+            return [make_flight(country_code, 500.0)]
+
+        request = FlightSearchRequest(
+            origin="LAX", destination="BKK", departureDate="2025-03-15", deadlineMs=1000
+        )
+        with patch('src.scraper.flights.create_browser_context', fake_context), \
+                patch('src.scraper.flights.scrape_flights', fake_scrape), \
+                patch.object(price_history, 'record', new_callable=AsyncMock) as record:
+            await search_flights_multi_country(request)
+
+        cut_off = [call for call in record.await_args_list if call.args[1] == "th"]
+        assert len(cut_off) == 1
+        assert cut_off[0].args[2] == []
+        assert cut_off[0].kwargs["search_seconds"] > 0
+
+    @pytest.mark.asyncio
+    async def test_no_timeouts_when_all_finish(self):
+        async def fake_search(request, country_code):
+            return [make_flight(country_code, 500.0)]
+
+        request = FlightSearchRequest(
+            origin="LAX", destination="BKK", departureDate="2025-03-15"
+        )
+        with patch('src.scraper.flights.search_flights_from_country', fake_search):
+            results = await search_flights_multi_country(request)
+
+        assert results["countries_timed_out"] == []
+        assert len(results["countries_searched"]) == 6
+
+
+class TestBatchExtraction:
+    """Tests for single round-trip DOM extraction."""
+
+    @pytest.mark.asyncio
+    async def test_rows_extracted_in_one_evaluate_call(self):
+        page = MagicMock()
+        page.evaluate = AsyncMock(return_value=[
+            {
+                "price": "$1,234",
+                "airline": "ANA ",
+                "departure_time": "10:30 AM",
+                "arrival_time": "3:45 PM+1",
+                "duration": "11 hr 15 min",
+                "stops": "1 stop",
+            },
+            {"price": None, "airline": "No Price Air"},
+        ])
+
+        flights = await extract_flights_by_evaluate(page, "India", 10)
+
+        page.evaluate.assert_awaited_once()
+        assert page.evaluate.await_args.args[1]["maxResults"] == 10
+        assert len(flights) == 1
+        assert flights[0]["price"] == 1234.0
+        assert flights[0]["airline"] == "ANA"
+        assert flights[0]["stops"] == 1
+        assert flights[0]["searched_from_country"] == "India"
+
+    def test_build_flight_defaults_missing_fields(self):
+        flight = build_flight({"price": "$500"}, "Mexico")
+
+        assert flight["airline"] == "Unknown Airline"
+        assert flight["stops"] == 0
+        assert flight["duration"] == ""
+
+
+class TestDateRangeSearch:
+    """Tests for flexible-date searches."""
+
+    def test_expand_departure_window(self):
+        request = DateRangeSearchRequest(
+            origin="LAX", destination="NRT", departureDate="2030-01-30", flexDays=3
+        )
+        date_requests = expand_date_range(request)
+
+        assert list(date_requests) == ["2030-01-30", "2030-01-31", "2030-02-01"]
+        assert date_requests["2030-02-01"].departure_date == "2030-02-01"
+        assert all(type(r) is FlightSearchRequest for r in date_requests.values())
+
+    def test_expand_return_window(self):
+        request = DateRangeSearchRequest(
+            origin="LAX", destination="NRT", departureDate="2030-01-01",
+            returnDate="2030-01-08", flexDays=2, flexDate="return"
+        )
+        date_requests = expand_date_range(request)
+
+        assert list(date_requests) == ["2030-01-08", "2030-01-09"]
+        assert date_requests["2030-01-09"].departure_date == "2030-01-01"
+
+    def test_return_window_requires_return_date(self):
+        with pytest.raises(ValidationError):
+            DateRangeSearchRequest(
+                origin="LAX", destination="NRT", departureDate="2030-01-01",
+                flexDays=2, flexDate="return"
+            )
+
+    def test_single_date_search_rejects_flex_days(self):
+        with pytest.raises(ValidationError):
+            FlightSearchRequest(
+                origin="LAX", destination="NRT", departureDate="2030-01-01", flexDays=2
+            )
+
+    @pytest.mark.asyncio
+    async def test_one_context_per_country_across_dates(self):
+        opened = []
+        searched = []
+
+        @asynccontextmanager
+        async def fake_context(country_code):
+            opened.append(country_code)
+            yield MagicMock(), MagicMock(), MagicMock()
+
+        async def fake_scrape(page, request, country_code):
+            searched.append((country_code, request.departure_date))
+            price = 400.0 if request.departure_date == "2030-01-02" else 600.0
+            return [make_flight(country_code, price)]
+
+        request = DateRangeSearchRequest(
+            origin="LAX", destination="NRT", departureDate="2030-01-01", flexDays=3
+        )
+        with patch('src.scraper.flights.create_browser_context', fake_context), \
+                patch('src.scraper.flights.scrape_flights', fake_scrape):
+            results = await search_many_multi_country(expand_date_range(request))
+
+        assert len(opened) == 6
+        assert len(set(opened)) == 6
+        assert len(searched) == 18
+        assert results["countries_timed_out"] == []
+        assert results["searches"]["2030-01-02"]["best_price"] == 400.0
+        assert results["searches"]["2030-01-03"]["best_price"] == 600.0
+
+    @pytest.mark.asyncio
+    async def test_deadline_keeps_completed_dates(self):
+        @asynccontextmanager
+        async def fake_context(country_code):
+            yield MagicMock(), MagicMock(), MagicMock()
+
+        async def fake_scrape(page, request, country_code):
+            if country_code == "th" and request.departure_date == "2030-01-02":
+                await asyncio.sleep(30)
+            return [make_flight(country_code, 500.0)]
+
+        request = DateRangeSearchRequest(
+            origin="LAX", destination="BKK", departureDate="2030-01-01", flexDays=2
+        )
+        with patch('src.scraper.flights.create_browser_context', fake_context), \
+                patch('src.scraper.flights.scrape_flights', fake_scrape):
+            results = await search_many_multi_country(
+                expand_date_range(request), timeout=0.5
+            )
+
+        assert results["countries_timed_out"] == ["Thailand"]
+        assert results["searches"]["2030-01-01"]["countries_timed_out"] == []
+        assert results["searches"]["2030-01-02"]["countries_timed_out"] == ["Thailand"]
+
+    @pytest.mark.asyncio
+    async def test_searches_split_across_contexts_per_country(self):
+        opened = []
+
+        @asynccontextmanager
+        async def fake_context(country_code):
+            opened.append(country_code)
+            yield MagicMock(), MagicMock(), MagicMock()
+
+        async def fake_scrape(page, request, country_code):
+            return [make_flight(country_code, 500.0)]
+
+        requests = {
+            origin: FlightSearchRequest(
+                origin=origin, destination="NRT", departureDate="2030-01-01"
+            )
+            for origin in ["LAX", "SFO", "SEA", "JFK", "ORD"]
+        }
+        with patch('src.scraper.flights.create_browser_context', fake_context), \
+                patch('src.scraper.flights.scrape_flights', fake_scrape):
+            results = await search_many_multi_country(requests, per_context=3)
+
+        # Five routes at three per context: two contexts per country
+        assert len(opened) == 12
+        assert all(opened.count(code) == 2 for code in set(opened))
+        assert set(results["searches"]) == set(requests)
+        assert all(len(r["countries_searched"]) == 6 for r in results["searches"].values())
@@ -0,0 +1,113 @@
+"""Tests for the local price history store."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.history import PriceHistory
+from tests.conftest import make_request
+
+
+def make_flights(*prices):
+    return [
+        {"airline": "Test Airlines", "price": price, "currency": "USD", "stops": 0}
+        for price in prices
+    ]
+
+
+class TestPriceHistory:
+    """Tests for recording and summarising prices."""
+
+    @pytest.mark.asyncio
+    async def test_summary_groups_by_day_and_country(self):
+        history = PriceHistory(path=":memory:", enabled=True)
+        day1 = datetime(2029, 12, 1, 10, tzinfo=timezone.utc)
+        day2 = day1 + timedelta(days=1)
+        await history.record(make_request(), "in", make_flights(500.0, 700.0, 600.0), day1)
+        await history.record(make_request(), "mx", make_flights(550.0), day1)
+        await history.record(make_request(), "in", make_flights(450.0, 650.0), day2)
+        await history.record(make_request(departureDate="2030-02-01"), "in", make_flights(300.0), day2)
+
+        rows = await history.price_summary("LAX", "NRT", departure_date="2030-01-01")
+
+        assert rows == [
+            {"country": "in", "day": "2029-12-01", "min_price": 500.0,
+             "median_price": 600.0, "observations": 3},
+            {"country": "mx", "day": "2029-12-01", "min_price": 550.0,
+             "median_price": 550.0, "observations": 1},
+            {"country": "in", "day": "2029-12-02", "min_price": 450.0,
+             "median_price": 550.0, "observations": 2},
+        ]
+        recent = await history.price_summary("LAX", "NRT", since=day2)
+        assert {row["min_price"] for row in recent} == {300.0}
+        history.close()
+
+    @pytest.mark.asyncio
+    async def test_country_stats_compare_against_same_day_baseline(self):
+        history = PriceHistory(path=":memory:", enabled=True)
+        day = datetime(2029, 12, 1, 10, tzinfo=timezone.utc)
+        await history.record(make_request(), "us", make_flights(1000.0), day, search_seconds=2.0)
+        await history.record(make_request(), "in", make_flights(800.0, 900.0), day, search_seconds=4.0)
+        await history.record(make_request(), "in", [], day + timedelta(days=1), search_seconds=6.0)
+        await history.record(make_request(), "mx", make_flights(700.0), day + timedelta(days=1))
+
+        stats = await history.country_stats("lax", "nrt")
+
+        assert stats["in"]["searches"] == 2
+        assert stats["in"]["success_rate"] == 0.5
+        assert stats["in"]["mean_seconds"] == 5.0
+        assert stats["in"]["mean_savings_percent"] == pytest.approx(20.0)
+        # No US price was scraped that day to compare against
+        assert stats["mx"]["mean_savings_percent"] is None
+        history.close()
+
+    @pytest.mark.asyncio
+    async def test_disabled_history_records_nothing(self):
+        history = PriceHistory(path=":memory:", enabled=False)
+        await history.record(make_request(), "in", make_flights(500.0))
+        assert await history.price_summary("LAX", "NRT") == []
+        history.close()
+
+    @pytest.mark.asyncio
+    async def test_prune_drops_old_observations(self):
+        history = PriceHistory(path=":memory:", enabled=True)
+        old = datetime.now(timezone.utc) - timedelta(days=40)
+        await history.record(make_request(), "in", make_flights(500.0), old)
+        await history.record(make_request(), "in", make_flights(450.0))
+
+        await history.prune(retention_days=30)
+
+        rows = await history.price_summary("LAX", "NRT")
+        assert [row["min_price"] for row in rows] == [450.0]
+        history.close()
+
+
+class TestHistoryEndpoint:
+    """Tests for /api/history."""
+
+    def test_history_requires_auth(self):
+        from src.main import app
+
+        response = TestClient(app).get("/api/history?origin=LAX&destination=NRT")
+        assert response.status_code == 401
+
+    def test_history_returns_points_with_country_names(self):
+        from src.main import app
+
+        history = PriceHistory(path=":memory:", enabled=True)
+        asyncio.run(history.record(make_request(), "in", make_flights(480.0)))
+        with patch('src.main.price_history', history):
+            response = TestClient(app).get(
+                "/api/history?origin=LAX&destination=NRT&departureDate=2030-01-01",
+                headers={"Authorization": "Bearer test-api-key"},
+            )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["origin"] == "LAX"
+        assert data["points"][0]["country"] == "India"
+        assert data["points"][0]["min_price"] == 480.0
+        history.close()
@@ -0,0 +1,286 @@
+"""Tests for asynchronous search jobs."""
+
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.jobs import (
+    InMemoryJobStore,
+    JobQueueFull,
+    JobRunnerDraining,
+    RedisJobStore,
+    SearchJobRunner,
+)
+from src.scheduler import AdmissionRejected
+from src.models.flight import (
+    CountrySearchResult,
+    FlightSearchResponse,
+    SearchJobStatus,
+)
+from tests.conftest import make_request
+
+
+def make_response(**overrides):
+    data = {
+        "flights": [],
+        "total_results": 0,
+        "countries_searched": ["United States"],
+        "search_time_seconds": 0.01,
+    }
+    data.update(overrides)
+    return FlightSearchResponse(**data)
+
+
+async def wait_for_status(runner, job_id, status, timeout=1.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = await runner.get(job_id)
+        if job is not None and job.status == status:
+            return job
+        await asyncio.sleep(0.005)
+    raise AssertionError(f"Job {job_id} never reached {status}")
+
+
+class TestSearchJobRunner:
+    """Tests for queueing, running and retaining jobs."""
+
+    @pytest.mark.asyncio
+    async def test_job_reports_partial_results_then_completes(self):
+        release = asyncio.Event()
+
+        async def execute(request, progress):
+            await progress(CountrySearchResult(
+                country_code="in", country="India", is_baseline=False, flights=[],
+            ))
+            await release.wait()
+            return make_response(best_price=450.0)
+
+        runner = SearchJobRunner(execute, workers=1, max_pending=5, ttl=60)
+        try:
+            job = await runner.submit(make_request())
+            assert job.status == SearchJobStatus.QUEUED
+
+            running = await wait_for_status(runner, job.job_id, SearchJobStatus.RUNNING)
+            while not running.partial_results:
+                await asyncio.sleep(0.005)
+                running = await runner.get(job.job_id)
+            assert [r.country_code for r in running.partial_results] == ["in"]
+            assert running.result is None
+
+            release.set()
+            done = await wait_for_status(runner, job.job_id, SearchJobStatus.COMPLETED)
+            assert done.result.best_price == 450.0
+        finally:
+            await runner.stop()
+
+    @pytest.mark.asyncio
+    async def test_failed_search_marks_job_failed(self):
+        async def execute(request, progress):
+            raise RuntimeError("boom")
+
+        runner = SearchJobRunner(execute, workers=1, max_pending=5, ttl=60)
+        try:
+            job = await runner.submit(make_request())
+            failed = await wait_for_status(runner, job.job_id, SearchJobStatus.FAILED)
+            assert "boom" in failed.error
+        finally:
+            await runner.stop()
+
+    @pytest.mark.asyncio
+    async def test_rejected_job_is_requeued_and_retried(self):
+        attempts = 0
+
+        async def execute(request, progress):
+            nonlocal attempts
+            attempts += 1
+            if attempts == 1:
+                raise AdmissionRejected(429, 1, "queue_full")
+            return make_response()
+
+        runner = SearchJobRunner(execute, workers=1, max_pending=5, ttl=60)
+        try:
+            job = await runner.submit(make_request())
+            await asyncio.sleep(0.1)
+            assert attempts == 1
+            assert (await runner.get(job.job_id)).status == SearchJobStatus.QUEUED
+            await wait_for_status(runner, job.job_id, SearchJobStatus.COMPLETED, timeout=3)
+            assert attempts == 2
+        finally:
+            await runner.stop()
+
+    @pytest.mark.asyncio
+    async def test_rejected_job_fails_once_retry_outlives_it(self):
+        async def execute(request, progress):
+            raise AdmissionRejected(503, 30, "queue_timeout")
+
+        runner = SearchJobRunner(execute, workers=1, max_pending=5, ttl=10)
+        try:
+            job = await runner.submit(make_request())
+            failed = await wait_for_status(runner, job.job_id, SearchJobStatus.FAILED)
+            assert "queue_timeout" in failed.error
+        finally:
+            await runner.stop()
+
+    @pytest.mark.asyncio
+    async def test_submit_rejects_when_queue_is_full(self):
+        release = asyncio.Event()
+
+        async def execute(request, progress):
+            await release.wait()
+            return make_response()
+
+        runner = SearchJobRunner(execute, workers=1, max_pending=1, ttl=60)
+        try:
+            first = await runner.submit(make_request())
+            await wait_for_status(runner, first.job_id, SearchJobStatus.RUNNING)
+            await runner.submit(make_request())
+            with pytest.raises(JobQueueFull):
+                await runner.submit(make_request())
+        finally:
+            release.set()
+            await runner.stop()
+
+    @pytest.mark.asyncio
+    async def test_expired_jobs_are_dropped(self):
+        store = InMemoryJobStore()
+
+        async def execute(request, progress):
+            return make_response()
+
+        runner = SearchJobRunner(execute, store=store, workers=1, max_pending=5, ttl=60)
+        try:
+            job = await runner.submit(make_request())
+            done = await wait_for_status(runner, job.job_id, SearchJobStatus.COMPLETED)
+            done.expires_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+            await store.save(done)
+            assert await runner.get(job.job_id) is None
+        finally:
+            await runner.stop()
+
+    @pytest.mark.asyncio
+    async def test_stop_marks_running_job_failed(self):
+        async def execute(request, progress):
+            await asyncio.Event().wait()
+
+        store = InMemoryJobStore()
+        runner = SearchJobRunner(execute, store=store, workers=1, max_pending=5, ttl=60)
+        job = await runner.submit(make_request())
+        await wait_for_status(runner, job.job_id, SearchJobStatus.RUNNING)
+
+        await runner.stop()
+
+        stopped = await store.get(job.job_id)
+        assert stopped.status == SearchJobStatus.FAILED
+        assert "shutdown" in stopped.error
+
+    @pytest.mark.asyncio
+    async def test_drain_finishes_running_job_and_fails_queued_ones(self):
+        release = asyncio.Event()
+
+        async def execute(request, progress):
+            await release.wait()
+            return make_response(best_price=450.0)
+
+        runner = SearchJobRunner(execute, workers=1, max_pending=5, ttl=60)
+        try:
+            running = await runner.submit(make_request())
+            queued = await runner.submit(make_request())
+            await wait_for_status(runner, running.job_id, SearchJobStatus.RUNNING)
+
+            drain = asyncio.create_task(runner.drain(timeout=5))
+            await wait_for_status(runner, queued.job_id, SearchJobStatus.FAILED)
+            with pytest.raises(JobRunnerDraining):
+                await runner.submit(make_request())
+            assert not drain.done()
+
+            release.set()
+            assert await drain
+            finished = await runner.get(running.job_id)
+            assert finished.status == SearchJobStatus.COMPLETED
+            assert "resubmit" in (await runner.get(queued.job_id)).error
+        finally:
+            await runner.stop()
+
+    @pytest.mark.asyncio
+    async def test_redis_outage_falls_back_to_local_jobs(self):
+        store = RedisJobStore("redis://localhost:6379")
+        store._client = AsyncMock()
+        store._client.set.side_effect = ConnectionError("redis down")
+        store._client.get.side_effect = ConnectionError("redis down")
+
+        async def execute(request, progress):
+            return make_response(best_price=450.0)
+
+        runner = SearchJobRunner(execute, store=store, workers=1, max_pending=5, ttl=60)
+        try:
+            job = await runner.submit(make_request())
+            done = await wait_for_status(runner, job.job_id, SearchJobStatus.COMPLETED)
+            assert done.result.best_price == 450.0
+        finally:
+            await runner.stop()
+
+
+class TestSearchJobEndpoints:
+    """Tests for the job submission and polling endpoints."""
+
+    @pytest.fixture
+    def client(self):
+        from src.main import app
+
+        with patch("src.main.browser_pool.start", AsyncMock()), \
+                patch("src.main.browser_pool.stop", AsyncMock()):
+            with TestClient(app) as client:
+                yield client
+
+    def test_jobs_require_auth(self, client):
+        response = client.post(
+            "/api/search/jobs",
+            json={"origin": "LAX", "destination": "NRT", "departureDate": "2030-02-01"},
+        )
+        assert response.status_code == 401
+
+    def test_unknown_job_returns_404(self, client):
+        response = client.get(
+            "/api/search/jobs/does-not-exist",
+            headers={"Authorization": "Bearer test-api-key"},
+        )
+        assert response.status_code == 404
+
+    def test_submit_and_poll_job(self, client):
+        async def fake_search(request, on_country=None, country_codes=None):
+            await on_country("in", [])
+            return {
+                "flights": [],
+                "total_results": 0,
+                "countries_searched": ["India"],
+                "best_price": None,
+                "baseline_price": None,
+                "best_savings_percent": None,
+                "search_time_seconds": 0.01,
+                "countries_timed_out": [],
+            }
+
+        headers = {"Authorization": "Bearer test-api-key"}
+        with patch("src.main.search_flights_multi_country", fake_search):
+            response = client.post(
+                "/api/search/jobs",
+                json={"origin": "SFO", "destination": "CDG", "departureDate": "2030-02-02"},
+                headers=headers,
+            )
+            assert response.status_code == 202
+            job_id = response.json()["job_id"]
+
+            deadline = time.monotonic() + 2
+            while time.monotonic() < deadline:
+                job = client.get(f"/api/search/jobs/{job_id}", headers=headers).json()
+                if job["status"] == "completed":
+                    break
+                time.sleep(0.01)
+
+        assert job["status"] == "completed"
+        assert [r["country_code"] for r in job["partial_results"]] == ["in"]
+        assert job["result"]["countries_searched"] == ["India"]
@@ -0,0 +1,70 @@
+"""Tests for parsing intercepted Google Flights result payloads."""
+
+import json
+
+from src.scraper.payload import (
+    format_clock,
+    format_duration,
+    is_results_response_url,
+    parse_results_payload,
+)
+
+
+def make_item(price, airlines, segments, dep_time, arr_time, arr_date, minutes):
+    itinerary = [
+        "NH", airlines, [[]] * segments, "LAX", [2025, 3, 15], dep_time,
+        "NRT", arr_date, arr_time, minutes,
+    ]
+    return [itinerary, [[None, price]]]
+
+
+def make_body(best, other):
+    payload = [None, None, [best], [other]]
+    envelope = [["wrb.fr", None, json.dumps(payload)]]
+    chunk = json.dumps(envelope)
+    return f")]}}'\n\n{len(chunk)}\n{chunk}\n25\n[[\"e\",4,null,null,123]]\n"
+
+
+class TestPayloadParsing:
+    """Tests for the results RPC parser."""
+
+    def test_parses_best_then_other_flights(self):
+        body = make_body(
+            [make_item(812, ["ANA"], 1, [10, 30], [15, 45], [2025, 3, 16], 675)],
+            [make_item(640, ["United", "ANA"], 2, [8, 5], [21, 0], [2025, 3, 16], 1015)],
+        )
+
+        rows = parse_results_payload(body, max_results=10)
+
+        assert rows[0] == {
+            "price": "812",
+            "airline": "ANA",
+            "departure_time": "10:30 AM",
+            "arrival_time": "3:45 PM+1",
+            "duration": "11 hr 15 min",
+            "stops": "Nonstop",
+        }
+        assert rows[1]["airline"] == "United, ANA"
+        assert rows[1]["stops"] == "1 stop"
+
+    def test_respects_max_results_and_skips_malformed(self):
+        good = make_item(500, ["ANA"], 1, [9, 0], [13, 0], [2025, 3, 15], 240)
+        body = make_body([["garbage"], good, good], [good])
+
+        assert len(parse_results_payload(body, max_results=2)) == 2
+
+    def test_unparseable_body_yields_nothing(self):
+        assert parse_results_payload("<html>consent</html>", 10) == []
+
+    def test_formatting_helpers(self):
+        assert format_clock([0, 5]) == "12:05 AM"
+        assert format_clock([12, None]) == "12:00 PM"
+        assert format_duration(45) == "45 min"
+        assert format_duration(120) == "2 hr"
+
+    def test_results_url_detection(self):
+        assert is_results_response_url(
+            "https://www.google.com/_/FlightsFrontendUi/data/travel.frontend.flights."
+            "FlightsFrontendService/GetShoppingResults?f.sid=1"
+        )
+        assert not is_results_response_url("https://www.google.com/travel/flights")
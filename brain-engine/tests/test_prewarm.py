@@ -0,0 +1,155 @@
+"""Tests for background cache prewarming."""
+
+import asyncio
+from datetime import date
+from unittest.mock import patch
+
+import pytest
+
+from src.prewarm import Prewarmer, RouteTracker, configured_requests
+from src.scheduler import PageScheduler
+from tests.conftest import make_request
+
+
+class TestRouteTracker:
+    """Tests for learning popular searches."""
+
+    def test_top_orders_by_request_count(self):
+        tracker = RouteTracker()
+        for _ in range(3):
+            tracker.record(make_request(origin="sfo"))
+        tracker.record(make_request())
+        tracker.record(make_request(origin="SFO", deadlineMs=5000))
+
+        top = tracker.top(5, today=date(2029, 1, 1))
+        assert [r.origin for r in top] == ["SFO", "LAX"]
+        assert top[0].deadline_ms is None
+
+    def test_departed_searches_are_dropped(self):
+        tracker = RouteTracker()
+        tracker.record(make_request(departureDate="2029-01-01"))
+        tracker.record(make_request(departureDate="2029-06-01"))
+
+        top = tracker.top(5, today=date(2029, 3, 1))
+        assert [r.departure_date for r in top] == ["2029-06-01"]
+        assert len(tracker) == 1
+
+    def test_least_requested_route_is_evicted(self):
+        tracker = RouteTracker(max_routes=2)
+        tracker.record(make_request(origin="SFO"))
+        tracker.record(make_request(origin="SFO"))
+        tracker.record(make_request(origin="SEA"))
+        tracker.record(make_request(origin="JFK"))
+
+        assert {r.origin for r in tracker.top(5, today=date(2029, 1, 1))} == {"SFO", "JFK"}
+
+
+class TestPrewarmer:
+    """Tests for prewarm cycles."""
+
+    def make_prewarmer(self, warm, is_fresh, origins, **kwargs):
+        tracker = RouteTracker()
+        for origin in origins:
+            tracker.record(make_request(origin=origin))
+        return Prewarmer(
+            warm=warm, is_fresh=is_fresh, tracker=tracker,
+            interval=60, top_n=10, min_gap=0, hours=[], **kwargs
+        )
+
+    @pytest.mark.asyncio
+    async def test_fresh_searches_are_skipped(self):
+        warmed = []
+
+        async def warm(request):
+            warmed.append(request.origin)
+            return "warmed"
+
+        async def is_fresh(request):
+            return request.origin == "SFO"
+
+        prewarmer = self.make_prewarmer(warm, is_fresh, ["SFO", "SEA"])
+        outcomes = await prewarmer.run_once()
+
+        assert warmed == ["SEA"]
+        assert outcomes == {"fresh": 1, "warmed": 1}
+
+    @pytest.mark.asyncio
+    async def test_cycle_stops_when_pages_are_busy(self):
+        calls = []
+
+        async def warm(request):
+            calls.append(request.origin)
+            return "busy"
+
+        async def is_fresh(request):
+            return False
+
+        prewarmer = self.make_prewarmer(warm, is_fresh, ["SFO", "SEA", "JFK"])
+        outcomes = await prewarmer.run_once()
+
+        assert len(calls) == 1
+        assert outcomes == {"busy": 1}
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_capped(self):
+        running = 0
+        peak = 0
+
+        async def warm(request):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return "warmed"
+
+        async def is_fresh(request):
+            return False
+
+        prewarmer = self.make_prewarmer(
+            warm, is_fresh, ["SFO", "SEA", "JFK", "BOS"], concurrency=2
+        )
+        outcomes = await prewarmer.run_once()
+
+        assert outcomes == {"warmed": 4}
+        assert peak == 2
+
+    def test_runs_only_in_configured_hours(self):
+        from datetime import datetime, timezone
+
+        prewarmer = Prewarmer(
+            warm=None, is_fresh=None, tracker=RouteTracker(), hours=[2, 3]
+        )
+        assert prewarmer.in_window(datetime(2030, 1, 1, 2, tzinfo=timezone.utc))
+        assert not prewarmer.in_window(datetime(2030, 1, 1, 12, tzinfo=timezone.utc))
+
+    def test_malformed_configured_route_is_skipped(self):
+        with patch('src.prewarm.settings.prewarm_routes', ["LAXNRT", "SFO-LHR"]), \
+                patch('src.prewarm.settings.prewarm_date_offsets', [7]):
+            requests = configured_requests(today=date(2030, 1, 1))
+
+        assert [(r.origin, r.destination) for r in requests] == [("SFO", "LHR")]
+
+
+class TestIdleSlotAcquisition:
+    """Tests for low-priority page slot acquisition."""
+
+    @pytest.mark.asyncio
+    async def test_try_acquire_leaves_reserve_for_live_searches(self):
+        scheduler = PageScheduler(max_pages=12, max_queue=2)
+        assert scheduler.try_acquire(6, reserve=6) is not None
+        assert scheduler.try_acquire(6, reserve=6) is None
+        assert scheduler.in_use == 6
+
+    @pytest.mark.asyncio
+    async def test_try_acquire_never_jumps_the_queue(self):
+        scheduler = PageScheduler(max_pages=6, max_queue=2)
+        first = await scheduler.acquire(4, timeout=1)
+        waiter = asyncio.create_task(scheduler.acquire(6, timeout=1))
+        await asyncio.sleep(0.01)
+
+        assert scheduler.queued == 1
+        assert scheduler.try_acquire(1) is None
+
+        scheduler.release(first)
+        scheduler.release(await waiter)
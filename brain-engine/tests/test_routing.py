@@ -0,0 +1,115 @@
+"""Tests for adaptive per-route country selection."""
+
+import random
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.history import PriceHistory
+from src.routing import CountrySelector
+from src.scraper.flights import select_search_countries
+from tests.conftest import make_request
+
+CANDIDATES = ["in", "mx", "br", "th", "tr"]
+
+
+async def seed(history, prices, searches=3):
+    """Record ``searches`` same-day scrapes per country at the given prices."""
+    now = datetime.now(timezone.utc)
+    for _ in range(searches):
+        for country, price in prices.items():
+            flights = [] if price is None else [{"airline": "Test", "price": price}]
+            await history.record(make_request(), country, flights, now, search_seconds=5.0)
+
+
+class TestCountrySelector:
+    """Tests for ranking countries by past savings."""
+
+    @pytest.mark.asyncio
+    async def test_keeps_top_savers_in_candidate_order(self):
+        history = PriceHistory(path=":memory:", enabled=True)
+        await seed(history, {
+            "us": 1000.0, "in": 700.0, "mx": 990.0, "br": 1200.0, "th": 800.0, "tr": None,
+        })
+        selector = CountrySelector(history, top_k=2, exploration_rate=0, min_samples=3)
+
+        assert await selector.select(make_request(), CANDIDATES) == ["in", "th"]
+        history.close()
+
+    @pytest.mark.asyncio
+    async def test_countries_without_enough_history_are_always_searched(self):
+        history = PriceHistory(path=":memory:", enabled=True)
+        await seed(history, {"us": 1000.0, "in": 700.0, "mx": 990.0, "br": 1200.0, "th": 800.0})
+        selector = CountrySelector(history, top_k=1, exploration_rate=0, min_samples=3)
+
+        assert await selector.select(make_request(), CANDIDATES) == ["in", "tr"]
+        history.close()
+
+    @pytest.mark.asyncio
+    async def test_route_stats_are_reused_within_ttl(self):
+        history = PriceHistory(path=":memory:", enabled=True)
+        await seed(history, {"us": 1000.0, "in": 700.0, "mx": 990.0})
+        selector = CountrySelector(history, top_k=1, exploration_rate=0, stats_ttl=60)
+
+        with patch.object(history, 'country_stats', wraps=history.country_stats) as scan:
+            await selector.select(make_request(), CANDIDATES)
+            await selector.select(make_request(), CANDIDATES)
+            await selector.select(make_request(destination="HND"), CANDIDATES)
+
+        assert scan.await_count == 2
+        history.close()
+
+    @pytest.mark.asyncio
+    async def test_exploration_adds_one_country_outside_the_top(self):
+        history = PriceHistory(path=":memory:", enabled=True)
+        await seed(history, {
+            "us": 1000.0, "in": 700.0, "mx": 990.0, "br": 1200.0, "th": 800.0, "tr": 950.0,
+        })
+        selector = CountrySelector(
+            history, top_k=2, exploration_rate=1.0, min_samples=3, rng=random.Random(1)
+        )
+
+        chosen = await selector.select(make_request(), CANDIDATES)
+        assert len(chosen) == 3
+        assert {"in", "th"} < set(chosen)
+        assert await selector.select(make_request(), CANDIDATES, explore=False) == ["in", "th"]
+        # A per-request rate overrides the selector's
+        assert await selector.select(
+            make_request(explorationRate=0), CANDIDATES
+        ) == ["in", "th"]
+        history.close()
+
+    @pytest.mark.asyncio
+    async def test_request_max_countries_overrides_top_k(self):
+        history = PriceHistory(path=":memory:", enabled=True)
+        await seed(history, {
+            "us": 1000.0, "in": 700.0, "mx": 990.0, "br": 1200.0, "th": 800.0, "tr": 950.0,
+        })
+        selector = CountrySelector(history, top_k=1, exploration_rate=0, min_samples=3)
+
+        assert await selector.select(
+            make_request(maxCountries=3), CANDIDATES
+        ) == ["in", "th", "tr"]
+        history.close()
+
+
+class TestSelectSearchCountries:
+    """Tests for when adaptive selection applies."""
+
+    @pytest.mark.asyncio
+    async def test_disabled_by_default(self):
+        with patch("src.scraper.flights.country_selector.select", AsyncMock()) as select:
+            codes = await select_search_countries(make_request())
+        select.assert_not_awaited()
+        assert codes[-1] == "us"
+        assert len(codes) == 6
+
+    @pytest.mark.asyncio
+    async def test_request_opt_in_keeps_baseline_last(self):
+        with patch(
+            "src.scraper.flights.country_selector.select",
+            AsyncMock(return_value=["in"]),
+        ):
+            codes = await select_search_countries(make_request(maxCountries=1))
+        assert codes == ["in", "us"]
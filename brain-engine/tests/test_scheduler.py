@@ -0,0 +1,125 @@
+"""Tests for scrape admission control."""
+
+import asyncio
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+
+from src.scheduler import AdmissionRejected, PageScheduler
+
+
+class TestPageScheduler:
+    """Tests for page slot accounting and load shedding."""
+
+    @pytest.mark.asyncio
+    async def test_grants_immediately_when_slots_free(self):
+        scheduler = PageScheduler(max_pages=12, max_queue=2)
+        async with scheduler.admit(6, timeout=1) as ticket:
+            assert scheduler.in_use == 6
+            assert ticket.waited < 0.1
+        assert scheduler.in_use == 0
+
+    @pytest.mark.asyncio
+    async def test_queued_search_starts_when_slots_return(self):
+        scheduler = PageScheduler(max_pages=6, max_queue=2)
+        first = await scheduler.acquire(6, timeout=1)
+        waiter = asyncio.create_task(scheduler.acquire(6, timeout=1))
+        await asyncio.sleep(0.01)
+
+        assert scheduler.queued == 1
+        scheduler.release(first)
+        second = await waiter
+
+        assert second.waited > 0
+        assert scheduler.in_use == 6
+
+    @pytest.mark.asyncio
+    async def test_rejects_with_429_when_queue_full(self):
+        scheduler = PageScheduler(max_pages=6, max_queue=0)
+        await scheduler.acquire(6, timeout=1)
+
+        with pytest.raises(AdmissionRejected) as exc:
+            await scheduler.acquire(6, timeout=1)
+
+        assert exc.value.status_code == 429
+        assert exc.value.retry_after >= 1
+
+    @pytest.mark.asyncio
+    async def test_rejects_with_503_when_wait_exceeds_deadline(self):
+        scheduler = PageScheduler(max_pages=6, max_queue=5)
+        ticket = await scheduler.acquire(6, timeout=1)
+        scheduler.release(ticket)
+        scheduler._avg_hold = 30.0
+        await scheduler.acquire(6, timeout=1)
+
+        with pytest.raises(AdmissionRejected) as exc:
+            await scheduler.acquire(6, timeout=10)
+
+        assert exc.value.status_code == 503
+        assert exc.value.retry_after == 30
+        assert scheduler.queued == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_leaves_queue(self):
+        scheduler = PageScheduler(max_pages=6, max_queue=2)
+        await scheduler.acquire(6, timeout=1)
+        waiter = asyncio.create_task(scheduler.acquire(6, timeout=5))
+        await asyncio.sleep(0.01)
+
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+
+        assert scheduler.queued == 0
+        assert scheduler.in_use == 6
+
+    @pytest.mark.asyncio
+    async def test_paused_scheduler_queues_until_resumed(self):
+        scheduler = PageScheduler(max_pages=6, max_queue=2)
+        scheduler.set_paused(True)
+        waiter = asyncio.create_task(scheduler.acquire(1, timeout=1))
+        await asyncio.sleep(0.01)
+
+        assert scheduler.queued == 1
+        assert scheduler.try_acquire(1) is None
+        scheduler.set_paused(False)
+        await waiter
+
+        assert scheduler.in_use == 1
+
+    @pytest.mark.asyncio
+    async def test_draining_rejects_new_searches_but_keeps_admitted_ones(self):
+        scheduler = PageScheduler(max_pages=6, max_queue=2)
+        first = await scheduler.acquire(6, timeout=1)
+        queued = asyncio.create_task(scheduler.acquire(6, timeout=1))
+        await asyncio.sleep(0.01)
+        scheduler.set_draining(True)
+
+        with pytest.raises(AdmissionRejected) as exc:
+            await scheduler.acquire(1, timeout=1)
+        assert exc.value.status_code == 503
+        assert exc.value.reason == "draining"
+
+        scheduler.release(first)
+        scheduler.release(await queued)
+        assert await scheduler.wait_idle(timeout=1)
+
+
+class TestSearchAdmission:
+    """Tests for overload responses on /api/search."""
+
+    def test_overloaded_search_gets_retry_after(self):
+        from src.main import app
+
+        client = TestClient(app)
+        full = PageScheduler(max_pages=6, max_queue=0)
+        full.in_use = 6
+
+        with patch('src.main.search_scheduler', full):
+            response = client.post(
+                "/api/search",
+                json={"origin": "BOS", "destination": "LIS", "departureDate": "2025-06-01"},
+                headers={"Authorization": "Bearer test-api-key"},
+            )
+
+        assert response.status_code == 429
+        assert int(response.headers["Retry-After"]) >= 1
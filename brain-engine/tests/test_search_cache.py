@@ -0,0 +1,181 @@
+"""Tests for the search result cache."""
+
+import asyncio
+import pytest
+from datetime import datetime, timedelta, timezone
+from fastapi.testclient import TestClient
+from unittest.mock import patch, AsyncMock
+
+from src.cache.search_cache import (
+    CacheEntry,
+    LRUCache,
+    SearchCache,
+    build_cache_key,
+)
+from tests.conftest import make_request
+
+
+SEARCH_RESULTS = {
+    "flights": [
+        {
+            "id": "test123",
+            "airline": "Test Airlines",
+            "price": 500.00,
+            "currency": "USD",
+            "departure_time": "10:00 AM",
+            "arrival_time": "3:00 PM",
+            "duration": "11h 00m",
+            "stops": 0,
+            "searched_from_country": "India",
+        }
+    ],
+    "total_results": 1,
+    "countries_searched": ["India"],
+    "best_price": 500.00,
+    "baseline_price": None,
+    "best_savings_percent": None,
+    "search_time_seconds": 5.0,
+}
+
+
+def make_entry(seconds: int) -> CacheEntry:
+    now = datetime.now(timezone.utc)
+    return CacheEntry(
+        results=SEARCH_RESULTS,
+        stored_at=now,
+        expires_at=now + timedelta(seconds=seconds),
+    )
+
+
+class TestCacheKey:
+    """Tests for cache key normalization."""
+
+    def test_key_ignores_case_and_country_order(self):
+        a = build_cache_key(make_request(origin="lax"), ["mx", "in"])
+        b = build_cache_key(make_request(origin="LAX"), ["in", "mx"])
+        assert a == b
+
+    def test_key_varies_with_country_set(self):
+        a = build_cache_key(make_request(), ["in", "mx"])
+        b = build_cache_key(make_request(), ["in"])
+        assert a != b
+
+    def test_key_varies_with_return_date(self):
+        a = build_cache_key(make_request(), ["in"])
+        b = build_cache_key(make_request(returnDate="2025-03-22"), ["in"])
+        assert a != b
+
+
+class TestLRUCache:
+    """Tests for the in-process tier."""
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(max_entries=2)
+        cache.set("a", make_entry(60))
+        cache.set("b", make_entry(60))
+        cache.get("a")
+        cache.set("c", make_entry(60))
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+        assert len(cache) == 2
+
+    def test_expired_entries_are_misses(self):
+        cache = LRUCache(max_entries=2)
+        cache.set("a", make_entry(-1))
+        assert cache.get("a") is None
+
+
+class TestSearchCache:
+    """Tests for the two-tier cache facade."""
+
+    @pytest.mark.asyncio
+    async def test_round_trip_returns_copy(self):
+        cache = SearchCache(ttl=60, max_entries=10)
+        expires_at = await cache.set("k", SEARCH_RESULTS)
+        entry = await cache.get("k")
+        assert entry.expires_at == expires_at
+        entry.results["flights"].clear()
+        assert (await cache.get("k")).results["flights"]
+
+    @pytest.mark.asyncio
+    async def test_empty_results_not_cached(self):
+        cache = SearchCache(ttl=60, max_entries=10)
+        assert await cache.set("k", {**SEARCH_RESULTS, "flights": []}) is None
+        assert await cache.get("k") is None
+
+
+class TestSearchEndpointCaching:
+    """Tests for cache behaviour on /api/search."""
+
+    def test_second_search_is_served_from_cache(self):
+        from src.main import app, search_cache
+
+        search_cache.local.clear()
+        client = TestClient(app)
+        body = {"origin": "SFO", "destination": "CDG", "departureDate": "2025-04-01"}
+        headers = {"Authorization": "Bearer test-api-key"}
+
+        with patch(
+            'src.main.search_flights_multi_country',
+            AsyncMock(return_value=SEARCH_RESULTS),
+        ) as mock_search:
+            first = client.post("/api/search", json=body, headers=headers).json()
+            second = client.post("/api/search", json=body, headers=headers).json()
+
+        assert mock_search.await_count == 1
+        assert first["cached"] is False
+        assert second["cached"] is True
+        assert first["cache_expires_at"] == second["cache_expires_at"]
+        assert second["flights"][0]["id"] == "test123"
+
+
+class TestStaleWhileRevalidate:
+    """Tests for serving stale results while refreshing them."""
+
+    def age_entry(self, cache, key, seconds):
+        entry = cache.local.get(key)
+        shift = timedelta(seconds=seconds)
+        entry.stored_at -= shift
+        entry.expires_at -= shift
+        entry.stale_until -= shift
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_is_returned_until_hard_expiry(self):
+        cache = SearchCache(ttl=60, max_entries=10, stale_ttl=120)
+        await cache.set("k", SEARCH_RESULTS)
+
+        self.age_entry(cache, "k", 90)
+        entry = await cache.get("k")
+        assert entry.is_stale()
+        assert entry.age_seconds() >= 90
+
+        self.age_entry(cache, "k", 100)
+        assert await cache.get("k") is None
+
+    @pytest.mark.asyncio
+    async def test_stale_search_is_served_and_refreshed_in_background(self):
+        import src.main as main
+
+        request = make_request(destination="SYD", departureDate="2031-07-01")
+        key = build_cache_key(request, main.get_search_countries())
+        main.search_cache.local.clear()
+        await main.search_cache.set(key, SEARCH_RESULTS)
+        self.age_entry(main.search_cache, key, main.search_cache.ttl + 1)
+
+        refreshed = {**SEARCH_RESULTS, "best_price": 450.0}
+        with patch(
+            'src.main.search_flights_multi_country',
+            AsyncMock(return_value=refreshed),
+        ) as mock_search:
+            response = await main._search_flights(request)
+            assert response.cached is True
+            assert response.stale is True
+            assert response.cache_age_seconds >= main.search_cache.ttl
+            assert response.best_price == 500.00
+
+            await asyncio.gather(*main.background_refreshes)
+
+        assert mock_search.await_count == 1
+        fresh = await main._search_flights(request)
+        assert fresh.stale is False
+        assert fresh.best_price == 450.0
@@ -0,0 +1,161 @@
+"""Tests for scraper subprocess shards."""
+
+import asyncio
+import os
+import signal
+import subprocess
+import sys
+
+import pytest
+
+from src.models.flight import ScrapeUnit, ScrapeUnitResult, WorkerStatus
+from src.shards import MP_CONTEXT, ProcessShardQueue, ignore_group_signals
+from src.workqueue import WorkQueueClient
+from tests.conftest import make_request
+
+
+def echo_shard(conn, index, countries):
+    """Stand-in shard: answers each unit with its shard index, dies on "tr"."""
+    while True:
+        try:
+            unit = ScrapeUnit.model_validate_json(conn.recv_bytes())
+        except EOFError:
+            return
+        if unit.country_code == "tr":
+            os._exit(1)
+        result = ScrapeUnitResult(
+            unit_id=unit.unit_id,
+            search_id=unit.search_id,
+            country_code=unit.country_code,
+            results={label: [{"shard": index, "countries": countries}] for label in unit.requests},
+        )
+        conn.send_bytes(result.model_dump_json().encode())
+
+
+def signal_proof_shard(conn, index, countries):
+    """Stand-in shard that only stops when its pipe closes."""
+    ignore_group_signals()
+    conn.send_bytes(b"ready")
+    try:
+        conn.recv_bytes()
+    except EOFError:
+        return
+
+
+def pressured_shard(conn, index, countries):
+    """Stand-in shard that reports memory pressure, then waits to be closed."""
+    conn.send_bytes(WorkerStatus(worker_id=f"shard-{index}", memory_pressure=True)
+                    .model_dump_json().encode())
+    try:
+        conn.recv_bytes()
+    except EOFError:
+        return
+
+
+def count_recycle():
+    from src.metrics import BROWSER_RECYCLES
+
+    BROWSER_RECYCLES.labels(reason="memory").inc()
+
+
+METRICS_SCRIPT = """
+from src.metrics import BROWSER_RECYCLES, render_metrics
+from src.shards import MP_CONTEXT
+from tests.test_shards import count_recycle
+
+BROWSER_RECYCLES.labels(reason="memory").inc()
+process = MP_CONTEXT.Process(target=count_recycle)
+process.start()
+process.join()
+print(render_metrics().decode())
+"""
+
+
+class TestProcessShardQueue:
+    """Tests for dispatching units to country-pinned subprocesses."""
+
+    def test_countries_are_spread_round_robin(self):
+        queue = ProcessShardQueue(processes=2, countries=["in", "mx", "br", "us"])
+        assert queue.countries_for(0) == ["in", "br"]
+        assert queue.countries_for(1) == ["mx", "us"]
+        assert queue.shard_for("zz") in (0, 1)
+
+    @pytest.mark.asyncio
+    async def test_units_reach_the_owning_shard_and_crashes_are_contained(self):
+        queue = ProcessShardQueue(
+            processes=2, countries=["in", "mx", "tr"], target=echo_shard, restart_delay=0.1
+        )
+        client = WorkQueueClient(queue, poll_interval=0.05)
+        await queue.start()
+        try:
+            in_result = await client.submit({"search": make_request()}, "in")
+            mx_result = await client.submit({"search": make_request()}, "mx")
+            assert in_result.results["search"] == [{"shard": 0, "countries": ["in", "tr"]}]
+            assert mx_result.results["search"] == [{"shard": 1, "countries": ["mx"]}]
+
+            crashed = await client.submit({"search": make_request()}, "tr")
+            assert "exited" in crashed.error
+            # The other shard kept serving, and the crashed one comes back
+            again = await client.submit({"search": make_request()}, "mx")
+            assert again.results == mx_result.results
+            for _ in range(50):
+                restarted = await client.submit({"search": make_request()}, "in")
+                if restarted.error is None:
+                    assert restarted.results == in_result.results
+                    break
+                await asyncio.sleep(0.1)
+            else:
+                pytest.fail("crashed shard was not restarted")
+        finally:
+            await client.stop()
+            await queue.close(timeout=5)
+
+    def test_shards_survive_group_signals_until_their_pipe_closes(self):
+        parent_conn, child_conn = MP_CONTEXT.Pipe()
+        process = MP_CONTEXT.Process(target=signal_proof_shard, args=(child_conn, 0, []))
+        process.start()
+        child_conn.close()
+        try:
+            assert parent_conn.recv_bytes() == b"ready"
+            os.kill(process.pid, signal.SIGTERM)
+            os.kill(process.pid, signal.SIGINT)
+            process.join(timeout=0.5)
+            assert process.is_alive()
+
+            parent_conn.close()
+            process.join(timeout=5)
+            assert process.exitcode == 0
+        finally:
+            if process.is_alive():
+                process.kill()
+
+    def test_subprocess_metrics_are_merged(self, tmp_path):
+        env = dict(os.environ, SCRAPER_PROCESSES="1", PROMETHEUS_MULTIPROC_DIR=str(tmp_path))
+        output = subprocess.run(
+            [sys.executable, "-c", METRICS_SCRIPT],
+            cwd=os.path.join(os.path.dirname(__file__), ".."),
+            env=env,
+            capture_output=True,
+            text=True,
+            timeout=60,
+            check=True,
+        ).stdout
+
+        assert 'brain_engine_browser_recycles_total{reason="memory"} 2.0' in output
+
+    @pytest.mark.asyncio
+    async def test_shard_memory_pressure_reaches_callbacks(self):
+        queue = ProcessShardQueue(processes=1, countries=["in"], target=pressured_shard)
+        pressure = []
+        queue.pressure_callbacks.append(pressure.append)
+        await queue.start()
+        try:
+            for _ in range(100):
+                if pressure:
+                    break
+                await asyncio.sleep(0.05)
+            assert pressure == [True]
+        finally:
+            await queue.close(timeout=5)
+
+        assert pressure == [True, False]
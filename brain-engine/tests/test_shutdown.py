@@ -0,0 +1,87 @@
+"""Tests for draining the API before shutdown."""
+
+import asyncio
+import signal
+import pytest
+
+from src.scheduler import AdmissionRejected, PageScheduler
+from src.shutdown import GracefulShutdown
+
+
+class TestGracefulShutdown:
+    """Tests for draining in-flight searches and the SIGTERM hand-off."""
+
+    @pytest.mark.asyncio
+    async def test_drain_waits_for_in_flight_search(self):
+        scheduler = PageScheduler(max_pages=6, max_queue=2)
+        shutdown = GracefulShutdown(scheduler, timeout=5, notice=0)
+        ticket = await scheduler.acquire(6, timeout=1)
+
+        drain = asyncio.create_task(shutdown.drain())
+        await asyncio.sleep(0.05)
+        assert shutdown.draining
+        assert not drain.done()
+        with pytest.raises(AdmissionRejected):
+            await scheduler.acquire(1, timeout=1)
+
+        scheduler.release(ticket)
+        assert await drain
+
+    @pytest.mark.asyncio
+    async def test_drain_waits_for_registered_drainers(self):
+        scheduler = PageScheduler(max_pages=6, max_queue=2)
+        shutdown = GracefulShutdown(scheduler, timeout=5, notice=0)
+        jobs_done = asyncio.Event()
+        timeouts = []
+
+        async def drain_jobs(timeout):
+            timeouts.append(timeout)
+            await jobs_done.wait()
+            return True
+
+        shutdown.drainers.append(drain_jobs)
+        drain = asyncio.create_task(shutdown.drain())
+        await asyncio.sleep(0.05)
+        assert not drain.done()
+
+        jobs_done.set()
+        assert await drain
+        assert timeouts == [5]
+
+    @pytest.mark.asyncio
+    async def test_drain_gives_up_after_timeout(self):
+        scheduler = PageScheduler(max_pages=6, max_queue=2)
+        shutdown = GracefulShutdown(scheduler, timeout=0.1, notice=0)
+        await scheduler.acquire(6, timeout=1)
+
+        assert not await shutdown.drain()
+        assert scheduler.in_use == 6
+
+    @pytest.mark.asyncio
+    async def test_sigterm_drains_before_handing_over(self):
+        """The server's own SIGTERM handler only runs once searches are done."""
+        scheduler = PageScheduler(max_pages=6, max_queue=2)
+        shutdown = GracefulShutdown(scheduler, timeout=5, notice=0)
+        received = []
+
+        def server_handler(sig, frame):
+            received.append(sig)
+
+        original = signal.signal(signal.SIGTERM, server_handler)
+        try:
+            ticket = await scheduler.acquire(6, timeout=1)
+            shutdown.install()
+            signal.getsignal(signal.SIGTERM)(signal.SIGTERM, None)
+            await asyncio.sleep(0.05)
+
+            assert shutdown.draining
+            assert received == []
+
+            scheduler.release(ticket)
+            await asyncio.sleep(0.2)
+            assert received == [signal.SIGTERM]
+
+            shutdown.uninstall()
+            assert signal.getsignal(signal.SIGTERM) is server_handler
+        finally:
+            signal.signal(signal.SIGTERM, original)
@@ -0,0 +1,124 @@
+"""Tests for single-flight request coalescing."""
+
+import asyncio
+import pytest
+
+from src.cache.singleflight import SingleFlight
+
+
+class TestSingleFlight:
+    """Tests for sharing and cancelling in-flight work."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_execution(self):
+        flight = SingleFlight()
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "result"
+
+        results = await asyncio.gather(*(flight.do("k", work) for _ in range(5)))
+
+        assert results == ["result"] * 5
+        assert calls == 1
+        assert flight.coalesced_total == 4
+        assert flight.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_cancel_others(self):
+        flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def work():
+            await release.wait()
+            return "result"
+
+        first = asyncio.create_task(flight.do("k", work))
+        second = asyncio.create_task(flight.do("k", work))
+        await asyncio.sleep(0)
+
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await second == "result"
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+    @pytest.mark.asyncio
+    async def test_work_cancelled_when_all_waiters_leave(self):
+        flight = SingleFlight()
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def work():
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        waiter = asyncio.create_task(flight.do("k", work))
+        await started.wait()
+        waiter.cancel()
+
+        await asyncio.wait_for(cancelled.wait(), timeout=1)
+        assert flight.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_errors_propagate_to_all_waiters(self):
+        flight = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0)
+            raise RuntimeError("scrape failed")
+
+        results = await asyncio.gather(
+            flight.do("k", work), flight.do("k", work), return_exceptions=True
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+    @pytest.mark.asyncio
+    async def test_longer_deadline_does_not_join_shorter_call(self):
+        """A caller that allows more time starts its own run; later callers join that."""
+        flight = SingleFlight()
+        calls = []
+
+        async def work(name):
+            calls.append(name)
+            await asyncio.sleep(0.01)
+            return name
+
+        results = await asyncio.gather(
+            flight.do("k", lambda: work("short"), deadline=5.0),
+            flight.do("k", lambda: work("long"), deadline=60.0),
+            flight.do("k", lambda: work("joined"), deadline=30.0),
+        )
+
+        assert results == ["short", "long", "long"]
+        assert calls == ["short", "long"]
+
+    @pytest.mark.asyncio
+    async def test_same_budget_arriving_later_joins(self):
+        """Identical searches a moment apart share a run despite later deadlines."""
+        flight = SingleFlight()
+        loop = asyncio.get_running_loop()
+        calls = []
+
+        async def work():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "done"
+
+        first = asyncio.ensure_future(flight.do("k", work, deadline=loop.time() + 45))
+        await asyncio.sleep(0.01)
+        second = flight.do("k", work, deadline=loop.time() + 45)
+
+        assert await asyncio.gather(first, second) == ["done", "done"]
+        assert len(calls) == 1
+        assert flight.coalesced_total == 1
@@ -0,0 +1,205 @@
+"""Tests for queueing country scrapes to scraper workers."""
+
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+import pytest_asyncio
+
+from src.circuit import circuit_breakers
+from src.history import price_history
+from src.models.flight import ScrapeUnit, WorkerStatus
+from src.scraper.flights import (
+    get_search_countries,
+    scrape_country_many,
+    search_flights_multi_country,
+)
+from src.worker import ScrapeWorker
+from src.scraper.browser import browser_pool
+from src.workqueue import SEARCH_ID, InProcessWorkQueue, RedisWorkQueue, WorkQueueClient
+from tests.conftest import make_flight, make_request
+
+
+@pytest_asyncio.fixture
+async def split_deployment():
+    """An API-side client and a worker sharing an in-process queue."""
+    queue = InProcessWorkQueue()
+    client = WorkQueueClient(queue, poll_interval=0.05)
+    worker = ScrapeWorker(queue, concurrency=6, worker_id="w1", poll_interval=0.05)
+    worker.start()
+    try:
+        yield client, worker
+    finally:
+        await client.stop()
+        await worker.stop()
+        await queue.close()
+
+
+class TestWorkQueue:
+    """Tests for the API replica / scraper worker round trip."""
+
+    @pytest.mark.asyncio
+    async def test_search_runs_on_worker_and_aggregates(self, split_deployment):
+        client, _ = split_deployment
+        search_ids = set()
+
+        async def fake_search(request, country_code):
+            search_ids.add(SEARCH_ID.get())
+            return [make_flight(country_code, 700.0 if country_code == "us" else 500.0)]
+
+        with patch('src.scraper.flights.settings.deployment_mode', "api"), \
+                patch('src.scraper.flights.scrape_client', client), \
+                patch('src.worker.search_flights_from_country', fake_search), \
+                patch('src.scraper.flights.search_flights_from_country') as local_search:
+            results = await search_flights_multi_country(make_request())
+
+        local_search.assert_not_called()
+        assert len(results["countries_searched"]) == 6
+        assert results["baseline_price"] == 700.0
+        assert results["best_price"] == 500.0
+        # Every country's unit carried the same search ID
+        assert len(search_ids) == 1 and None not in search_ids
+
+    @pytest.mark.asyncio
+    async def test_worker_failure_is_raised_to_caller(self, split_deployment):
+        client, _ = split_deployment
+
+        async def failing_search(request, country_code):
+            raise ValueError("proxy down")
+
+        with patch('src.worker.search_flights_from_country', failing_search):
+            result = await client.submit({"search": make_request()}, "in")
+        assert "proxy down" in result.error
+
+    @pytest.mark.asyncio
+    async def test_outcomes_are_recorded_by_the_api_replica(self, split_deployment):
+        client, _ = split_deployment
+
+        @asynccontextmanager
+        async def fake_context(country_code):
+            yield MagicMock(), MagicMock(), MagicMock()
+
+        async def fake_scrape(page, request, country_code):
+            if country_code == "th":
+                raise RuntimeError("blocked")
+            return [make_flight(country_code, 500.0)]
+
+        with patch('src.scraper.flights.settings.deployment_mode', "api"), \
+                patch('src.scraper.flights.scrape_client', client), \
+                patch('src.scraper.flights.create_browser_context', fake_context), \
+                patch('src.scraper.flights.scrape_flights', fake_scrape), \
+                patch.object(price_history, 'record', new_callable=AsyncMock) as record:
+            await search_flights_multi_country(make_request())
+
+        assert sorted(call.args[1] for call in record.await_args_list) == sorted(
+            get_search_countries()
+        )
+        assert circuit_breakers.get("th").failure_rate() == 1.0
+        assert circuit_breakers.get("in").failure_rate() == 0.0
+
+    @pytest.mark.asyncio
+    async def test_unanswered_unit_times_out_and_counts_as_failure(self):
+        queue = InProcessWorkQueue()
+        client = WorkQueueClient(queue, poll_interval=0.05, result_margin=0.05)
+
+        try:
+            with patch('src.scraper.flights.settings.deployment_mode', "api"), \
+                    patch('src.scraper.flights.scrape_client', client):
+                with pytest.raises(asyncio.TimeoutError):
+                    await scrape_country_many(
+                        {"search": make_request()}, "in", results={}, timeout=0.05
+                    )
+        finally:
+            await client.stop()
+            await queue.close()
+
+        assert circuit_breakers.get("in").failure_rate() == 1.0
+
+    @pytest.mark.asyncio
+    async def test_expired_units_are_not_scraped(self):
+        worker = ScrapeWorker(InProcessWorkQueue(), concurrency=1, worker_id="w1")
+        unit = ScrapeUnit(
+            unit_id="u1", search_id="s1", reply_to="r1", country_code="in",
+            requests={"search": make_request()},
+            expires_at=datetime.now(timezone.utc) - timedelta(seconds=1),
+        )
+
+        with patch('src.worker.search_flights_from_country') as search:
+            result = await worker.run_unit(unit)
+
+        search.assert_not_called()
+        assert result.error is not None
+        assert result.search_id == "s1"
+
+    @pytest.mark.asyncio
+    async def test_drain_finishes_running_unit_and_leaves_queued_ones(self):
+        queue = InProcessWorkQueue()
+        worker = ScrapeWorker(queue, concurrency=1, worker_id="w1", poll_interval=0.05)
+        started = asyncio.Event()
+
+        async def slow_search(request, country_code):
+            started.set()
+            await asyncio.sleep(0.1)
+            return [make_flight(country_code, 500.0)]
+
+        def unit(unit_id):
+            return ScrapeUnit(
+                unit_id=unit_id, search_id="s1", reply_to="r1", country_code="in",
+                requests={"search": make_request()},
+                expires_at=datetime.now(timezone.utc) + timedelta(seconds=30),
+            )
+
+        with patch('src.worker.search_flights_from_country', side_effect=slow_search):
+            worker.start()
+            await queue.push_unit(unit("u1"))
+            await started.wait()
+            await queue.push_unit(unit("u2"))
+            assert await worker.drain(timeout=5)
+
+        result = await queue.pop_result("r1", timeout=1)
+        assert result.unit_id == "u1"
+        assert result.results["search"][0]["price"] == 500.0
+        assert queue.pending() == 1
+
+    @pytest.mark.asyncio
+    async def test_worker_reports_memory_pressure_when_it_changes(self):
+        queue = InProcessWorkQueue()
+        worker = ScrapeWorker(queue, concurrency=1, worker_id="w1", status_interval=60)
+
+        with patch.object(queue, 'report_status', new_callable=AsyncMock) as report:
+            worker.start()
+            try:
+                await asyncio.sleep(0.01)
+                browser_pool._set_pressure(True)
+                await asyncio.sleep(0.01)
+            finally:
+                browser_pool._set_pressure(False)
+                await worker.stop()
+
+        reported = [call.args[0].memory_pressure for call in report.await_args_list]
+        assert reported[:2] == [False, True]
+
+    @pytest.mark.asyncio
+    async def test_redis_queue_pauses_only_when_every_worker_is_pressured(self):
+        queue = RedisWorkQueue("redis://localhost:6379", status_interval=0.01)
+        pressure = []
+        queue.pressure_callbacks.append(pressure.append)
+        statuses = [
+            [WorkerStatus(worker_id="w1", memory_pressure=True),
+             WorkerStatus(worker_id="w2", memory_pressure=False)],
+            [WorkerStatus(worker_id="w1", memory_pressure=True),
+             WorkerStatus(worker_id="w2", memory_pressure=True)],
+            [],
+        ]
+
+        async def worker_statuses():
+            return statuses.pop(0) if len(statuses) > 1 else statuses[0]
+
+        with patch.object(queue, 'worker_statuses', worker_statuses):
+            await queue.start()
+            await asyncio.sleep(0.1)
+            await queue.close()
+
+        assert pressure == [True, False]